@@ -3,5 +3,7 @@ from .common_api import router as common_router  # noqa: F401
 from .container_api import router as container_router  # noqa: F401
 from .image_api import router as image_router  # noqa: F401
 from .manifest_api import router as manifest_router  # noqa: F401
+from .metrics_api import router as metrics_router  # noqa: F401
 from .network_api import router as network_router  # noqa: F401
+from .profiling_api import router as profiling_router  # noqa: F401
 from .public_api import router as public_router  # noqa: F401
@@ -12,6 +12,7 @@ router = APIRouter(
     tags=["command"],
     dependencies=[Depends(verify_signature)],
 )
+_RESULT_ADAPTER = TypeAdapter(tuple[str, str])
 
 
 @router.post(
@@ -24,6 +25,7 @@ async def run(body: RunCommandRequestBodySchema) -> tuple[str, str]:
     res = await asyncall(
         lambda: docker_run_cmd(_command),
         asyncall_timeout=600,
+        asyncall_operation="command.run",
     )
     # although typing says that res should be a tuple,
     # it might not be (success network connect returns empty string)
@@ -32,6 +34,6 @@ async def run(body: RunCommandRequestBodySchema) -> tuple[str, str]:
     if isinstance(res, str):
         return (res, "")
     try:
-        return TypeAdapter(tuple[str, str]).validate_python(res)
+        return _RESULT_ADAPTER.validate_python(res)
     except Exception:
         return (str(res), "")
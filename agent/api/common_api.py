@@ -18,4 +18,4 @@ router = APIRouter(
     response_model=DockerVersionScheme,
 )
 async def get_version():
-    return await asyncall(lambda: DOCKER.version())
+    return await asyncall(lambda: DOCKER.version(), asyncall_operation="system.version")
@@ -1,9 +1,15 @@
-from typing import Literal, cast
+import builtins
+import json
+from collections.abc import Iterable
+from typing import Any, Literal, cast
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from python_on_whales.components.container.models import (
     ContainerInspectResult,
 )
+from python_on_whales.exceptions import NoSuchContainer
+from python_on_whales.utils import run as docker_run_cmd
 
 from agent.auth import verify_signature
 from agent.config import Config
@@ -23,8 +29,36 @@ router = APIRouter(
 )
 
 
+def _inspect(names_or_ids: Iterable[str]) -> builtins.list[dict[str, Any]]:
+    """
+    Inspect containers with a single docker call.
+    Raw docker output already matches the aliases of ContainerInspectResult,
+    so it's returned without building, validating and serializing
+    the models (the backend validates it anyway).
+    Only the leading slash of the name is removed, as Container.name does.
+    """
+    args = [*names_or_ids]
+    if not args:
+        return []
+    result: builtins.list[dict[str, Any]] = json.loads(
+        cast(
+            str,
+            docker_run_cmd(
+                DOCKER.container.docker_cmd + ["container", "inspect", *args]
+            ),
+        )
+    )
+    for item in result:
+        if "Name" in item:
+            item["Name"] = item["Name"].removeprefix("/")
+    return result
+
+
 async def is_exists(name_or_id: str) -> Literal[True]:
-    exists = await asyncall(lambda: DOCKER.container.exists(name_or_id))
+    exists = await asyncall(
+        lambda: DOCKER.container.exists(name_or_id),
+        asyncall_operation="container.exists",
+    )
     if not exists:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Container not found")
     return True
@@ -37,7 +71,15 @@ async def is_exists(name_or_id: str) -> Literal[True]:
 )
 async def list(body: GetContainerListBodySchema):
     args = body.model_dump(exclude_unset=True)
-    return await asyncall(lambda: DOCKER.container.list(**args))
+
+    def _list() -> builtins.list[dict[str, Any]]:
+        try:
+            return _inspect(c.id for c in DOCKER.container.list(**args))
+        except NoSuchContainer:
+            # Removed between list and inspect, the next list won't contain it
+            return _inspect(c.id for c in DOCKER.container.list(**args))
+
+    return JSONResponse(await asyncall(_list, asyncall_operation="container.list"))
 
 
 @router.get(
@@ -46,7 +88,10 @@ async def list(body: GetContainerListBodySchema):
     response_model=bool,
 )
 async def exists(name_or_id: str) -> bool:
-    return await asyncall(lambda: DOCKER.container.exists(name_or_id))
+    return await asyncall(
+        lambda: DOCKER.container.exists(name_or_id),
+        asyncall_operation="container.exists",
+    )
 
 
 @router.get(
@@ -55,7 +100,10 @@ async def exists(name_or_id: str) -> bool:
     response_model=ContainerInspectResult,
 )
 async def inspect(name_or_id: str, _=Depends(is_exists)):
-    return await asyncall(lambda: DOCKER.container.inspect(name_or_id))
+    data = await asyncall(
+        lambda: _inspect([name_or_id]), asyncall_operation="container.inspect"
+    )
+    return JSONResponse(data[0])
 
 
 @router.post(
@@ -65,7 +113,11 @@ async def inspect(name_or_id: str, _=Depends(is_exists)):
 )
 async def create(body: CreateContainerRequestBodySchema):
     args = body.model_dump(exclude_unset=True)
-    return await asyncall(lambda: DOCKER.container.create(**args), asyncall_timeout=600)
+    return await asyncall(
+        lambda: DOCKER.container.create(**args),
+        asyncall_timeout=600,
+        asyncall_operation="container.create",
+    )
 
 
 @router.post(
@@ -77,6 +129,7 @@ async def start(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.start(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.start",
     )
     return name_or_id
 
@@ -90,6 +143,7 @@ async def stop(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.stop(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.stop",
     )
     return name_or_id
 
@@ -103,6 +157,7 @@ async def restart(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.restart(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.restart",
     )
     return name_or_id
 
@@ -116,6 +171,7 @@ async def kill(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.kill(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.kill",
     )
     return name_or_id
 
@@ -129,6 +185,7 @@ async def pause(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.pause(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.pause",
     )
     return name_or_id
 
@@ -142,6 +199,7 @@ async def unpause(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.unpause(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.unpause",
     )
     return name_or_id
 
@@ -155,6 +213,7 @@ async def remove(name_or_id: str, _=Depends(is_exists)) -> str:
     await asyncall(
         lambda: DOCKER.container.remove(name_or_id),
         asyncall_timeout=600,
+        asyncall_operation="container.remove",
     )
     return name_or_id
 
@@ -170,7 +229,8 @@ async def logs(
     _=Depends(is_exists),
 ):
     return await asyncall(
-        lambda: DOCKER.container.logs(name_or_id, **body.model_dump(exclude_unset=True))
+        lambda: DOCKER.container.logs(name_or_id, **body.model_dump(exclude_unset=True)),
+        asyncall_operation="container.logs",
     )
 
 
@@ -199,5 +259,6 @@ async def exec_command(
                 ["sh", "-c", body.command],
             ),
             asyncall_timeout=600,
+            asyncall_operation="container.exec",
         ),
     )
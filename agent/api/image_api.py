@@ -24,7 +24,9 @@ router = APIRouter(
 
 
 async def is_exists(spec_or_id: str) -> Literal[True]:
-    exists = await asyncall(lambda: DOCKER.image.exists(spec_or_id))
+    exists = await asyncall(
+        lambda: DOCKER.image.exists(spec_or_id), asyncall_operation="image.exists"
+    )
     if not exists:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Image not found")
     return True
@@ -37,7 +39,10 @@ async def is_exists(spec_or_id: str) -> Literal[True]:
 )
 async def inspect(body: InspectImageRequestBodySchema):
     _ = await is_exists(body.spec_or_id)
-    return await asyncall(lambda: DOCKER.image.inspect(body.spec_or_id))
+    return await asyncall(
+        lambda: DOCKER.image.inspect(body.spec_or_id),
+        asyncall_operation="image.inspect",
+    )
 
 
 @router.post(
@@ -47,7 +52,9 @@ async def inspect(body: InspectImageRequestBodySchema):
 )
 async def list(body: GetImageListBodySchema):
     args = body.model_dump(exclude_unset=True)
-    return await asyncall(lambda: DOCKER.image.list(**args))
+    return await asyncall(
+        lambda: DOCKER.image.list(**args), asyncall_operation="image.list"
+    )
 
 
 @router.post(
@@ -59,6 +66,7 @@ async def prune(body: PruneImagesRequestBodySchema) -> str:
     return await asyncall(
         lambda: DOCKER.image.prune(**args),
         asyncall_timeout=600,
+        asyncall_operation="image.prune",
     )
 
 
@@ -71,6 +79,7 @@ async def pull(body: PullImageRequestBodySchema):
     return await asyncall(
         lambda: DOCKER.image.pull(body.image),
         asyncall_timeout=600,
+        asyncall_operation="image.pull",
     )
 
 
@@ -80,4 +89,7 @@ async def pull(body: PullImageRequestBodySchema):
 )
 async def tag(body: TagImageRequestBodySchema):
     _ = await is_exists(body.spec_or_id)
-    return await asyncall(lambda: DOCKER.image.tag(body.spec_or_id, body.tag))
+    return await asyncall(
+        lambda: DOCKER.image.tag(body.spec_or_id, body.tag),
+        asyncall_operation="image.tag",
+    )
@@ -23,4 +23,5 @@ async def imagetools_inspect(
     return await asyncall(
         lambda: DOCKER.manifest.inspect(spec_or_digest),
         asyncall_timeout=60,
+        asyncall_operation="manifest.inspect",
     )
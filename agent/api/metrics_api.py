@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Response
+
+from agent.auth import verify_metrics_access
+from shared.util.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(verify_metrics_access)],
+)
+
+
+@router.get(
+    "",
+    description="Get metrics of the agent in the Prometheus text format",
+    response_class=Response,
+)
+async def get_metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -22,5 +22,6 @@ async def disconnect(
     await asyncall(
         lambda: DOCKER.network.disconnect(
             **body.model_dump(exclude_unset=True)
-        )
+        ),
+        asyncall_operation="network.disconnect",
     )
\ No newline at end of file
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from agent.auth import verify_signature
+from agent.config import Config
+from shared.schemas.profiling_schemas import (
+    CpuProfileFormat,
+    MemoryGroupBy,
+    MemorySnapshotSchema,
+)
+from shared.util.profiling import (
+    CpuProfiler,
+    MemoryTracker,
+    attachment_response,
+    cpu_profile_response,
+)
+
+
+def is_enabled():
+    if not Config.ENABLE_PROFILING:
+        raise HTTPException(
+            status.HTTP_403_FORBIDDEN,
+            "Profiling is disabled on this agent. "
+            "Set ENABLE_PROFILING=true to enable it.",
+        )
+
+
+router = APIRouter(
+    prefix="/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(verify_signature), Depends(is_enabled)],
+)
+
+
+@router.get(
+    "/cpu",
+    description="Sample stacks of the agent for the seconds and download the profile",
+)
+async def cpu(
+    seconds: float = Query(10, gt=0, le=CpuProfiler.MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: CpuProfileFormat = "speedscope",
+):
+    profile = await CpuProfiler.profile(seconds, interval_ms / 1000)
+    return cpu_profile_response(profile, format, "tugtainer-agent")
+
+
+@router.post(
+    "/memory/start",
+    description="Start tracing of the allocations, it slows the agent down",
+)
+def memory_start(frames: int = Query(25, ge=1, le=100)):
+    MemoryTracker.start(frames)
+
+
+@router.post("/memory/stop", description="Stop tracing of the allocations")
+def memory_stop():
+    MemoryTracker.stop()
+
+
+@router.get(
+    "/memory/snapshot",
+    description="Get the biggest allocations, the snapshot is the baseline of the diffs",
+    response_model=MemorySnapshotSchema,
+)
+async def memory_snapshot(
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    return await MemoryTracker.snapshot(limit, group_by)
+
+
+@router.get(
+    "/memory/diff",
+    description="Get the biggest changes of the allocations since the snapshot",
+    response_model=MemorySnapshotSchema,
+)
+async def memory_diff(
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    return await MemoryTracker.diff(limit, group_by)
+
+
+@router.get(
+    "/memory/dump",
+    description="Download the snapshot for tracemalloc.Snapshot.load",
+)
+async def memory_dump():
+    return attachment_response(
+        await MemoryTracker.dump(),
+        "tugtainer-agent.tracemalloc",
+        "application/octet-stream",
+    )
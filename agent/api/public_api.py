@@ -13,7 +13,7 @@ router = APIRouter(prefix="/public", tags=["public"])
 @router.get("/health", description="Get health status of the agent")
 async def health():
     try:
-        _ = await asyncall(DOCKER.info)
+        _ = await asyncall(DOCKER.info, asyncall_operation="system.info")
         return "OK"
     except DockerException as e:
         message = "Failed to get docker cli info"
@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
+from python_on_whales.exceptions import NoSuchContainer
 
 from agent.app import app
 from agent.auth import verify_signature
@@ -74,3 +75,79 @@ async def test_exec_404_when_container_missing(mocker: MockerFixture):
     )
 
     assert response.status_code == 404
+
+
+def _mock_docker(mocker: MockerFixture):
+    docker = mocker.patch(f"{base_module}.DOCKER")
+    docker.container.docker_cmd = ["docker"]
+    return docker
+
+
+@pytest.mark.asyncio
+async def test_list_inspects_all_containers_with_single_call(mocker: MockerFixture):
+    docker = _mock_docker(mocker)
+    docker.container.list.return_value = [mocker.Mock(id="a"), mocker.Mock(id="b")]
+    run_mock = mocker.patch(
+        f"{base_module}.docker_run_cmd",
+        return_value='[{"Id": "a", "Name": "/one"}, {"Id": "b", "Name": "/two"}]',
+    )
+
+    response = client.post("/api/container/list", json={"all": True})
+
+    assert response.status_code == 200
+    # Names without the leading slash, as python_on_whales' Container.name
+    assert response.json() == [
+        {"Id": "a", "Name": "one"},
+        {"Id": "b", "Name": "two"},
+    ]
+    run_mock.assert_called_once()
+    assert run_mock.call_args.args[0][-3:] == ["inspect", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_list_retries_when_container_removed(mocker: MockerFixture):
+    docker = _mock_docker(mocker)
+    docker.container.list.side_effect = [
+        [mocker.Mock(id="a"), mocker.Mock(id="b")],
+        [mocker.Mock(id="a")],
+    ]
+    mocker.patch(
+        f"{base_module}.docker_run_cmd",
+        side_effect=[
+            NoSuchContainer(["docker"], 1, b"", b"No such container: b"),
+            '[{"Id": "a"}]',
+        ],
+    )
+
+    response = client.post("/api/container/list", json={"all": True})
+
+    assert response.status_code == 200
+    assert response.json() == [{"Id": "a"}]
+    assert docker.container.list.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_list_empty(mocker: MockerFixture):
+    docker = _mock_docker(mocker)
+    docker.container.list.return_value = []
+    run_mock = mocker.patch(f"{base_module}.docker_run_cmd")
+
+    response = client.post("/api/container/list", json={"all": True})
+
+    assert response.json() == []
+    run_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_inspect_strips_leading_slash_of_name(mocker: MockerFixture):
+    docker = _mock_docker(mocker)
+    docker.container.exists.return_value = True
+    mocker.patch(
+        f"{base_module}.docker_run_cmd",
+        return_value='[{"Id": "a", "Name": "/nginx"}]',
+    )
+
+    response = client.get("/api/container/inspect/nginx")
+
+    assert response.status_code == 200
+    assert response.json() == {"Id": "a", "Name": "nginx"}
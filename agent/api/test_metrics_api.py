@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from agent.app import app
+from agent.metrics import DOCKER_SECONDS, HTTP_REQUEST_SECONDS, SIGNATURE_FAILURES
+
+base_module = "agent.auth"
+
+client = TestClient(app)
+
+
+def test_metrics_are_signed(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.ALLOW_UNAUTHENTICATED_AGENT", False)
+    mocker.patch(f"{base_module}.Config.ALLOW_UNAUTHENTICATED_METRICS", False)
+    mocker.patch(f"{base_module}.Config.AGENT_SECRET", "secret")
+    failures = SIGNATURE_FAILURES.get()
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 401
+    assert SIGNATURE_FAILURES.get() == failures + 1
+
+
+def test_metrics_of_requests(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.ALLOW_UNAUTHENTICATED_METRICS", True)
+    mocker.patch("agent.api.public_api.DOCKER.info", return_value={})
+    calls = DOCKER_SECONDS.count("system.info")
+
+    assert client.get("/api/public/health").status_code == 200
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert DOCKER_SECONDS.count("system.info") == calls + 1
+    assert HTTP_REQUEST_SECONDS.count("GET", "/public/health", "200") >= 1
+    assert "tugtainer_agent_executor_queued 0" in response.text
@@ -0,0 +1,67 @@
+import json
+import pickle
+import tracemalloc
+
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from agent.app import app
+
+base_module = "agent.api.profiling_api"
+
+client = TestClient(app)
+
+
+def test_disabled_by_default(mocker: MockerFixture):
+    mocker.patch("agent.auth.Config.ALLOW_UNAUTHENTICATED_AGENT", True)
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", False)
+
+    response = client.get("/api/profiling/cpu", params={"seconds": 0.1})
+
+    assert response.status_code == 403
+
+
+def test_cpu_profile(mocker: MockerFixture):
+    mocker.patch("agent.auth.Config.ALLOW_UNAUTHENTICATED_AGENT", True)
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", True)
+
+    response = client.get(
+        "/api/profiling/cpu", params={"seconds": 0.2, "interval_ms": 5}
+    )
+
+    assert response.status_code == 200
+    assert "speedscope.json" in response.headers["content-disposition"]
+    profile = json.loads(response.content)
+    assert profile["profiles"] and profile["shared"]["frames"]
+
+    response = client.get(
+        "/api/profiling/cpu", params={"seconds": 0.1, "format": "pstats"}
+    )
+    assert response.status_code == 200
+    assert "tugtainer-agent.pstats" in response.headers["content-disposition"]
+
+
+def test_memory(mocker: MockerFixture):
+    mocker.patch("agent.auth.Config.ALLOW_UNAUTHENTICATED_AGENT", True)
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", True)
+
+    assert client.get("/api/profiling/memory/snapshot").status_code == 409
+    try:
+        assert client.post("/api/profiling/memory/start").status_code == 200
+        assert client.get("/api/profiling/memory/diff").status_code == 409
+
+        response = client.get("/api/profiling/memory/snapshot", params={"limit": 5})
+        assert response.status_code == 200
+        assert len(response.json()["stats"]) == 5
+
+        _allocated = [bytearray(1024) for _ in range(1000)]
+        response = client.get("/api/profiling/memory/diff", params={"limit": 5})
+        assert response.status_code == 200
+        assert max(s["size_diff"] for s in response.json()["stats"]) > 1_000_000
+        del _allocated
+
+        response = client.get("/api/profiling/memory/dump")
+        assert isinstance(pickle.loads(response.content), tracemalloc.Snapshot)
+    finally:
+        client.post("/api/profiling/memory/stop")
+    assert not tracemalloc.is_tracing()
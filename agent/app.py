@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request, status
 from python_on_whales import DockerException
@@ -10,11 +11,16 @@ from agent.api import (
     container_router,
     image_router,
     manifest_router,
+    metrics_router,
     network_router,
+    profiling_router,
     public_router,
 )
 from agent.config import Config
+from agent.metrics import MetricsMiddleware
 from shared.util.endpoint_logging_filter import EndpointLoggingFilter
+from shared.util.profiling import ProfilingError
+from shared.util.tracing import TracingMiddleware, setup_export
 
 logging.basicConfig(
     level=Config.LOG_LEVEL,
@@ -26,7 +32,20 @@ uvicorn_logger = logging.getLogger("uvicorn.access")
 uvicorn_logger.setLevel(Config.LOG_LEVEL)
 uvicorn_logger.addFilter(EndpointLoggingFilter(["/public/health"]))
 
-app = FastAPI(root_path="/api")
+SPAN_PROCESSOR = setup_export(
+    "tugtainer-agent", Config.TRACING_FILE, Config.TRACING_OTLP_ENDPOINT
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield  # App
+    # Code to run on shutdown
+    if SPAN_PROCESSOR:
+        await SPAN_PROCESSOR.stop()
+
+
+app = FastAPI(root_path="/api", lifespan=lifespan)
 app.include_router(public_router)
 app.include_router(container_router)
 app.include_router(image_router)
@@ -34,6 +53,12 @@ app.include_router(command_router)
 app.include_router(manifest_router)
 app.include_router(network_router)
 app.include_router(common_router)
+app.include_router(metrics_router)
+app.include_router(profiling_router)
+app.add_middleware(MetricsMiddleware)
+if SPAN_PROCESSOR:
+    # Spans are not created at all without an export
+    app.add_middleware(TracingMiddleware)
 
 
 @app.exception_handler(asyncio.TimeoutError)
@@ -57,3 +82,8 @@ async def docker_exception_handler(
     if exc.stderr:
         detail += f"\nstderr: {exc.stderr}"
     raise HTTPException(status.HTTP_424_FAILED_DEPENDENCY, detail)
+
+
+@app.exception_handler(ProfilingError)
+async def profiling_exception_handler(request: Request, exc: ProfilingError):
+    raise HTTPException(status.HTTP_409_CONFLICT, str(exc))
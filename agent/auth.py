@@ -1,6 +1,7 @@
-from fastapi import Request
+from fastapi import HTTPException, Request
 
 from agent.config import Config
+from agent.metrics import SIGNATURE_FAILURES
 from shared.util.signature import verify_signature_headers
 
 
@@ -17,12 +18,23 @@ async def verify_signature(req: Request):
 
     params = dict(req.query_params) if req.query_params else None
 
-    verify_signature_headers(
-        secret_key=Config.AGENT_SECRET,
-        signature_ttl=Config.AGENT_SIGNATURE_TTL,
-        headers=dict(req.headers),
-        method=req.method,
-        path=req.url.path,
-        body=body,
-        params=params,
-    )
+    try:
+        verify_signature_headers(
+            secret_key=Config.AGENT_SECRET,
+            signature_ttl=Config.AGENT_SIGNATURE_TTL,
+            headers=dict(req.headers),
+            method=req.method,
+            path=req.url.path,
+            body=body,
+            params=params,
+        )
+    except HTTPException:
+        SIGNATURE_FAILURES.inc()
+        raise
+
+
+async def verify_metrics_access(req: Request):
+    """Metrics are signed like the rest of the api unless explicitly public"""
+    if Config.ALLOW_UNAUTHENTICATED_METRICS:
+        return
+    await verify_signature(req)
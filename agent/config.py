@@ -11,9 +11,13 @@ class Config:
     LOG_LEVEL: ClassVar[str]
     AGENT_SECRET: ClassVar[str | None]
     ALLOW_UNAUTHENTICATED_AGENT: ClassVar[bool]
+    ALLOW_UNAUTHENTICATED_METRICS: ClassVar[bool]
     ALLOW_EXEC: ClassVar[bool]
     AGENT_SIGNATURE_TTL: ClassVar[int]
     DOCKER_TIMEOUT: ClassVar[int]
+    TRACING_FILE: ClassVar[str | None]
+    TRACING_OTLP_ENDPOINT: ClassVar[str | None]
+    ENABLE_PROFILING: ClassVar[bool]
 
     @classmethod
     def load(cls):
@@ -25,9 +29,17 @@ class Config:
             cls.ALLOW_UNAUTHENTICATED_AGENT = (
                 os.getenv("ALLOW_UNAUTHENTICATED_AGENT", "false").lower() == "true"
             )
+            cls.ALLOW_UNAUTHENTICATED_METRICS = (
+                os.getenv("ALLOW_UNAUTHENTICATED_METRICS", "false").lower() == "true"
+            )
             cls.ALLOW_EXEC = os.getenv("ALLOW_EXEC", "false").lower() == "true"
             cls.AGENT_SIGNATURE_TTL = int(os.getenv("AGENT_SIGNATURE_TTL") or 5)
             cls.DOCKER_TIMEOUT = int(os.getenv("DOCKER_TIMEOUT") or 15)
+            cls.TRACING_FILE = os.getenv("TRACING_FILE") or None
+            cls.TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT") or None
+            cls.ENABLE_PROFILING = (
+                os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+            )
 
 
 Config.load()
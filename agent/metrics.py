@@ -0,0 +1,102 @@
+"""
+Metrics of the agent, exposed on /api/metrics in the Prometheus format.
+They tell whether a slow request waits for the docker daemon
+or for a free executor thread of the agent.
+"""
+
+import time
+from collections.abc import Iterator
+from typing import Final
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.util.metrics import Counter, Gauge, Histogram, LabelValues
+
+HTTP_REQUEST_SECONDS: Final = Histogram(
+    "tugtainer_agent_http_request_seconds",
+    "Duration of the requests to the agent by route",
+    ["method", "route", "status"],
+)
+DOCKER_SECONDS: Final = Histogram(
+    "tugtainer_agent_docker_seconds",
+    "Duration of the docker calls by operation, without waiting for a thread",
+    ["operation"],
+)
+DOCKER_IN_FLIGHT: Final = Gauge(
+    "tugtainer_agent_docker_in_flight",
+    "Docker calls started and not finished yet, e.g. image pulls",
+    ["operation"],
+)
+DOCKER_TIMEOUTS: Final = Counter(
+    "tugtainer_agent_docker_timeouts_total",
+    "Docker calls that exceeded their timeout",
+    ["operation"],
+)
+EXECUTOR_ACTIVE: Final = Gauge(
+    "tugtainer_agent_executor_active",
+    "Executor threads running a docker call",
+)
+SIGNATURE_FAILURES: Final = Counter(
+    "tugtainer_agent_signature_failures_total",
+    "Requests rejected by the signature verification",
+)
+
+
+def _executor_queued() -> Iterator[tuple[LabelValues, float]]:
+    # Imported here, the executor module imports this one
+    from agent.unil import asyncall
+
+    yield (), asyncall.EXECUTOR._work_queue.qsize()
+
+
+def _executor_threads() -> Iterator[tuple[LabelValues, float]]:
+    from agent.unil import asyncall
+
+    yield (), len(asyncall.EXECUTOR._threads)
+
+
+EXECUTOR_QUEUED: Final = Gauge(
+    "tugtainer_agent_executor_queued",
+    "Docker calls waiting for a free executor thread",
+    collect=_executor_queued,
+)
+EXECUTOR_THREADS: Final = Gauge(
+    "tugtainer_agent_executor_threads",
+    "Threads started by the executor",
+    collect=_executor_threads,
+)
+
+
+class MetricsMiddleware:
+    """
+    Observe duration of the http requests by route template,
+    e.g. /container/inspect/{name_or_id}, so the number of series is bounded.
+    Plain ASGI, as BaseHTTPMiddleware costs more than the observation itself.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = "500"
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            )
@@ -1,10 +1,19 @@
 import asyncio
+import time
 from asyncio import AbstractEventLoop
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import cast
 
 from agent.config import Config
+from agent.metrics import (
+    DOCKER_IN_FLIGHT,
+    DOCKER_SECONDS,
+    DOCKER_TIMEOUTS,
+    EXECUTOR_ACTIVE,
+)
+from shared.util.tracing import Tracer
 
 EXECUTOR = ThreadPoolExecutor(7)
 
@@ -15,6 +24,7 @@ async def asyncall[**P, R](
     func: Callable[P, R],
     asyncall_timeout: int | None = cast(None, _timeout_sentinel),
     asyncall_loop: AbstractEventLoop | None = None,
+    asyncall_operation: str = "other",
     *args: P.args,
     **kwargs: P.kwargs,
 ) -> R:
@@ -22,17 +32,37 @@ async def asyncall[**P, R](
     Run sync func asynchronously with ThreadPoolExecutor.
     :param asyncall_timeout: timeout to an error (if not explicitly None, then default is Config.DOCKER_TIMEOUT)
     :param asyncall_loop: set loop explicitly (default is asyncio.get_event_loop())
+    :param asyncall_operation: name of the operation in the metrics and spans e.g. image.pull
     """
     if asyncall_timeout is _timeout_sentinel:
         asyncall_timeout = Config.DOCKER_TIMEOUT
     if not asyncall_loop:
         asyncall_loop = asyncio.get_event_loop()
-    if asyncall_timeout:
-        return await asyncio.wait_for(
-            asyncall_loop.run_in_executor(EXECUTOR, lambda: func(*args, **kwargs)),
-            asyncall_timeout,
-        )
-    else:
-        return await asyncall_loop.run_in_executor(
-            EXECUTOR, lambda: func(*args, **kwargs)
-        )
+
+    def _call() -> R:
+        # Counted in the thread, the call goes on after a timeout of the caller
+        EXECUTOR_ACTIVE.inc()
+        DOCKER_IN_FLIGHT.inc(asyncall_operation)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            DOCKER_SECONDS.observe(time.perf_counter() - started, asyncall_operation)
+            DOCKER_IN_FLIGHT.dec(asyncall_operation)
+            EXECUTOR_ACTIVE.dec()
+
+    # Span only within a traced request
+    span = (
+        Tracer.span(f"docker.{asyncall_operation}")
+        if Tracer.current()
+        else nullcontext()
+    )
+    with span:
+        future = asyncall_loop.run_in_executor(EXECUTOR, _call)
+        try:
+            if asyncall_timeout:
+                return await asyncio.wait_for(future, asyncall_timeout)
+            return await future
+        except TimeoutError:
+            DOCKER_TIMEOUTS.inc(asyncall_operation)
+            raise
@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from agent.metrics import DOCKER_IN_FLIGHT, DOCKER_TIMEOUTS, EXECUTOR_ACTIVE
+from agent.unil.asyncall import asyncall
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_counted():
+    timeouts = DOCKER_TIMEOUTS.get("image.pull")
+
+    with pytest.raises(TimeoutError):
+        await asyncall(
+            lambda: time.sleep(0.2),
+            asyncall_timeout=0.01,  # type: ignore[arg-type]
+            asyncall_operation="image.pull",
+        )
+    # The call goes on in the thread after the timeout
+    assert DOCKER_IN_FLIGHT.get("image.pull") == 1
+    assert DOCKER_TIMEOUTS.get("image.pull") == timeouts + 1
+
+    deadline = time.monotonic() + 5
+    while (
+        DOCKER_IN_FLIGHT.get("image.pull") or EXECUTOR_ACTIVE.get()
+    ) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert DOCKER_IN_FLIGHT.get("image.pull") == 0
+    assert EXECUTOR_ACTIVE.get() == 0
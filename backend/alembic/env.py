@@ -8,6 +8,7 @@ from backend.db.base_model import BaseModel
 from backend.db.session import async_engine
 from backend.modules.containers.containers_model import *  # noqa: F403
 from backend.modules.hosts.hosts_model import *  # noqa: F403
+from backend.modules.notifications.notifications_model import *  # noqa: F403
 from backend.modules.settings.settings_model import *  # noqa: F403
 
 # this is the Alembic Config object, which provides
@@ -16,8 +17,9 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
+# Loggers of the backend are kept, migrations run in its process.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
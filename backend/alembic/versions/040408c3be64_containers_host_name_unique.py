@@ -0,0 +1,52 @@
+"""containers host name unique
+
+Revision ID: 040408c3be64
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "040408c3be64"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest row of duplicates, lookups without order returned it.
+    # Derived table is required by mysql to select from the deleted table.
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM containers WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT MIN(id) AS id FROM containers GROUP BY host_id, name
+                ) AS keep
+            )
+            """
+        )
+    )
+    indexes = {
+        index["name"] for index in sa.inspect(op.get_bind()).get_indexes("containers")
+    }
+    if "ix_containers_name" in indexes:
+        op.drop_index("ix_containers_name", table_name="containers")
+    op.create_index(
+        "ix_containers_host_id_name",
+        "containers",
+        ["host_id", "name"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_containers_host_id_name", table_name="containers")
+    op.create_index("ix_containers_name", "containers", ["name"])
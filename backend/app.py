@@ -10,10 +10,17 @@ from backend.core.agent_client import (
     load_agents_on_init,
 )
 from backend.core.cron_manager import schedule_actions_on_init
+from backend.core.host_health import HostHealthMonitor
+from backend.core.host_registry import HostRegistry
+from backend.core.loop_lag_monitor import LoopLagMonitor
+from backend.core.notification_dispatcher import NotificationDispatcher
+from backend.core.startup_timer import StartupTimer
+from backend.db.db_writer import DbWriter
 from backend.exception import TugAgentClientError
 from backend.modules.auth.auth_router import (
     auth_router as auth_router,
 )
+from backend.modules.auth.auth_util import AUTH_OIDC_PROVIDER
 from backend.modules.containers.containers_router import (
     containers_router as containers_router,
 )
@@ -23,14 +30,27 @@ from backend.modules.hosts.hosts_router import (
 from backend.modules.images.images_router import (
     images_router as images_router,
 )
+from backend.modules.metrics.metrics_router import (
+    metrics_router as metrics_router,
+)
+from backend.modules.profiling.profiling_router import (
+    profiling_router as profiling_router,
+)
 from backend.modules.public.public_router import (
     public_router as public_router,
 )
+from backend.modules.public.public_summary import FleetSummary
 from backend.modules.settings.settings_router import (
     settings_router as settings_router,
 )
 from backend.modules.settings.settings_storage import SettingsStorage
+from backend.modules.traces.traces_router import (
+    traces_router as traces_router,
+)
+from backend.modules.traces.traces_store import RunTraces
 from shared.util.endpoint_logging_filter import EndpointLoggingFilter
+from shared.util.profiling import ProfilingError
+from shared.util.tracing import Tracer, setup_export
 
 logging.basicConfig(
     level=Config.LOG_LEVEL,
@@ -53,12 +73,37 @@ uvicorn_logger.addFilter(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Code to run on startup
+    StartupTimer.checkpoint("server")
+    Tracer.add_processor(RunTraces.process)
+    span_processor = setup_export(
+        "tugtainer-backend", Config.TRACING_FILE, Config.TRACING_OTLP_ENDPOINT
+    )
+    LoopLagMonitor.start()
+    await HostRegistry.load()
+    StartupTimer.checkpoint("hosts")
     await load_agents_on_init()
+    StartupTimer.checkpoint("agents")
     await SettingsStorage.load_all()
+    StartupTimer.checkpoint("settings")
+    await NotificationDispatcher.start()
+    StartupTimer.checkpoint("notifications")
     await schedule_actions_on_init()
+    StartupTimer.checkpoint("schedule")
+    FleetSummary.schedule_refresh()
+    HostHealthMonitor.start()
+    StartupTimer.report()
     yield  # App
     # Code to run on shutdown
+    await HostHealthMonitor.stop()
+    await LoopLagMonitor.stop()
+    await NotificationDispatcher.stop()
+    await DbWriter.stop()
     await AgentClientManager.remove_all()
+    await AUTH_OIDC_PROVIDER.close_session()
+    if span_processor:
+        Tracer.remove_processor(span_processor)
+        await span_processor.stop()
+    Tracer.remove_processor(RunTraces.process)
 
 
 app = FastAPI(root_path="/api", lifespan=lifespan)
@@ -68,6 +113,9 @@ app.include_router(public_router)
 app.include_router(settings_router)
 app.include_router(images_router)
 app.include_router(hosts_router)
+app.include_router(metrics_router)
+app.include_router(traces_router)
+app.include_router(profiling_router)
 
 
 @app.exception_handler(ClientError)
@@ -83,3 +131,11 @@ async def aiohttp_exception_handler(request: Request, exc: ClientError):
 @app.exception_handler(TugAgentClientError)
 async def agent_client_exception_handler(request: Request, exc: TugAgentClientError):
     raise HTTPException(status.HTTP_424_FAILED_DEPENDENCY, str(exc))
+
+
+@app.exception_handler(ProfilingError)
+async def profiling_exception_handler(request: Request, exc: ProfilingError):
+    raise HTTPException(status.HTTP_409_CONFLICT, str(exc))
+
+
+StartupTimer.checkpoint("import")
@@ -18,11 +18,20 @@ class Config:
     ACCESS_TOKEN_LIFETIME_MIN: ClassVar[int]
     REFRESH_TOKEN_LIFETIME_MIN: ClassVar[int]
     DB_URL: ClassVar[str]
+    DB_POOL_SIZE: ClassVar[int]
+    DB_MAX_OVERFLOW: ClassVar[int]
+    DB_STATEMENT_CACHE_SIZE: ClassVar[int]
     DISABLE_PASSWORD: ClassVar[bool]
     PASSWORD_FILE: ClassVar[str]
     HTTPS: ClassVar[bool]
     DOMAIN: ClassVar[str | None]
     ENABLE_PUBLIC_API: ClassVar[bool]
+    ENABLE_PUBLIC_METRICS: ClassVar[bool]
+    TRACING_FILE: ClassVar[str | None]
+    TRACING_OTLP_ENDPOINT: ClassVar[str | None]
+    ENABLE_PROFILING: ClassVar[bool]
+    SLOW_CALLBACK_THRESHOLD_MS: ClassVar[int]
+    ASYNCIO_DEBUG: ClassVar[bool]
     ALLOW_HOOKS: ClassVar[bool]
     GH_TOKEN: ClassVar[str]
     DOCKER_CONFIG: ClassVar[str]
@@ -64,6 +73,11 @@ class Config:
             cls.DB_URL = (
                 os.getenv("DB_URL") or "sqlite+aiosqlite:////tugtainer/tugtainer.db"
             )
+            cls.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+            cls.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+            cls.DB_STATEMENT_CACHE_SIZE = int(
+                os.getenv("DB_STATEMENT_CACHE_SIZE") or 100
+            )
             cls.DISABLE_PASSWORD = (
                 os.getenv("DISABLE_PASSWORD", "false").lower() == "true"
             )
@@ -73,6 +87,18 @@ class Config:
             cls.ENABLE_PUBLIC_API = (
                 os.getenv("ENABLE_PUBLIC_API", "false").lower() == "true"
             )
+            cls.ENABLE_PUBLIC_METRICS = (
+                os.getenv("ENABLE_PUBLIC_METRICS", "false").lower() == "true"
+            )
+            cls.TRACING_FILE = os.getenv("TRACING_FILE") or None
+            cls.TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT") or None
+            cls.ENABLE_PROFILING = (
+                os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+            )
+            cls.SLOW_CALLBACK_THRESHOLD_MS = int(
+                os.getenv("SLOW_CALLBACK_THRESHOLD_MS") or 250
+            )
+            cls.ASYNCIO_DEBUG = os.getenv("ASYNCIO_DEBUG", "false").lower() == "true"
             cls.ALLOW_HOOKS = os.getenv("ALLOW_HOOKS", "false").lower() == "true"
             cls.GH_TOKEN = os.getenv("GH_TOKEN", "")
             cls.DOCKER_CONFIG = os.getenv("DOCKER_CONFIG", "~/.docker")
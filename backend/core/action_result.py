@@ -8,6 +8,9 @@ from python_on_whales.components.image.models import (
     ImageInspectResult,
 )
 
+from backend.core.agent_client import AgentClient
+from shared.schemas.image_schemas import InspectImageRequestBodySchema
+
 ContainerCheckResultType = Literal[
     "not_available",
     "available",
@@ -19,13 +22,87 @@ ContainerCheckResultType = Literal[
 ]
 
 
-@dataclass
+@dataclass(slots=True)
+class ContainerConfigSummary:
+    image: str | None = None
+
+
+@dataclass(slots=True)
+class ContainerSummary:
+    """
+    Compact part of the container inspect result kept in check/update results.
+    Use inspect() to load full data on demand.
+    :param id: id of the container
+    :param name: name of the container
+    :param image: id of the container's image
+    :param config: container's config (only image spec)
+    """
+
+    id: str | None
+    name: str | None
+    image: str | None = None
+    config: ContainerConfigSummary = field(default_factory=ContainerConfigSummary)
+
+    @classmethod
+    def from_inspect(cls, c: ContainerInspectResult) -> "ContainerSummary":
+        return cls(
+            id=c.id,
+            name=c.name,
+            image=c.image,
+            config=ContainerConfigSummary(image=c.config.image if c.config else None),
+        )
+
+    async def inspect(self, client: AgentClient) -> ContainerInspectResult:
+        """Load full inspect data of the container"""
+        return await client.container.inspect(str(self.id or self.name))
+
+
+@dataclass(slots=True)
+class ImageSummary:
+    """
+    Compact part of the image inspect result kept in check/update results.
+    Use inspect() to load full data on demand.
+    :param id: id of the image
+    :param repo_tags: tags of the image
+    :param repo_digests: digests of the image
+    """
+
+    id: str | None
+    repo_tags: list[str] = field(default_factory=list)
+    repo_digests: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_inspect(cls, image: ImageInspectResult) -> "ImageSummary":
+        return cls(
+            id=image.id,
+            repo_tags=list(image.repo_tags or []),
+            repo_digests=list(image.repo_digests or []),
+        )
+
+    async def inspect(self, client: AgentClient) -> ImageInspectResult:
+        """Load full inspect data of the image"""
+        return await client.image.inspect(
+            InspectImageRequestBodySchema(spec_or_id=str(self.id))
+        )
+
+
+def get_image_summary(image: ImageInspectResult | None) -> ImageSummary | None:
+    return ImageSummary.from_inspect(image) if image else None
+
+
+@dataclass(slots=True)
 class ContainerActionResult:
-    container: ContainerInspectResult
+    """
+    Result of the container check/update.
+    Only compact summaries of the inspect data are kept,
+    as results live in memory for the whole run and in the progress.
+    """
+
+    container: ContainerSummary
     result: ContainerCheckResultType | None = None
     image_spec: str | None = None
-    local_image: ImageInspectResult | None = None
-    remote_image: ImageInspectResult | None = None
+    local_image: ImageSummary | None = None
+    remote_image: ImageSummary | None = None
     local_digests: list[str] = field(default_factory=list)
     remote_digests: list[str] = field(default_factory=list)
 
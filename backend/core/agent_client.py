@@ -1,6 +1,8 @@
 import asyncio
 import json
 import logging
+import time
+from collections.abc import Mapping
 from typing import Any, Final, Literal
 
 import aiohttp
@@ -13,10 +15,13 @@ from python_on_whales.components.container.models import (
 from python_on_whales.components.image.models import (
     ImageInspectResult,
 )
-from sqlalchemy import select
 
-from backend.db.session import async_session_maker
-from backend.exception import TugAgentClientError
+from backend.core.circuit_breaker import CircuitBreaker
+from backend.core.host_registry import HostRegistry
+from backend.core.latency_tracker import LatencyTracker
+from backend.enums.circuit_state_enum import ECircuitState
+from backend.exception import TugAgentClientError, TugAgentUnavailableError
+from backend.metrics import AGENT_REQUEST_ERRORS, AGENT_REQUEST_SECONDS
 from backend.modules.hosts.hosts_model import HostsModel
 from backend.modules.hosts.hosts_util import validate_agent_url_against_ssrf
 from shared.schemas.command_schemas import RunCommandRequestBodySchema
@@ -36,8 +41,19 @@ from shared.schemas.image_schemas import (
 )
 from shared.schemas.manifest_schema import ManifestInspectSchema
 from shared.schemas.network_schemas import NetworkDisconnectBodySchema
+from shared.schemas.profiling_schemas import (
+    CpuProfileFormat,
+    MemoryGroupBy,
+    MemorySnapshotSchema,
+)
 from shared.util.custom_json_dumps import custom_json_dumps
 from shared.util.signature import get_signature_headers
+from shared.util.tracing import Tracer
+
+# Building an adapter is expensive, so they are created once
+_CONTAINER_LIST_ADAPTER: Final = TypeAdapter(list[ContainerInspectResult])
+_IMAGE_LIST_ADAPTER: Final = TypeAdapter(list[ImageInspectResult])
+_COMMAND_RESULT_ADAPTER: Final = TypeAdapter(tuple[str, str])
 
 
 class AgentClient:
@@ -57,6 +73,8 @@ class AgentClient:
         self._ssl: Final = ssl
         self._session: aiohttp.ClientSession | None = None
         self._session_lock: Final = asyncio.Lock()
+        self._breaker: Final = CircuitBreaker()
+        self._latency: Final = LatencyTracker()
         self._logger: Final = logging.getLogger(self.__class__.__name__)
         self.public: Final = AgentClientPublic(self)
         self.container: Final = AgentClientContainer(self)
@@ -65,6 +83,12 @@ class AgentClient:
         self.manifest: Final = AgentClientManifest(self)
         self.network: Final = AgentClientNetwork(self)
         self.common: Final = AgentClientCommon(self)
+        self.profiling: Final = AgentClientProfiling(self)
+
+    @property
+    def is_available(self) -> bool:
+        """False if the agent is considered down and requests fail fast"""
+        return self._breaker.state != ECircuitState.OPEN
 
     async def close_session(self):
         async with self._session_lock:
@@ -96,60 +120,56 @@ class AgentClient:
         params: Query | None = None,
         timeout: int | float | None = None,
     ) -> Any | None:
-        await validate_agent_url_against_ssrf(self._url)
-        if not timeout:
-            timeout = self._timeout
-        url = f"{self._url.rstrip('/')}/{path.lstrip('/')}"
-        if isinstance(body, BaseModel):
-            _body = body.model_dump(exclude_unset=True)
-        else:
-            _body = body
-        headers = get_signature_headers(
-            secret_key=self._secret,
-            method=method,
-            path=path,
-            body=_body,
-            params=params,
-        )
-        session = await self._get_session()
-
+        content = await self._request_raw(method, path, body, params, timeout)
+        if not content:
+            return None
         try:
-            async with session.request(
-                method,
+            return json.loads(content)
+        except Exception:
+            return content.decode()
+
+    async def _request_raw(
+        self,
+        method: Literal["GET", "POST", "PUT", "DELETE"],
+        path: str,
+        body: dict | BaseModel | None = None,
+        params: Query | None = None,
+        timeout: int | float | None = None,
+    ) -> bytes:
+        """
+        Request agent and get raw response body,
+        e.g. to validate json directly with pydantic.
+        """
+        url = f"{self._url.rstrip('/')}/{path.lstrip('/')}"
+        # Without names of containers etc, so the number of series is bounded
+        endpoint: Final = "/".join(path.split("/")[:4])
+        host: Final = str(self._id)
+        allowed_in: Final = self._breaker.allow()
+        if allowed_in is None:
+            AGENT_REQUEST_ERRORS.inc(host, endpoint, "unavailable")
+            raise TugAgentUnavailableError(
+                "Agent is unavailable",
                 url,
-                headers=headers,
-                json=_body,
-                params=params,
-                ssl=self._ssl,
-                timeout=aiohttp.ClientTimeout(total=timeout),
-            ) as resp:
-                try:
-                    resp.raise_for_status()
-                except aiohttp.ClientResponseError as e:
-                    message = "Agent request error"
-                    self._logger.exception(message)
-                    try:
-                        error_body = await resp.json()
-                    except Exception:
-                        error_body = await resp.text()
-                    raise TugAgentClientError(
-                        message,
-                        url,
-                        method,
-                        resp.status,
-                        error_body,
-                    ) from e
-
-                text = await resp.text()
-                if not text:
-                    return None
-                try:
-                    return json.loads(text)
-                except Exception:
-                    return text
+                method,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"Previous requests failed, next attempt in {self._breaker.retry_in:.0f}s.",
+            )
+        # Explicit timeouts are used for long requests e.g. image pull,
+        # those are not representative for the latency of the agent
+        latency_key: Final = endpoint if not timeout else None
+        if latency_key:
+            timeout = self._latency.get_timeout(latency_key, self._timeout)
+        started: Final = time.monotonic()
+        try:
+            content = await self._send(method, url, path, body, params, timeout)
         except TimeoutError as e:
+            AGENT_REQUEST_ERRORS.inc(host, endpoint, "timeout")
             message = "Agent timeout error"
             self._logger.exception(message)
+            await self._record_failure()
+            if latency_key:
+                # Let the timeout grow if the agent became slower
+                self._latency.record(latency_key, time.monotonic() - started)
             raise TugAgentClientError(
                 message,
                 url,
@@ -158,9 +178,10 @@ class AgentClient:
                 "The problem is most likely related to the low Agent Timeout value, which you can increase in the host settings.",
             ) from e
         except aiohttp.ClientError as e:
+            AGENT_REQUEST_ERRORS.inc(host, endpoint, "connection")
             message = "Agent connection error"
             self._logger.exception(message)
-            await self.close_session()
+            await self._record_failure()
             raise TugAgentClientError(
                 message,
                 url,
@@ -168,6 +189,85 @@ class AgentClient:
                 status.HTTP_502_BAD_GATEWAY,
                 str(e),
             ) from e
+        except TugAgentClientError:
+            AGENT_REQUEST_ERRORS.inc(host, endpoint, "status")
+            raise
+        else:
+            if latency_key:
+                self._latency.record(latency_key, time.monotonic() - started)
+            return content
+        finally:
+            if allowed_in == ECircuitState.HALF_OPEN:
+                self._breaker.release()
+            AGENT_REQUEST_SECONDS.observe(time.monotonic() - started, host, endpoint)
+
+    async def _send(
+        self,
+        method: Literal["GET", "POST", "PUT", "DELETE"],
+        url: str,
+        path: str,
+        body: dict | BaseModel | None,
+        params: Query | None,
+        timeout: int | float | None,
+    ) -> bytes:
+        await validate_agent_url_against_ssrf(self._url)
+        if isinstance(body, BaseModel):
+            _body = body.model_dump(exclude_unset=True)
+        else:
+            _body = body
+        if isinstance(params, Mapping):
+            # The agent verifies the signature of the query as it's received,
+            # i.e. with string values, so they are signed and sent as strings
+            params = {key: str(value) for key, value in params.items()}
+        headers = get_signature_headers(
+            secret_key=self._secret,
+            method=method,
+            path=path,
+            body=_body,
+            params=params,
+        )
+        Tracer.inject(headers)
+        session = await self._get_session()
+
+        async with session.request(
+            method,
+            url,
+            headers=headers,
+            json=_body,
+            params=params,
+            ssl=self._ssl,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            # Any response means the agent is up, even an error one
+            self._breaker.record_success()
+            try:
+                resp.raise_for_status()
+            except aiohttp.ClientResponseError as e:
+                message = "Agent request error"
+                self._logger.exception(message)
+                try:
+                    error_body = await resp.json()
+                except Exception:
+                    error_body = await resp.text()
+                raise TugAgentClientError(
+                    message,
+                    url,
+                    method,
+                    resp.status,
+                    error_body,
+                ) from e
+
+            return await resp.read()
+
+    async def _record_failure(self) -> None:
+        self._breaker.record_failure()
+        if self._breaker.state == ECircuitState.OPEN:
+            self._logger.warning(
+                f"Agent {self._url} is unavailable, "
+                f"next attempt in {self._breaker.retry_in:.0f}s"
+            )
+            # Drop pooled connections, the agent might come back at another address
+            await self.close_session()
 
 
 class AgentClientPublic:
@@ -202,8 +302,10 @@ class AgentClientContainer:
     async def list(
         self, body: GetContainerListBodySchema
     ) -> list[ContainerInspectResult]:
-        data = await self._agent_client._request("POST", "/api/container/list", body)
-        return TypeAdapter(list[ContainerInspectResult]).validate_python(data or [])
+        data = await self._agent_client._request_raw(
+            "POST", "/api/container/list", body
+        )
+        return _CONTAINER_LIST_ADAPTER.validate_json(data or b"[]")
 
     async def exists(self, name_or_id: str) -> bool:
         data = await self._agent_client._request(
@@ -212,10 +314,10 @@ class AgentClientContainer:
         return bool(data)
 
     async def inspect(self, name_or_id: str) -> ContainerInspectResult:
-        data = await self._agent_client._request(
+        data = await self._agent_client._request_raw(
             "GET", f"/api/container/inspect/{name_or_id}"
         )
-        return ContainerInspectResult.model_validate(data)
+        return ContainerInspectResult.model_validate_json(data)
 
     async def create(
         self, body: CreateContainerRequestBodySchema
@@ -316,12 +418,12 @@ class AgentClientImage:
         return ImageInspectResult.model_validate(data)
 
     async def list(self, body: GetImageListBodySchema) -> list[ImageInspectResult]:
-        data = await self._agent_client._request(
+        data = await self._agent_client._request_raw(
             "POST",
             "/api/image/list",
             body,
         )
-        return TypeAdapter(list[ImageInspectResult]).validate_python(data or [])
+        return _IMAGE_LIST_ADAPTER.validate_json(data or b"[]")
 
     async def prune(self, body: PruneImagesRequestBodySchema) -> str:
         data = await self._agent_client._request(
@@ -361,7 +463,7 @@ class AgentClientCommand:
         if isinstance(data, str):
             return (data, "")
         try:
-            return TypeAdapter(tuple[str, str]).validate_python(data)
+            return _COMMAND_RESULT_ADAPTER.validate_python(data)
         except Exception:
             return (str(data), "")
 
@@ -393,18 +495,72 @@ class AgentClientCommon:
         return DockerVersionScheme.model_validate(data)
 
 
+class AgentClientProfiling:
+    def __init__(self, agent_client: AgentClient):
+        self._agent_client = agent_client
+
+    async def cpu(
+        self, seconds: float, interval_ms: float, format: CpuProfileFormat
+    ) -> bytes:
+        return await self._agent_client._request_raw(
+            "GET",
+            "/api/profiling/cpu",
+            params={"seconds": seconds, "interval_ms": interval_ms, "format": format},
+            timeout=seconds + self._agent_client._timeout,
+        )
+
+    async def memory_start(self, frames: int) -> None:
+        await self._agent_client._request(
+            "POST", "/api/profiling/memory/start", params={"frames": frames}
+        )
+
+    async def memory_stop(self) -> None:
+        await self._agent_client._request("POST", "/api/profiling/memory/stop")
+
+    async def memory_snapshot(
+        self, limit: int, group_by: MemoryGroupBy
+    ) -> MemorySnapshotSchema:
+        # A snapshot of a big heap takes a while
+        content = await self._agent_client._request_raw(
+            "GET",
+            "/api/profiling/memory/snapshot",
+            params={"limit": limit, "group_by": group_by},
+            timeout=self._agent_client._long_timeout,
+        )
+        return MemorySnapshotSchema.model_validate_json(content)
+
+    async def memory_diff(
+        self, limit: int, group_by: MemoryGroupBy
+    ) -> MemorySnapshotSchema:
+        content = await self._agent_client._request_raw(
+            "GET",
+            "/api/profiling/memory/diff",
+            params={"limit": limit, "group_by": group_by},
+            timeout=self._agent_client._long_timeout,
+        )
+        return MemorySnapshotSchema.model_validate_json(content)
+
+    async def memory_dump(self) -> bytes:
+        return await self._agent_client._request_raw(
+            "GET",
+            "/api/profiling/memory/dump",
+            timeout=self._agent_client._long_timeout,
+        )
+
+
 async def load_agents_on_init():
-    """Get hosts from db and init clients"""
-    async with async_session_maker() as session:
-        stmt = select(HostsModel).where(HostsModel.enabled)
-        result = await session.execute(stmt)
-        hosts = result.scalars().all()
-        for h in hosts:
-            try:
-                await AgentClientManager.set_client(h)
-                logging.info(f"{h.id}.{h.name}: agent client loaded")
-            except Exception:
-                logging.exception(f"{h.name}: failed to load agent client")
+    """Get hosts from registry and init clients concurrently"""
+
+    async def _load(h: HostsModel):
+        try:
+            await AgentClientManager.set_client(h)
+            logging.info(f"{h.id}.{h.name}: agent client loaded")
+        except Exception:
+            logging.exception(f"{h.name}: failed to load agent client")
+
+    await asyncio.gather(
+        *(_load(h) for h in await HostRegistry.get_all(enabled_only=True))
+    )
 
 
 class AgentClientManager:
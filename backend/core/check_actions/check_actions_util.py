@@ -9,12 +9,15 @@ from python_on_whales.components.container.models import (
 )
 
 from backend.docker_config import DockerConfig
+from backend.metrics import registry_trace_config
 from backend.modules.containers.containers_model import (
     ContainersModel,
 )
 from backend.modules.settings.settings_enum import ESettingKey
 from backend.modules.settings.settings_storage import SettingsStorage
 
+_REGISTRY_TRACE: Final = registry_trace_config()
+
 
 def filter_containers_by_check_enabled(
     containers: list[ContainerInspectResult],
@@ -158,7 +161,9 @@ async def get_image_remote_digest(
 
             return _on_resp(resp)
 
-    async with aiohttp.ClientSession(trust_env=True) as session:
+    async with aiohttp.ClientSession(
+        trust_env=True, trace_configs=[_REGISTRY_TRACE]
+    ) as session:
         last_error: Exception | None = None
 
         for scheme in schemes:
@@ -1,24 +1,20 @@
 import logging
 from typing import Final
 
-from sqlalchemy import select
-
 from backend.core.action_result import (
     HostActionResult,
 )
 from backend.core.agent_client import AgentClientManager
-from backend.core.notifications_core import send_check_notification
+from backend.core.host_registry import HostRegistry
+from backend.core.notification_dispatcher import NotificationDispatcher
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import (
     AllActionProgress,
 )
 from backend.core.progress.progress_util import (
     ALL_CONTAINERS_STATUS_KEY,
-    is_allowed_start_cache,
 )
-from backend.db.session import async_session_maker
 from backend.enums.action_status_enum import EActionStatus
-from backend.modules.hosts.hosts_model import HostsModel
 
 from .check_host_containers import check_host_containers
 
@@ -31,10 +27,9 @@ async def check_all_containers(
     :param manual: manual check includes all containers
     """
     cache: Final = ProgressCache[AllActionProgress](ALL_CONTAINERS_STATUS_KEY)
-    state: Final = cache.get()
     logger: Final = logging.getLogger("check_all_containers")
 
-    if not is_allowed_start_cache(state):
+    if not cache.try_lock():
         logger.warning("Check process is already running. Exiting.")
         return
 
@@ -44,12 +39,7 @@ async def check_all_containers(
         )
         logger.info("Start checking of all containers for all hosts")
 
-        async with async_session_maker() as session:
-            hosts: Final = (
-                (await session.execute(select(HostsModel).where(HostsModel.enabled)))
-                .scalars()
-                .all()
-            )
+        hosts: Final = await HostRegistry.get_all(enabled_only=True)
 
         cache.update(
             {"status": EActionStatus.CHECKING},
@@ -58,9 +48,13 @@ async def check_all_containers(
         for host in hosts:
             try:
                 client = AgentClientManager.get_host_client(host)
+                if not client.is_available:
+                    logger.warning(f"Agent of {host.name} is unavailable. Skipping.")
+                    continue
                 result = await check_host_containers(host, client, manual)
                 if result:
                     results += [result]
+                    cache.publish_item(result)
             except Exception:
                 logger.exception(f"Failed to check host {host.name}")
 
@@ -71,10 +65,12 @@ async def check_all_containers(
             }
         )
         try:
-            await send_check_notification(results)
+            NotificationDispatcher.enqueue(results)
         except Exception:
-            logger.exception("Failed to send notification")
+            logger.exception("Failed to enqueue notification")
 
     except Exception:
         cache.update({"status": EActionStatus.ERROR})
         logger.exception("Error while checking all containers for all hosts")
+    finally:
+        cache.unlock()
@@ -1,27 +1,33 @@
 import logging
+import time
 from typing import Final
 
 from backend.core.action_result import (
     HostActionResult,
 )
 from backend.core.agent_client import AgentClient
+from backend.core.host_inventory import HostInventory
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import (
     HostActionProgress,
 )
 from backend.core.progress.progress_util import (
     get_host_cache_key,
-    is_allowed_start_cache,
 )
 from backend.db.session import async_session_maker
 from backend.enums.action_status_enum import EActionStatus
+from backend.metrics import (
+    CONTAINER_CHECK_SECONDS,
+    CONTAINER_LAST_CHECK_SECONDS,
+    HOST_CHECK_SECONDS,
+    forget_containers,
+)
 from backend.modules.containers.containers_util import (
     get_host_containers,
 )
 from backend.modules.hosts.hosts_model import HostsModel
-from shared.schemas.container_schemas import (
-    GetContainerListBodySchema,
-)
+from backend.modules.public.public_summary import FleetSummary
+from shared.util.tracing import Tracer
 
 from .check_actions_util import (
     filter_containers_by_check_enabled,
@@ -46,54 +52,67 @@ async def check_host_containers(
     )
     cache_key: Final = get_host_cache_key(host)
     cache: Final = ProgressCache[HostActionProgress](cache_key)
-    state: Final = cache.get()
     logger: Final = logging.getLogger(
         f"check_host_containers.{host.id}.{host.name}"
     )
 
-    if not is_allowed_start_cache(state):
+    if not cache.try_lock():
         logger.warning("Check action is already running. Exiting.")
         return None
 
-    try:
-        logger.info("Starting check action")
-        cache.set({"status": EActionStatus.PREPARING})
-        containers = await client.container.list(
-            GetContainerListBodySchema(all=True)
-        )
-        async with async_session_maker() as session:
-            containers_db: Final = await get_host_containers(
-                session,
-                host.id,
-            )
-            containers_db_map: Final = {
-                item.name: item for item in containers_db
-            }
+    started: Final = time.perf_counter()
+    with Tracer.span(
+        "check_host", host_id=host.id, host_name=host.name
+    ) as span:
+        try:
+            logger.info("Starting check action")
+            cache.set({"status": EActionStatus.PREPARING})
+            containers = await HostInventory.get_containers(host, client)
+            forget_containers(str(host.id), {str(c.name) for c in containers})
+            async with async_session_maker() as session:
+                containers_db: Final = await get_host_containers(
+                    session,
+                    host.id,
+                )
+                containers_db_map: Final = {
+                    item.name: item for item in containers_db
+                }
 
-        if not manual:
-            containers = filter_containers_by_check_enabled(
+            if not manual:
+                containers = filter_containers_by_check_enabled(
+                    containers, containers_db_map
+                )
+            containers = sort_containers_by_checked_at(
                 containers, containers_db_map
             )
-        containers = sort_containers_by_checked_at(
-            containers, containers_db_map
-        )
 
-        cache.update(
-            {"status": EActionStatus.CHECKING},
-        )
-        for c in containers:
-            res = await check_one_container(
-                client,
-                host,
-                c,
+            cache.update(
+                {"status": EActionStatus.CHECKING},
             )
-            result.items.append(res)
+            for c in containers:
+                container_started = time.perf_counter()
+                with Tracer.span("check", container=str(c.name)):
+                    res = await check_one_container(
+                        client,
+                        host,
+                        c,
+                    )
+                took = time.perf_counter() - container_started
+                CONTAINER_CHECK_SECONDS.observe(took, str(host.id))
+                CONTAINER_LAST_CHECK_SECONDS.set(took, str(host.id), str(c.name))
+                result.items.append(res)
+                cache.publish_item(res)
 
-        cache.update({"status": EActionStatus.DONE, "result": result})
-        return result
-    except Exception:
-        logger.exception("Failed to check host")
-        cache.update(
-            {"status": EActionStatus.ERROR},
-        )
-        return result
+            cache.update({"status": EActionStatus.DONE, "result": result})
+            FleetSummary.invalidate()
+            return result
+        except Exception as e:
+            logger.exception("Failed to check host")
+            span.set_error(e)
+            cache.update(
+                {"status": EActionStatus.ERROR},
+            )
+            return result
+        finally:
+            cache.unlock()
+            HOST_CHECK_SECONDS.observe(time.perf_counter() - started, str(host.id))
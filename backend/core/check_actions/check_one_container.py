@@ -13,6 +13,8 @@ from sqlalchemy import select
 from backend.core.action_result import (
     ContainerActionResult,
     ContainerCheckResultType,
+    ContainerSummary,
+    ImageSummary,
 )
 from backend.core.agent_client import AgentClient
 from backend.core.check_actions.check_actions_util import (
@@ -21,14 +23,15 @@ from backend.core.check_actions.check_actions_util import (
 from backend.core.container_util.get_container_image_spec import (
     get_container_image_spec,
 )
+from backend.core.host_inventory import HostInventory
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import (
     ContainerActionProgress,
 )
 from backend.core.progress.progress_util import (
     get_container_cache_key,
-    is_allowed_start_cache,
 )
+from backend.db.db_writer import DbWriter
 from backend.db.session import async_session_maker
 from backend.enums.action_status_enum import EActionStatus
 from backend.modules.containers.containers_model import (
@@ -36,7 +39,7 @@ from backend.modules.containers.containers_model import (
 )
 from backend.modules.containers.containers_util import (
     ContainerInsertOrUpdateData,
-    insert_or_update_container,
+    upsert_container,
 )
 from backend.modules.hosts.hosts_model import HostsModel
 from backend.modules.settings.settings_enum import ESettingKey
@@ -58,21 +61,20 @@ async def check_one_container(
     Check if there is new image for the container.
     This func should not raise exceptions.
     """
-    result: Final = ContainerActionResult(container)
+    result: Final = ContainerActionResult(ContainerSummary.from_inspect(container))
     delay: Final = SettingsStorage.get(ESettingKey.REGISTRY_REQ_DELAY)
     cache_key: Final = get_container_cache_key(
         host,
         container,
     )
     cache: Final = ProgressCache[ContainerActionProgress](cache_key)
-    state: Final = cache.get()
     logger: Final = logging.getLogger(f"check_one_container.{container.name}")
 
-    if not is_allowed_start_cache(state):
-        logger.warning("Check action already running. Exiting.")
-        return result
-
     async with async_session_maker() as session:
+        # Locked inside of the session, so the lock is always released by finally
+        if not cache.try_lock():
+            logger.warning("Check action already running. Exiting.")
+            return result
         try:
             logger.info("Checking container update availability")
             cache.set({"status": EActionStatus.PREPARING})
@@ -95,7 +97,7 @@ async def check_one_container(
                 local_image = await client.image.inspect(
                     InspectImageRequestBodySchema(spec_or_id=image_spec)
                 )
-            result.local_image = local_image
+            result.local_image = ImageSummary.from_inspect(local_image)
 
             if not local_image.repo_digests:
                 logger.warning(
@@ -105,7 +107,7 @@ async def check_one_container(
                 return result
 
             local_digests: Final = local_image.repo_digests
-            result.local_digests = local_image.repo_digests
+            result.local_digests = local_digests
             logger.info(f"Local digests is {local_digests}")
 
             c_db: Final = (
@@ -128,7 +130,8 @@ async def check_one_container(
                 remote_image: Final = await client.image.pull(
                     PullImageRequestBodySchema(image=image_spec)
                 )
-                result.remote_image = remote_image
+                HostInventory.invalidate(host.id)
+                result.remote_image = ImageSummary.from_inspect(remote_image)
                 await asyncio.sleep(jitter(delay))
 
             # get remote digests
@@ -186,8 +189,8 @@ async def check_one_container(
                 not c_db or c_db.remote_digests != remote_digests
             ):
                 result_db["remote_digests_changed_at"] = now()
-            await insert_or_update_container(
-                session, host.id, str(container.name), result_db
+            await DbWriter.submit(
+                lambda s: upsert_container(s, host.id, str(container.name), result_db)
             )
 
             cache.update({"status": EActionStatus.DONE, "result": result})
@@ -196,3 +199,5 @@ async def check_one_container(
             logger.exception("Failed to check container")
             cache.update({"status": EActionStatus.ERROR, "result": result})
             return result
+        finally:
+            cache.unlock()
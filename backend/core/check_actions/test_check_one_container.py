@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+from python_on_whales.components.container.models import (
+    ContainerInspectResult,
+)
+
+from backend.core.check_actions.check_one_container import check_one_container
+from backend.core.progress.progress_cache import ProgressCache
+from backend.core.progress.progress_util import get_container_cache_key
+
+module_path = "backend.core.check_actions.check_one_container"
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_if_session_fails(mocker: MockerFixture):
+    mocker.patch(f"{module_path}.SettingsStorage.get", return_value=0)
+    mocker.patch(
+        f"{module_path}.async_session_maker", side_effect=RuntimeError("no db")
+    )
+    host = SimpleNamespace(id=1, name="host")
+    container = ContainerInspectResult.model_validate({"Id": "a", "Name": "app"})
+    cache: ProgressCache = ProgressCache(get_container_cache_key(host, container))  # type: ignore[arg-type]
+
+    with pytest.raises(RuntimeError):
+        await check_one_container(MagicMock(), host, container)  # type: ignore[arg-type]
+
+    assert cache.try_lock()
+    cache.unlock()
@@ -0,0 +1,80 @@
+import time
+from typing import ClassVar
+
+from backend.enums.circuit_state_enum import ECircuitState
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of the agent connection.
+    CLOSED - requests pass, consecutive failures are counted.
+    OPEN - requests fail fast until the backoff expires,
+    the backoff grows exponentially with every consecutive opening.
+    HALF_OPEN - a single probe request passes,
+    its result closes or reopens the circuit.
+    """
+
+    FAILURE_THRESHOLD: ClassVar[int] = 3
+    BASE_BACKOFF: ClassVar[float] = 5  # seconds
+    MAX_BACKOFF: ClassVar[float] = 300  # seconds
+
+    def __init__(self):
+        self._state = ECircuitState.CLOSED
+        self._failures = 0
+        self._openings = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> ECircuitState:
+        if self._state == ECircuitState.OPEN and time.monotonic() >= self._open_until:
+            self._state = ECircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed"""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow(self) -> ECircuitState | None:
+        """
+        Get state in which the request is allowed, None if it isn't.
+        The request allowed in HALF_OPEN state takes the probe slot,
+        only that request releases it.
+        """
+        state = self.state
+        if state == ECircuitState.CLOSED:
+            return state
+        if state == ECircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return state
+        return None
+
+    def record_success(self) -> None:
+        self._state = ECircuitState.CLOSED
+        self._failures = 0
+        self._openings = 0
+
+    def record_failure(self) -> None:
+        if self._state == ECircuitState.OPEN:
+            # Requests sent before the opening, the backoff is already set
+            return
+        self._failures += 1
+        if (
+            self._state == ECircuitState.HALF_OPEN
+            or self._failures >= self.FAILURE_THRESHOLD
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Free the probe slot after the probe, even if it was cancelled"""
+        self._probing = False
+
+    def _open(self) -> None:
+        self._openings += 1
+        backoff = min(
+            self.MAX_BACKOFF,
+            self.BASE_BACKOFF * 2 ** (self._openings - 1),
+        )
+        self._state = ECircuitState.OPEN
+        self._open_until = time.monotonic() + backoff
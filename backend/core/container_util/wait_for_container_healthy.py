@@ -6,6 +6,7 @@ from python_on_whales.components.container.models import (
 )
 
 from backend.core.agent_client import AgentClient
+from shared.util.tracing import Tracer
 
 from .get_container_health_status_str import (
     get_container_health_status_str,
@@ -23,26 +24,27 @@ async def wait_for_container_healthy(
     If the healthcheck property is missing,
     wait only for running state.
     """
-    has_healthcheck = bool(container.state and container.state.health)
-    id = container.id
-    if not id:
-        return False, container
-    start = time.time()
-    while time.time() - start < timeout:
-        container = await client.container.inspect(id)
-        if has_healthcheck:
-            health = get_container_health_status_str(container)
-            if health == "healthy":
+    with Tracer.span("health_wait", container=str(container.name)):
+        has_healthcheck = bool(container.state and container.state.health)
+        id = container.id
+        if not id:
+            return False, container
+        start = time.time()
+        while time.time() - start < timeout:
+            container = await client.container.inspect(id)
+            if has_healthcheck:
+                health = get_container_health_status_str(container)
+                if health == "healthy":
+                    return True, container
+            elif is_running_container(container):
                 return True, container
-        elif is_running_container(container):
+            await asyncio.sleep(5)
+        container = await client.container.inspect(id)
+        health = get_container_health_status_str(container)
+        # On last attempt assume unknown is also healthy
+        if is_running_container(container) and health in [
+            "healthy",
+            "unknown",
+        ]:
             return True, container
-        await asyncio.sleep(5)
-    container = await client.container.inspect(id)
-    health = get_container_health_status_str(container)
-    # On last attempt assume unknown is also healthy
-    if is_running_container(container) and health in [
-        "healthy",
-        "unknown",
-    ]:
-        return True, container
-    return False, container
+        return False, container
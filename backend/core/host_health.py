@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Final
+
+from backend.core.agent_client import AgentClientManager
+from backend.core.host_registry import HostRegistry
+from backend.exception import TugAgentClientError
+from backend.modules.hosts.hosts_model import HostsModel
+from backend.util.jitter import jitter
+from backend.util.now import now
+
+
+@dataclass
+class HostHealth:
+    """
+    Result of the host probe.
+    :param ok: whether the agent is reachable and accepts our secret
+    :param err: error of the last probe
+    :param latency: duration of the last probe in seconds
+    :param checked_at: date of the last probe
+    :param last_ok_at: date of the last successful probe
+    """
+
+    ok: bool
+    err: str | None = None
+    latency: float | None = None
+    checked_at: datetime | None = None
+    last_ok_at: datetime | None = None
+
+
+class HostHealthMonitor:
+    """
+    Background probing of the enabled hosts.
+    Status requests are served from the last probe instead of live agent calls.
+    Probes go through the host's agent client, so they also drive its circuit
+    breaker, i.e. offline hosts are skipped by check/update of all hosts.
+    """
+
+    INTERVAL: ClassVar[float] = 30  # seconds
+    _HEALTH: ClassVar[dict[int, HostHealth]] = {}
+    _TASK: ClassVar[asyncio.Task | None] = None
+    _LOGGER: Final = logging.getLogger("HostHealthMonitor")
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._TASK is None or cls._TASK.done():
+            cls._TASK = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._TASK is not None:
+            cls._TASK.cancel()
+            try:
+                await cls._TASK
+            except asyncio.CancelledError:
+                pass
+            cls._TASK = None
+
+    @classmethod
+    def get(cls, host_id: int) -> HostHealth | None:
+        return cls._HEALTH.get(host_id)
+
+    @classmethod
+    def forget(cls, host_id: int | None = None) -> None:
+        """
+        Drop health of the host, e.g. after its modification.
+        :param host_id: id of the host, drop all if None
+        """
+        if host_id is None:
+            cls._HEALTH.clear()
+        else:
+            cls._HEALTH.pop(host_id, None)
+
+    @classmethod
+    async def probe(cls, host: HostsModel) -> HostHealth:
+        """Probe the host now and store the result"""
+        client: Final = AgentClientManager.get_host_client(host)
+        previous: Final = cls._HEALTH.get(host.id)
+        started: Final = time.monotonic()
+        err: str | None = None
+        try:
+            await client.public.health()
+            await client.public.access()
+        except TugAgentClientError as e:
+            err = str(e)
+        except Exception as e:
+            err = f"Unknown error\n{str(e)}"
+        checked_at: Final = now()
+        health: Final = HostHealth(
+            ok=err is None,
+            err=err,
+            latency=time.monotonic() - started,
+            checked_at=checked_at,
+            last_ok_at=checked_at
+            if err is None
+            else (previous.last_ok_at if previous else None),
+        )
+        cls._HEALTH[host.id] = health
+        return health
+
+    @classmethod
+    async def probe_all(cls) -> None:
+        """Probe all enabled hosts concurrently"""
+        hosts: Final = await HostRegistry.get_all(enabled_only=True)
+        # Hosts might be disabled or deleted since the last run
+        for host_id in cls._HEALTH.keys() - {h.id for h in hosts}:
+            cls._HEALTH.pop(host_id, None)
+        await asyncio.gather(*(cls.probe(h) for h in hosts))
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            try:
+                await cls.probe_all()
+            except Exception:
+                cls._LOGGER.exception("Failed to probe hosts")
+            # Jitter avoids probing all hosts in lockstep with other periodic jobs
+            await asyncio.sleep(jitter(cls.INTERVAL))
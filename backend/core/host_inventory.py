@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar, Literal, cast
+
+from python_on_whales.components.container.models import (
+    ContainerInspectResult,
+)
+from python_on_whales.components.image.models import (
+    ImageInspectResult,
+)
+
+from backend.core.agent_client import AgentClient
+from backend.modules.hosts.hosts_model import HostsModel
+from shared.schemas.container_schemas import GetContainerListBodySchema
+from shared.schemas.image_schemas import GetImageListBodySchema
+
+InventoryKind = Literal["containers", "images"]
+
+
+@dataclass
+class _Snapshot:
+    fetched_at: float
+    data: list[Any]
+
+
+class HostInventory:
+    """
+    Short living snapshots of the host's containers and images lists.
+    Concurrent readers of the same host share one agent request,
+    mutating actions should call invalidate() afterwards.
+    """
+
+    TTL: ClassVar[float] = 5  # seconds
+    _SNAPSHOTS: ClassVar[dict[tuple[int, InventoryKind], _Snapshot]] = {}
+    _INFLIGHT: ClassVar[dict[tuple[int, InventoryKind], asyncio.Task]] = {}
+    _GENERATIONS: ClassVar[dict[int, int]] = {}
+
+    @classmethod
+    async def get_containers(
+        cls, host: HostsModel, client: AgentClient
+    ) -> list[ContainerInspectResult]:
+        """Get list of all containers of the host (including stopped)"""
+        return await cls._get(
+            host.id,
+            "containers",
+            lambda: client.container.list(GetContainerListBodySchema(all=True)),
+        )
+
+    @classmethod
+    async def get_images(
+        cls, host: HostsModel, client: AgentClient
+    ) -> list[ImageInspectResult]:
+        """Get list of all images of the host"""
+        return await cls._get(
+            host.id,
+            "images",
+            lambda: client.image.list(GetImageListBodySchema(all=True)),
+        )
+
+    @classmethod
+    def invalidate(cls, host_id: int | None = None) -> None:
+        """
+        Drop snapshots of the host.
+        Requests that are already in flight will not populate the cache.
+        :param host_id: id of the host, drop all if None
+        """
+        host_ids = (
+            {key[0] for key in [*cls._SNAPSHOTS, *cls._INFLIGHT]}
+            if host_id is None
+            else {host_id}
+        )
+        for _id in host_ids:
+            cls._GENERATIONS[_id] = cls._GENERATIONS.get(_id, 0) + 1
+            for kind in cast(tuple[InventoryKind, ...], ("containers", "images")):
+                cls._SNAPSHOTS.pop((_id, kind), None)
+                cls._INFLIGHT.pop((_id, kind), None)
+
+    @classmethod
+    async def _get(
+        cls,
+        host_id: int,
+        kind: InventoryKind,
+        fetch: Callable[[], Awaitable[list[Any]]],
+    ) -> list[Any]:
+        key = (host_id, kind)
+        snapshot = cls._SNAPSHOTS.get(key)
+        if snapshot and time.monotonic() - snapshot.fetched_at < cls.TTL:
+            return list(snapshot.data)
+
+        task = cls._INFLIGHT.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                cls._fetch(key, fetch, cls._GENERATIONS.get(host_id, 0))
+            )
+            # Avoid "exception was never retrieved" if all readers are cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            cls._INFLIGHT[key] = task
+        return list(await asyncio.shield(task))
+
+    @classmethod
+    async def _fetch(
+        cls,
+        key: tuple[int, InventoryKind],
+        fetch: Callable[[], Awaitable[list[Any]]],
+        generation: int,
+    ) -> list[Any]:
+        try:
+            data = await fetch()
+            if cls._GENERATIONS.get(key[0], 0) == generation:
+                cls._SNAPSHOTS[key] = _Snapshot(time.monotonic(), data)
+            return data
+        finally:
+            if cls._INFLIGHT.get(key) is asyncio.current_task():
+                cls._INFLIGHT.pop(key, None)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import ClassVar
+
+from sqlalchemy import select
+
+from backend.db.session import async_session_maker
+from backend.modules.hosts.hosts_model import HostsModel
+
+
+class HostRegistry:
+    """
+    In-memory registry of hosts, so the hot paths don't query the db
+    for host metadata. Hosts change only through the hosts CRUD,
+    which must call invalidate() after commit.
+    Returned models are detached from any session and must not be modified.
+    """
+
+    _HOSTS: ClassVar[dict[int, HostsModel]] = {}
+    _LOADED: ClassVar[bool] = False
+    _GENERATION: ClassVar[int] = 0
+    _LOCK: ClassVar[asyncio.Lock] = asyncio.Lock()
+
+    @classmethod
+    async def load(cls) -> None:
+        """(Re)load all hosts from db"""
+        generation = cls._GENERATION
+        async with async_session_maker() as session:
+            hosts = (await session.execute(select(HostsModel))).scalars().all()
+            session.expunge_all()
+        # Hosts were modified during the query, the result might be stale
+        if generation != cls._GENERATION:
+            return
+        cls._HOSTS = {h.id: h for h in hosts}
+        cls._LOADED = True
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop hosts, they will be reloaded on the next access"""
+        cls._GENERATION += 1
+        cls._HOSTS = {}
+        cls._LOADED = False
+
+    @classmethod
+    async def get(cls, host_id: int) -> HostsModel | None:
+        await cls._ensure_loaded()
+        return cls._HOSTS.get(host_id)
+
+    @classmethod
+    async def get_all(cls, enabled_only: bool = False) -> list[HostsModel]:
+        """
+        Get hosts ordered by id.
+        :param enabled_only: skip disabled hosts
+        """
+        await cls._ensure_loaded()
+        return [
+            h for _, h in sorted(cls._HOSTS.items()) if h.enabled or not enabled_only
+        ]
+
+    @classmethod
+    async def _ensure_loaded(cls) -> None:
+        if cls._LOADED:
+            return
+        async with cls._LOCK:
+            while not cls._LOADED:
+                await cls.load()
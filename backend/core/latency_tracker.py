@@ -0,0 +1,45 @@
+import math
+from collections import deque
+from typing import ClassVar
+
+
+class LatencyTracker:
+    """
+    Sliding windows of request latencies to derive adaptive timeouts.
+    Every kind of request has its own window, e.g. a health check
+    and a list of hundreds of containers have very different latency.
+    """
+
+    WINDOW: ClassVar[int] = 200
+    MIN_SAMPLES: ClassVar[int] = 20
+    PERCENTILE: ClassVar[float] = 99
+    FACTOR: ClassVar[float] = 4
+    MIN_TIMEOUT: ClassVar[float] = 1  # seconds
+
+    def __init__(self):
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.WINDOW)
+        samples.append(seconds)
+
+    def percentile(self, key: str, p: float) -> float | None:
+        """Nearest-rank percentile of the latencies or None if not enough samples"""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def get_timeout(self, key: str, default: float) -> float:
+        """
+        Get timeout of the request.
+        :param key: kind of the request
+        :param default: configured timeout, it's also the upper bound
+        """
+        latency = self.percentile(key, self.PERCENTILE)
+        if latency is None:
+            return default
+        return min(default, max(self.MIN_TIMEOUT, latency * self.FACTOR))
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import ClassVar, Final
+
+from backend.config import Config
+from backend.metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_SLOW_CALLBACKS
+
+
+class LoopLagMonitor:
+    """
+    Watchdog of the event loop.
+    A thread schedules a callback on the loop every interval, the delay
+    until it runs is the lag. A blocking call on the loop delays every request
+    and progress update, so if the callback doesn't run within the threshold,
+    the stack of the loop thread is logged while it's still blocked.
+    """
+
+    INTERVAL: ClassVar[float] = 0.1  # seconds
+    _LOGGER: Final = logging.getLogger("LoopLagMonitor")
+    _THREAD: ClassVar[threading.Thread | None] = None
+    _STOP: ClassVar[threading.Event] = threading.Event()
+    _PENDING: ClassVar[float | None] = None  # When the pending callback was scheduled
+    _REPORTED: ClassVar[bool] = False  # Whether the current block is logged
+    _LOCK: Final = threading.Lock()
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._THREAD is not None and cls._THREAD.is_alive():
+            return
+        loop = asyncio.get_running_loop()
+        threshold = Config.SLOW_CALLBACK_THRESHOLD_MS / 1000
+        if Config.ASYNCIO_DEBUG:
+            # Asyncio logs every callback longer than slow_callback_duration,
+            # the default of 0.1s is too noisy with sqlite and pydantic
+            loop.set_debug(True)
+            loop.slow_callback_duration = threshold or 0.1
+        cls._STOP.clear()
+        cls._PENDING = None
+        cls._REPORTED = False
+        cls._THREAD = threading.Thread(
+            target=cls._run,
+            args=(loop, threading.get_ident(), threshold),
+            name="LoopLagMonitor",
+            daemon=True,
+        )
+        cls._THREAD.start()
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._THREAD is not None:
+            cls._STOP.set()
+            await asyncio.to_thread(cls._THREAD.join)
+            cls._THREAD = None
+
+    @classmethod
+    def _run(
+        cls, loop: asyncio.AbstractEventLoop, loop_thread: int, threshold: float
+    ) -> None:
+        """
+        :param loop_thread: id of the thread running the loop
+        :param threshold: seconds of the block to log, 0 to disable logging
+        """
+        while not cls._STOP.wait(cls.INTERVAL):
+            pending = cls._PENDING
+            if pending is None:
+                cls._PENDING = time.monotonic()
+                try:
+                    loop.call_soon_threadsafe(cls._on_callback)
+                except RuntimeError:
+                    # Loop is closed
+                    return
+                continue
+            with cls._LOCK:
+                blocked = time.monotonic() - pending
+                if not threshold or blocked < threshold or cls._REPORTED:
+                    continue
+                if cls._PENDING != pending:
+                    # The callback has just run
+                    continue
+                cls._REPORTED = True
+            EVENT_LOOP_SLOW_CALLBACKS.inc()
+            frame = sys._current_frames().get(loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            cls._LOGGER.warning(
+                f"Event loop is blocked for {blocked:.3f}s, the loop thread is at:\n"
+                f"{stack}"
+            )
+
+    @classmethod
+    def _on_callback(cls) -> None:
+        with cls._LOCK:
+            pending, reported = cls._PENDING, cls._REPORTED
+            cls._PENDING = None
+            cls._REPORTED = False
+        if pending is None:
+            return
+        lag = time.monotonic() - pending
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        if reported:
+            cls._LOGGER.warning(f"Event loop was blocked for {lag:.3f}s")
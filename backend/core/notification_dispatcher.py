@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import ClassVar, Final
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.action_result import (
+    ContainerActionResult,
+    HostActionResult,
+)
+from backend.core.notifications_core import (
+    any_worthy,
+    render_check_notification,
+    send_notification,
+    split_urls,
+)
+from backend.db.db_writer import DbWriter
+from backend.db.session import async_session_maker
+from backend.metrics import NOTIFICATION_DELIVERY_SECONDS
+from backend.modules.notifications.notifications_model import (
+    NotificationOutboxModel,
+)
+from backend.modules.settings.settings_enum import ESettingKey
+from backend.modules.settings.settings_storage import SettingsStorage
+from backend.util.jitter import jitter
+from backend.util.now import now
+
+
+@dataclass
+class _Digest:
+    """Results collected during the coalescing window"""
+
+    hosts: dict[int, HostActionResult] = field(default_factory=dict)
+
+    def add(self, results: list[HostActionResult]) -> None:
+        """
+        Merge results, the latest result of the container wins,
+        unless it hides a worthy one e.g. available(notified) after available.
+        """
+        for result in results:
+            host = self.hosts.setdefault(
+                result.host_id,
+                HostActionResult(host_id=result.host_id, host_name=result.host_name),
+            )
+            host.host_name = result.host_name
+            if result.prune_result:
+                host.prune_result = result.prune_result
+            items: dict[str | None, ContainerActionResult] = {
+                item.container.name: item for item in host.items
+            }
+            for item in result.items:
+                previous = items.get(item.container.name)
+                if previous and any_worthy([previous]) and not any_worthy([item]):
+                    continue
+                items[item.container.name] = item
+            host.items = list(items.values())
+
+    def results(self) -> list[HostActionResult]:
+        return list(self.hosts.values())
+
+
+class NotificationDispatcher:
+    """
+    Background delivery of check/update notifications.
+    Results enqueued within WINDOW are sent as one digest.
+    Every URL gets its own copy of the message, which is persisted
+    until delivered, retried with backoff and rate limited per URL.
+    """
+
+    WINDOW: ClassVar[float] = 30  # seconds
+    MIN_INTERVAL: ClassVar[float] = 10  # seconds between messages to one URL
+    BASE_BACKOFF: ClassVar[float] = 30  # seconds
+    MAX_BACKOFF: ClassVar[float] = 3600  # seconds
+    MAX_ATTEMPTS: ClassVar[int] = 10
+    _DIGEST: ClassVar[_Digest | None] = None
+    _FLUSH: ClassVar[asyncio.Task | None] = None
+    _OUTBOX: ClassVar[list[NotificationOutboxModel]] = []
+    _SENT_AT: ClassVar[dict[str, float]] = {}
+    _WAKE: ClassVar[asyncio.Event | None] = None
+    _TASK: ClassVar[asyncio.Task | None] = None
+    _LOGGER: Final = logging.getLogger("NotificationDispatcher")
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load undelivered messages and start delivery"""
+        cls._OUTBOX = await cls._load_outbox()
+        if cls._OUTBOX:
+            cls._LOGGER.info(f"Loaded {len(cls._OUTBOX)} undelivered notifications")
+        cls._WAKE = asyncio.Event()
+        if cls._TASK is None or cls._TASK.done():
+            cls._TASK = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Persist the collected digest and stop delivery"""
+        if cls._FLUSH is not None and not cls._FLUSH.done():
+            cls._FLUSH.cancel()
+        cls._FLUSH = None
+        await cls.flush()
+        if cls._TASK is not None:
+            cls._TASK.cancel()
+            try:
+                await cls._TASK
+            except asyncio.CancelledError:
+                pass
+            cls._TASK = None
+
+    @classmethod
+    async def _load_outbox(cls) -> list[NotificationOutboxModel]:
+        async with async_session_maker() as session:
+            result = await session.scalars(
+                select(NotificationOutboxModel).order_by(NotificationOutboxModel.id)
+            )
+            return list(result.all())
+
+    @classmethod
+    def enqueue(cls, results: list[HostActionResult]) -> None:
+        """Add results to the digest, it is sent when the window ends"""
+        if cls._DIGEST is None:
+            cls._DIGEST = _Digest()
+        cls._DIGEST.add(results)
+        if cls._FLUSH is None or cls._FLUSH.done():
+            cls._FLUSH = asyncio.create_task(cls._flush_after(cls.WINDOW))
+
+    @classmethod
+    async def flush(cls) -> None:
+        """Render the collected digest and put it to the outbox"""
+        digest = cls._DIGEST
+        cls._DIGEST = None
+        if digest is None:
+            return
+        try:
+            rendered = render_check_notification(digest.results())
+            urls = split_urls(SettingsStorage.get(ESettingKey.NOTIFICATION_URLS) or "")
+            if not rendered or not urls:
+                return
+            title, body = rendered
+            _now = now()
+            messages = [
+                NotificationOutboxModel(
+                    url=url,
+                    title=title,
+                    body=body,
+                    attempts=0,
+                    not_before=_now,
+                    created_at=_now,
+                )
+                for url in urls
+            ]
+
+            async def _insert(session: AsyncSession) -> None:
+                session.add_all(messages)
+
+            await DbWriter.submit(_insert)
+            cls._OUTBOX.extend(messages)
+            if cls._WAKE is not None:
+                cls._WAKE.set()
+        except Exception:
+            cls._LOGGER.exception("Failed to enqueue notification")
+
+    @classmethod
+    async def _flush_after(cls, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await cls.flush()
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            try:
+                timeout = await cls._deliver_due()
+            except Exception:
+                cls._LOGGER.exception("Failed to deliver notifications")
+                timeout = cls.MIN_INTERVAL
+            wake = cls._WAKE
+            if wake is None:
+                await asyncio.sleep(timeout)
+                continue
+            try:
+                await asyncio.wait_for(wake.wait(), timeout)
+            except TimeoutError:
+                pass
+            wake.clear()
+
+    @classmethod
+    async def _deliver_due(cls) -> float:
+        """
+        Deliver the oldest due message of every URL concurrently.
+        Returns seconds until the next message is due.
+        """
+        _now = now()
+        monotonic = time.monotonic()
+        urls = set(split_urls(SettingsStorage.get(ESettingKey.NOTIFICATION_URLS) or ""))
+        next_in = cls.MAX_BACKOFF
+        seen: set[str] = set()
+        due: list[NotificationOutboxModel] = []
+        for message in list(cls._OUTBOX):
+            if message.url not in urls:
+                cls._LOGGER.info("Dropping notification to the removed URL")
+                await cls._remove(message)
+                continue
+            # Messages of the URL are delivered in order
+            if message.url in seen:
+                continue
+            seen.add(message.url)
+            wait = max(
+                (message.not_before - _now).total_seconds(),
+                cls._SENT_AT.get(message.url, -cls.MIN_INTERVAL)
+                + cls.MIN_INTERVAL
+                - monotonic,
+            )
+            if wait > 0:
+                next_in = min(next_in, wait)
+            else:
+                due.append(message)
+        if not due:
+            return next_in
+        await asyncio.gather(*(cls._deliver(m) for m in due))
+        # Recalculate for the rest of the messages
+        return 0
+
+    @classmethod
+    async def _deliver(cls, message: NotificationOutboxModel) -> None:
+        cls._SENT_AT[message.url] = time.monotonic()
+        scheme = message.url.split("://", 1)[0]
+        started = time.perf_counter()
+        try:
+            await send_notification(message.title, message.body, [message.url])
+            NOTIFICATION_DELIVERY_SECONDS.observe(
+                time.perf_counter() - started, scheme, "ok"
+            )
+        except Exception as e:
+            NOTIFICATION_DELIVERY_SECONDS.observe(
+                time.perf_counter() - started, scheme, "error"
+            )
+            message.attempts += 1
+            if message.attempts >= cls.MAX_ATTEMPTS:
+                cls._LOGGER.error(
+                    f"Dropping notification after {message.attempts} attempts: {e}"
+                )
+                await cls._remove(message)
+                return
+            backoff = jitter(
+                min(cls.BASE_BACKOFF * 2 ** (message.attempts - 1), cls.MAX_BACKOFF)
+            )
+            cls._LOGGER.warning(
+                f"Failed to send notification (attempt {message.attempts}), "
+                f"retrying in {backoff:.0f}s: {e}"
+            )
+            message.not_before = now() + timedelta(seconds=backoff)
+            attempts, not_before = message.attempts, message.not_before
+
+            async def _update(session: AsyncSession) -> None:
+                db_message = await session.get(NotificationOutboxModel, message.id)
+                if db_message:
+                    db_message.attempts = attempts
+                    db_message.not_before = not_before
+
+            await DbWriter.submit(_update)
+            return
+        await cls._remove(message)
+
+    @classmethod
+    async def _remove(cls, message: NotificationOutboxModel) -> None:
+        if message in cls._OUTBOX:
+            cls._OUTBOX.remove(message)
+
+        async def _delete(session: AsyncSession) -> None:
+            await session.execute(
+                delete(NotificationOutboxModel).where(
+                    NotificationOutboxModel.id == message.id
+                )
+            )
+
+        await DbWriter.submit(_delete)
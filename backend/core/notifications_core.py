@@ -1,10 +1,9 @@
+import asyncio
 import logging
-from typing import Any, Final, cast
+from functools import lru_cache
+from typing import TYPE_CHECKING, Final, cast
 
-import jinja2
-from apprise import Apprise, NotifyFormat
-from apprise.exception import AppriseException
-from jinja2.sandbox import SandboxedEnvironment
+from cachetools import LRUCache, TTLCache
 
 from backend.config import Config
 from backend.core.action_result import (
@@ -20,6 +19,11 @@ from backend.modules.settings.settings_enum import ESettingKey
 from backend.modules.settings.settings_storage import SettingsStorage
 from backend.util.validate_url_against_ssrf import validate_url_against_ssrf
 
+# Apprise and jinja2 are slow to import, they are imported on the first notification
+if TYPE_CHECKING:
+    import jinja2
+    from apprise import Apprise, NotifyFormat
+
 
 def any_worthy(items: list[ContainerActionResult]) -> bool:
     return any(
@@ -34,6 +38,43 @@ def any_worthy(items: list[ContainerActionResult]) -> bool:
     )
 
 
+# Delivery to a single URL, slow ones don't delay the others
+NOTIFICATION_URL_TIMEOUT: Final = 30  # seconds
+# How long a successful SSRF validation of the URL is trusted
+URL_VALIDATION_TTL: Final = 60  # seconds
+
+# Apprise instance per URL, reused while the URL is in use
+_APPRISE: Final["LRUCache[str, Apprise]"] = LRUCache(maxsize=64)
+_VALIDATED_URLS: Final[TTLCache[str, bool]] = TTLCache(
+    maxsize=256, ttl=URL_VALIDATION_TTL
+)
+
+
+@lru_cache(maxsize=1)
+def _jinja2_env() -> "jinja2.Environment":
+    from jinja2.sandbox import SandboxedEnvironment
+
+    env = SandboxedEnvironment(
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=False,
+    )
+    env.filters["any_worthy"] = any_worthy
+    return env
+
+
+@lru_cache(maxsize=16)
+def _compile_template(source: str) -> "jinja2.Template":
+    """Compile template, templates only change with the settings"""
+    return _jinja2_env().from_string(source)
+
+
+def clear_notification_caches() -> None:
+    _compile_template.cache_clear()
+    _APPRISE.clear()
+    _VALIDATED_URLS.clear()
+
+
 tt_sentinel = object()
 bt_sentinel = object()
 u_sentinel = object()
@@ -53,6 +94,42 @@ async def send_check_notification(
     :param urls: override urls
     """
     logger: Final = logging.getLogger("send_check_notification")
+    if urls == u_sentinel:
+        urls = SettingsStorage.get(ESettingKey.NOTIFICATION_URLS)
+
+    if not urls:
+        raise TugNotificationException(
+            "Failed to send notification. URLs is undefined."
+        )
+    _urls = split_urls(urls)
+
+    rendered: Final = render_check_notification(results, title_template, body_template)
+    if not rendered:
+        logger.warning("No notification body after template render. Exiting.")
+        return
+
+    return await send_notification(*rendered, urls=_urls)
+
+
+def split_urls(urls: str) -> list[str]:
+    """Split urls setting value to the list"""
+    return [line.strip() for line in urls.splitlines() if line.strip()]
+
+
+def render_check_notification(
+    results: list[HostActionResult],
+    title_template: str | None = cast(None, tt_sentinel),
+    body_template: str | None = cast(None, bt_sentinel),
+) -> tuple[str, str] | None:
+    """
+    Render title and body of check results notification.
+    Returns None if the body is empty.
+    :param results: results of check/update process
+    :param title_template: override title template
+    :param body_template: override body template
+    """
+    import jinja2
+
     try:
         if title_template == tt_sentinel:
             title_template = SettingsStorage.get(
@@ -60,21 +137,7 @@ async def send_check_notification(
             )
         if body_template == bt_sentinel:
             body_template = SettingsStorage.get(ESettingKey.NOTIFICATION_BODY_TEMPLATE)
-        if urls == u_sentinel:
-            urls = SettingsStorage.get(ESettingKey.NOTIFICATION_URLS)
 
-        if not urls:
-            raise TugNotificationException(
-                "Failed to send notification. URLs is undefined."
-            )
-        _urls = [line.strip() for line in urls.splitlines() if line.strip()]
-
-        jinja2_env: Final = SandboxedEnvironment(
-            trim_blocks=True,
-            lstrip_blocks=True,
-            keep_trailing_newline=False,
-        )
-        jinja2_env.filters["any_worthy"] = any_worthy
         context: Final = {
             "results": results,
             "hostname": Config.HOSTNAME,
@@ -82,71 +145,130 @@ async def send_check_notification(
 
         title = ""
         if title_template:
-            _title_template = jinja2_env.from_string(title_template)
-            title = _title_template.render(**context)
+            title = _compile_template(title_template).render(**context)
         body = ""
         if body_template:
-            _body_template = jinja2_env.from_string(body_template)
-            body = _body_template.render(**context)
-
-        if not body or not body.strip():
-            logger.warning("No notification body after template render. Exiting.")
-            return
-
-        return await send_notification(title, body, urls=_urls)
+            body = _compile_template(body_template).render(**context)
     except jinja2.TemplateError as e:
-        logger.exception("Failed to render notification template")
+        logging.getLogger("send_check_notification").exception(
+            "Failed to render notification template"
+        )
         raise TugNotificationException(
             f"Failed to render notification template: {e}"
         ) from e
 
+    if not body or not body.strip():
+        return None
+    return title, body
+
 
 async def send_notification(
     title: str,
     body: str,
     urls: list[str],
-    body_format: NotifyFormat = NotifyFormat.MARKDOWN,
+    body_format: "NotifyFormat | None" = None,
 ):
+    """
+    Send notification to every URL concurrently.
+    Raises TugNotificationException if any URL is blocked, unsupported
+    or failed, the other URLs are notified anyway.
+    :param body_format: format of the body, markdown by default
+    """
+    from apprise import NotifyFormat
+
     logger: Final = logging.getLogger("send_notification")
     logger.debug(f"Title: {title}")
     logger.debug(f"Body: {body}")
 
-    if urls:
-        try:
-            for url in urls:
-                try:
-                    await validate_url_against_ssrf(
-                        url,
-                        Config.NOTIFICATION_ALLOW_NETWORKS,
-                        Config.NOTIFICATION_ALLOW_ENDPOINTS,
-                    )
-                except TugUrlValidationSSRFError as e:
-                    raise TugNotificationException(
-                        f"Notification URL blocked by SSRF protection: {e}"
-                    ) from e
-                except (TugUrlValidationError, ValueError):
-                    # Apprise URLs are not always standard URLs with a hostname.
-                    # Keep allowing those schemes, as the settings validation does.
-                    pass
-
-            logger.info("Sending notification")
-            _apprise: Final = Apprise()
-            _apprise.add(cast(Any, urls))
-            result: Final = await _apprise.async_notify(
+    if not urls:
+        raise TugNotificationException(
+            "Failed to send notification. URLs is undefined."
+        )
+
+    if body_format is None:
+        body_format = NotifyFormat.MARKDOWN
+
+    logger.info("Sending notification")
+    results: Final = await asyncio.gather(
+        *(_notify_url(url, title, body, body_format) for url in urls),
+        return_exceptions=True,
+    )
+    errors: Final = [r for r in results if isinstance(r, BaseException)]
+    for error in errors:
+        logger.error(f"Failed to send notification: {error}")
+    if errors:
+        raise TugNotificationException(
+            f"Failed to send notification to {len(errors)} of {len(urls)} URLs. "
+            f"{errors[0]}"
+        )
+
+
+async def _validate_url(url: str) -> None:
+    """Validate URL against SSRF, successful validation is cached for a short time"""
+    if url in _VALIDATED_URLS:
+        return
+    try:
+        await validate_url_against_ssrf(
+            url,
+            Config.NOTIFICATION_ALLOW_NETWORKS,
+            Config.NOTIFICATION_ALLOW_ENDPOINTS,
+        )
+    except TugUrlValidationSSRFError as e:
+        raise TugNotificationException(
+            f"Notification URL blocked by SSRF protection: {e}"
+        ) from e
+    except (TugUrlValidationError, ValueError):
+        # Apprise URLs are not always standard URLs with a hostname.
+        # Keep allowing those schemes, as the settings validation does.
+        pass
+    _VALIDATED_URLS[url] = True
+
+
+def _get_apprise(url: str) -> "Apprise | None":
+    """Get Apprise instance of the URL, None if the URL is not supported"""
+    from apprise import Apprise
+
+    if url not in _APPRISE:
+        _apprise = Apprise()
+        if not _apprise.add(url):
+            return None
+        _APPRISE[url] = _apprise
+    return _APPRISE[url]
+
+
+async def _notify_url(
+    url: str,
+    title: str,
+    body: str,
+    body_format: "NotifyFormat",
+) -> None:
+    from apprise.exception import AppriseException
+
+    await _validate_url(url)
+    _apprise: Final = _get_apprise(url)
+    if _apprise is None:
+        # Apprise logs the reason, the URL itself may contain secrets
+        raise TugNotificationException(
+            "Failed to send notification. The URL is not supported by Apprise."
+        )
+    try:
+        result: Final = await asyncio.wait_for(
+            _apprise.async_notify(
                 title=title,
                 body=body,
                 body_format=body_format,
-            )
-            if result is False:
-                raise TugNotificationException(
-                    "Failed to send notification, but no exception was raised by Apprise."
-                )
-        except AppriseException as e:
-            logger.exception("Failed to send notification")
-            raise TugNotificationException(
-                f"Failed to send notification. Apprise exception: {e}"
-            ) from e
-    else:
+            ),
+            NOTIFICATION_URL_TIMEOUT,
+        )
+    except TimeoutError as e:
         raise TugNotificationException(
-            "Failed to send notification. URLs is undefined."
+            f"Notification timed out after {NOTIFICATION_URL_TIMEOUT}s"
+        ) from e
+    except AppriseException as e:
+        raise TugNotificationException(
+            f"Failed to send notification. Apprise exception: {e}"
+        ) from e
+    if result is False:
+        raise TugNotificationException(
+            "Failed to send notification, but no exception was raised by Apprise."
         )
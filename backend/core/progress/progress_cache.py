@@ -1,15 +1,15 @@
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, cast
 
-from cachetools import TTLCache
-
-_CACHE = TTLCache(maxsize=10, ttl=600)
+from .progress_pubsub import ProgressPubSub
+from .progress_store import get_progress_store
 
 
 class ProgressCache[T:Mapping[Any, Any]]:
     """
     Helper class for check/update progress.
     If data argument is passed, the cache will be replaced.
+    Every change is published to ProgressPubSub subscribers.
     """
 
     def __init__(self, id: str, data: T | None = None) -> None:
@@ -18,11 +18,31 @@ class ProgressCache[T:Mapping[Any, Any]]:
             self.set(data)
 
     def get(self) -> T | None:
-        return _CACHE.get(self._id)
+        return cast(T | None, get_progress_store().get(self._id))
 
     def set(self, data: T):
-        _CACHE[self._id] = data
+        get_progress_store().set(self._id, data)
+        ProgressPubSub.publish(self._id, "set", data)
 
     def update(self, data: T):
-        current = _CACHE.get(self._id) or {}
-        _CACHE[self._id] = {**current, **data}
+        current = self.get() or {}
+        get_progress_store().set(self._id, {**current, **data})
+        ProgressPubSub.publish(self._id, "update", data)
+
+    def publish_item(self, item: Any):
+        """
+        Publish intermediate result (e.g. of a single container)
+        without storing it in the cache.
+        """
+        ProgressPubSub.publish(self._id, "item", item)
+
+    def try_lock(self) -> bool:
+        """
+        Acquire run lock of the action.
+        Returns False if the action is already running.
+        """
+        return get_progress_store().try_lock(self._id)
+
+    def unlock(self):
+        """Release run lock of the action"""
+        get_progress_store().unlock(self._id)
@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, ClassVar, Literal
+
+ProgressEventType = Literal["set", "update", "item"]
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Change of the progress.
+    :param type: set - progress replaced, update - progress merged with data,
+        item - result of a single container is ready (not stored in progress)
+    :param data: changed data
+    """
+
+    type: ProgressEventType
+    data: Any
+
+
+class ProgressPubSub:
+    """
+    In-process publisher of progress changes.
+    Subscribers get events of the progress id they are subscribed to.
+    """
+
+    QUEUE_SIZE: ClassVar[int] = 100
+    _SUBSCRIBERS: ClassVar[dict[str, set[asyncio.Queue[ProgressEvent]]]] = {}
+
+    @classmethod
+    @contextmanager
+    def subscribe(cls, id: str) -> Iterator[asyncio.Queue[ProgressEvent]]:
+        """Subscribe to the progress events until context exit"""
+        queue: asyncio.Queue[ProgressEvent] = asyncio.Queue(cls.QUEUE_SIZE)
+        cls._SUBSCRIBERS.setdefault(id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = cls._SUBSCRIBERS.get(id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del cls._SUBSCRIBERS[id]
+
+    @classmethod
+    def publish(cls, id: str, type: ProgressEventType, data: Any) -> None:
+        """Publish event to the subscribers of the progress"""
+        for queue in cls._SUBSCRIBERS.get(id, ()):
+            if queue.full():
+                # Slow subscriber, drop the oldest event
+                queue.get_nowait()
+            queue.put_nowait(ProgressEvent(type, data))
+
+    @classmethod
+    def has_subscribers(cls, id: str) -> bool:
+        return bool(cls._SUBSCRIBERS.get(id))
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Final, Literal, cast, get_args
+
+from cachetools import TTLCache
+
+ProgressKind = Literal["all", "host", "plan", "container"]
+
+
+@dataclass(frozen=True)
+class ProgressKindLimits:
+    """
+    Limits of the progress entries of one kind.
+    :param maxsize: max number of entries, the least recently used are evicted
+    :param ttl: lifetime of the entry in seconds
+    """
+
+    maxsize: int
+    ttl: float
+
+
+PROGRESS_LIMITS: Final[dict[ProgressKind, ProgressKindLimits]] = {
+    "all": ProgressKindLimits(maxsize=4, ttl=600),
+    "host": ProgressKindLimits(maxsize=256, ttl=600),
+    "plan": ProgressKindLimits(maxsize=256, ttl=600),
+    "container": ProgressKindLimits(maxsize=4096, ttl=600),
+}
+
+
+def get_progress_kind(id: str) -> ProgressKind | None:
+    """Get kind of the progress from its id e.g. host:1:local -> host"""
+    kind = id.split(":", 1)[0]
+    if kind in get_args(ProgressKind):
+        return cast(ProgressKind, kind)
+    return None
+
+
+class ProgressStore(ABC):
+    """
+    Storage of check/update progress.
+    Progress (display state) and run locks are separate,
+    so eviction of the progress never allows a second run of the action.
+    """
+
+    @abstractmethod
+    def get(self, id: str) -> Mapping[Any, Any] | None:
+        """Get progress"""
+        pass
+
+    @abstractmethod
+    def set(self, id: str, data: Mapping[Any, Any]) -> None:
+        """Set progress"""
+        pass
+
+    @abstractmethod
+    def try_lock(self, id: str) -> bool:
+        """Acquire run lock. Returns False if already locked."""
+        pass
+
+    @abstractmethod
+    def unlock(self, id: str) -> None:
+        """Release run lock"""
+        pass
+
+    @abstractmethod
+    def is_locked(self, id: str) -> bool:
+        """Whether run lock is acquired"""
+        pass
+
+    def sizes(self) -> dict[str, int]:
+        """Number of the stored entries by kind of the progress"""
+        return {}
+
+
+class MemoryProgressStore(ProgressStore):
+    """
+    In-process progress store.
+    Every kind of progress has its own bounded cache,
+    so e.g. thousands of container checks can't evict host or general progress.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[ProgressKind, ProgressKindLimits] = PROGRESS_LIMITS,
+    ):
+        self._caches: Final[dict[ProgressKind, TTLCache]] = {
+            kind: TTLCache(maxsize=limit.maxsize, ttl=limit.ttl)
+            for kind, limit in limits.items()
+        }
+        self._locks: Final[set[str]] = set()
+
+    def _cache(self, id: str) -> TTLCache | None:
+        kind = get_progress_kind(id)
+        return self._caches.get(kind) if kind else None
+
+    def get(self, id: str) -> Mapping[Any, Any] | None:
+        cache = self._cache(id)
+        return cache.get(id) if cache is not None else None
+
+    def set(self, id: str, data: Mapping[Any, Any]) -> None:
+        cache = self._cache(id)
+        if cache is None:
+            raise ValueError(f"Unknown kind of progress {id}")
+        cache[id] = data
+
+    def try_lock(self, id: str) -> bool:
+        if id in self._locks:
+            return False
+        self._locks.add(id)
+        return True
+
+    def unlock(self, id: str) -> None:
+        self._locks.discard(id)
+
+    def is_locked(self, id: str) -> bool:
+        return id in self._locks
+
+    def sizes(self) -> dict[str, int]:
+        return {kind: len(cache) for kind, cache in self._caches.items()}
+
+
+_STORE: ProgressStore = MemoryProgressStore()
+
+
+def get_progress_store() -> ProgressStore:
+    return _STORE
+
+
+def set_progress_store(store: ProgressStore) -> None:
+    """Replace progress store e.g. with a shared one"""
+    global _STORE
+    _STORE = store
@@ -13,27 +13,27 @@ from backend.core.update_actions.update_actions_schema import (
 from backend.enums.action_status_enum import EActionStatus
 from backend.modules.hosts.hosts_model import HostsModel
 
-ALL_CONTAINERS_STATUS_KEY = str(uuid.uuid4())
+ALL_CONTAINERS_STATUS_KEY = f"all:{uuid.uuid4()}"
 
 
 def get_host_cache_key(host: HostsModel) -> str:
-    return f"{host.id}:{host.name}"
+    return f"host:{host.id}:{host.name}"
 
 
 def get_plan_cache_key(host: HostsModel, plan: UpdatePlan) -> str:
-    return f"{get_host_cache_key(host)}:{sorted(plan.to_update)}"
+    return f"plan:{host.id}:{host.name}:{sorted(plan.to_update)}"
 
 
 def get_container_cache_key(
     host: HostsModel, container: ContainerInspectResult
 ) -> str:
-    return f"{get_host_cache_key(host)}:{container.name}"
+    return f"container:{host.id}:{host.name}:{container.name}"
 
 
-def is_allowed_start_cache(
+def is_finished_cache(
     cache: ActionProgress | None,
 ) -> bool:
-    """Whether action allowed to start with current cache status"""
+    """Whether progress is absent or the action is finished"""
     return bool(
         not cache
         or cache.get("status")
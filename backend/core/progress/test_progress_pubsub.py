@@ -0,0 +1,35 @@
+
+import pytest
+
+from backend.core.progress.progress_cache import ProgressCache
+from backend.core.progress.progress_pubsub import ProgressEvent, ProgressPubSub
+from backend.enums.action_status_enum import EActionStatus
+
+
+@pytest.mark.asyncio
+async def test_progress_cache_publishes_changes():
+    cache = ProgressCache[dict]("host:test_progress_cache_publishes_changes")
+
+    with ProgressPubSub.subscribe("host:test_progress_cache_publishes_changes") as queue:
+        cache.set({"status": EActionStatus.PREPARING})
+        cache.update({"status": EActionStatus.CHECKING})
+        cache.publish_item("container")
+
+        assert [queue.get_nowait() for _ in range(3)] == [
+            ProgressEvent("set", {"status": EActionStatus.PREPARING}),
+            ProgressEvent("update", {"status": EActionStatus.CHECKING}),
+            ProgressEvent("item", "container"),
+        ]
+
+    assert not ProgressPubSub.has_subscribers("host:test_progress_cache_publishes_changes")
+
+
+@pytest.mark.asyncio
+async def test_progress_pubsub_drops_oldest_for_slow_subscriber(mocker):
+    mocker.patch.object(ProgressPubSub, "QUEUE_SIZE", 2)
+    with ProgressPubSub.subscribe("slow") as queue:
+        for i in range(3):
+            ProgressPubSub.publish("slow", "item", i)
+        assert queue.qsize() == 2
+        assert (await queue.get()).data == 1
+        assert (await queue.get()).data == 2
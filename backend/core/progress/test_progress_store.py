@@ -0,0 +1,57 @@
+import pytest
+
+from backend.core.progress.progress_store import (
+    MemoryProgressStore,
+    ProgressKindLimits,
+    get_progress_kind,
+)
+
+
+def test_get_progress_kind():
+    assert get_progress_kind("host:1:local") == "host"
+    assert get_progress_kind("container:1:local:nginx") == "container"
+    assert get_progress_kind("unknown:1") is None
+    assert get_progress_kind("no-kind") is None
+
+
+def test_kinds_are_evicted_independently():
+    store = MemoryProgressStore(
+        {
+            "all": ProgressKindLimits(maxsize=2, ttl=600),
+            "host": ProgressKindLimits(maxsize=2, ttl=600),
+            "plan": ProgressKindLimits(maxsize=2, ttl=600),
+            "container": ProgressKindLimits(maxsize=2, ttl=600),
+        }
+    )
+    store.set("all:1", {"status": "done"})
+    store.set("host:1:local", {"status": "done"})
+
+    for i in range(100):
+        store.set(f"container:1:local:c{i}", {"status": "done"})
+
+    assert store.get("all:1") == {"status": "done"}
+    assert store.get("host:1:local") == {"status": "done"}
+    assert store.get("container:1:local:c0") is None
+    assert store.get("container:1:local:c99") == {"status": "done"}
+
+
+def test_lock_survives_eviction():
+    store = MemoryProgressStore({"container": ProgressKindLimits(maxsize=1, ttl=600)})
+    assert store.try_lock("container:1:local:a")
+    store.set("container:1:local:a", {"status": "checking"})
+    store.set("container:1:local:b", {"status": "checking"})
+
+    assert store.get("container:1:local:a") is None
+    assert store.is_locked("container:1:local:a")
+    assert not store.try_lock("container:1:local:a")
+
+    store.unlock("container:1:local:a")
+    assert not store.is_locked("container:1:local:a")
+    assert store.try_lock("container:1:local:a")
+
+
+def test_unknown_kind():
+    store = MemoryProgressStore()
+    assert store.get("unknown:1") is None
+    with pytest.raises(ValueError):
+        store.set("unknown:1", {})
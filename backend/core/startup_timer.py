@@ -0,0 +1,53 @@
+import logging
+import os
+import time
+from typing import ClassVar, Final
+
+from backend.metrics import STARTUP_SECONDS
+
+
+def get_process_age() -> float | None:
+    """Get seconds since the start of the process, None if unknown e.g. not on Linux"""
+    try:
+        with open("/proc/self/stat") as f:
+            stat = f.read()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        # The name of the process may contain spaces, starttime is the 22nd field
+        start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """
+    Durations of the startup phases, reported when the app is ready.
+    Every checkpoint ends the phase started by the previous one,
+    the first phase starts with the process, including the interpreter startup.
+    """
+
+    _LOGGER: Final = logging.getLogger("StartupTimer")
+    _STARTED: ClassVar[float] = time.perf_counter() - (get_process_age() or 0)
+    _LAST: ClassVar[float] = _STARTED
+    _PHASES: ClassVar[dict[str, float]] = {}
+
+    @classmethod
+    def checkpoint(cls, phase: str) -> None:
+        """
+        End the phase.
+        :param phase: name of the phase, e.g. migrations
+        """
+        now = time.perf_counter()
+        cls._PHASES[phase] = now - cls._LAST
+        cls._LAST = now
+
+    @classmethod
+    def report(cls) -> None:
+        """Log durations of the phases and set them to the metric"""
+        total = cls._LAST - cls._STARTED
+        for phase, seconds in cls._PHASES.items():
+            STARTUP_SECONDS.set(seconds, phase)
+        STARTUP_SECONDS.set(total, "total")
+        phases = ", ".join(f"{p} {s:.2f}s" for p, s in cls._PHASES.items())
+        cls._LOGGER.info(f"Started in {total:.2f}s ({phases})")
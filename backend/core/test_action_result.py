@@ -0,0 +1,97 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from python_on_whales.components.container.models import (
+    ContainerConfig,
+    ContainerInspectResult,
+)
+from python_on_whales.components.image.models import (
+    ImageInspectResult,
+)
+
+from backend.const import DEFAULT_NOTIFICATION_TEMPLATE
+from backend.core.action_result import (
+    ContainerActionResult,
+    ContainerSummary,
+    HostActionResult,
+    ImageSummary,
+    get_image_summary,
+)
+from backend.core.notifications_core import send_check_notification
+
+
+def _container() -> ContainerInspectResult:
+    return ContainerInspectResult(
+        id="abc",
+        name="app",
+        image="sha256:local",
+        config=ContainerConfig(image="nginx:latest", labels={"a": "b"}),
+    )
+
+
+def _image() -> ImageInspectResult:
+    return ImageInspectResult(
+        id="sha256:local",
+        repo_tags=["nginx:latest"],
+        repo_digests=["nginx@sha256:1"],
+    )
+
+
+def test_result_keeps_only_summary():
+    item = ContainerActionResult(
+        container=ContainerSummary.from_inspect(_container()),
+        result="available",
+        local_image=ImageSummary.from_inspect(_image()),
+        remote_image=get_image_summary(None),
+    )
+
+    assert not hasattr(item, "__dict__")
+    assert not hasattr(item.container, "__dict__")
+    assert jsonable_encoder(item) == {
+        "container": {
+            "id": "abc",
+            "name": "app",
+            "image": "sha256:local",
+            "config": {"image": "nginx:latest"},
+        },
+        "result": "available",
+        "image_spec": None,
+        "local_image": {
+            "id": "sha256:local",
+            "repo_tags": ["nginx:latest"],
+            "repo_digests": ["nginx@sha256:1"],
+        },
+        "remote_image": None,
+        "local_digests": [],
+        "remote_digests": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_default_template_renders_summary():
+    results = [
+        HostActionResult(
+            host_id=1,
+            host_name="local",
+            items=[
+                ContainerActionResult(
+                    container=ContainerSummary.from_inspect(_container()),
+                    result="updated",
+                )
+            ],
+        )
+    ]
+    with patch(
+        "backend.core.notifications_core.send_notification", new_callable=AsyncMock
+    ) as send:
+        await send_check_notification(
+            results,
+            title_template="",
+            body_template=DEFAULT_NOTIFICATION_TEMPLATE,
+            urls="json://localhost",
+        )
+
+    body = send.await_args.args[1]
+    assert "## Host: local" in body
+    assert "- app nginx:latest" in body
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+import uvicorn
+from pytest_mock import MockerFixture
+
+from agent.app import app as agent_app
+from backend.core.agent_client import AgentClient
+from backend.core.circuit_breaker import CircuitBreaker
+from backend.enums.circuit_state_enum import ECircuitState
+from backend.exception import TugAgentClientError, TugAgentUnavailableError
+from backend.metrics import AGENT_REQUEST_ERRORS, AGENT_REQUEST_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_fails_fast_when_agent_is_down(mocker: MockerFixture):
+    client = AgentClient(1, "http://agent:8001")
+    send = mocker.patch.object(
+        client,
+        "_send",
+        side_effect=aiohttp.ClientConnectionError("refused"),
+    )
+
+    for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+        with pytest.raises(TugAgentClientError) as e:
+            await client.public.health()
+        assert not isinstance(e.value, TugAgentUnavailableError)
+
+    assert not client.is_available
+    with pytest.raises(TugAgentUnavailableError):
+        await client.public.health()
+    assert send.call_count == CircuitBreaker.FAILURE_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_only_probe_releases_probe_slot(mocker: MockerFixture):
+    now = mocker.patch("backend.core.circuit_breaker.time.monotonic", return_value=0)
+    client = AgentClient(1, "http://agent:8001")
+    slow_started = asyncio.Event()
+
+    async def _send(method, url, path, *args):
+        if path == "/api/slow":
+            slow_started.set()
+            await asyncio.Event().wait()
+        return b"true"
+
+    mocker.patch.object(client, "_send", side_effect=_send)
+    # Started while the circuit is closed, cancelled while the probe is in flight
+    slow = asyncio.create_task(client._request_raw("GET", "/api/slow"))
+    await slow_started.wait()
+    for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+        client._breaker.record_failure()
+    now.return_value = CircuitBreaker.BASE_BACKOFF
+    assert client._breaker.allow() == ECircuitState.HALF_OPEN
+
+    slow.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await slow
+
+    with pytest.raises(TugAgentUnavailableError):
+        await client.public.health()
+
+
+@pytest.mark.asyncio
+async def test_error_response_keeps_circuit_closed(mocker: MockerFixture):
+    client = AgentClient(1, "http://agent:8001")
+
+    async def _send(*args, **kwargs):
+        client._breaker.record_success()
+        raise TugAgentClientError("Agent request error", "", "GET", 500, None)
+
+    mocker.patch.object(client, "_send", side_effect=_send)
+
+    for _ in range(CircuitBreaker.FAILURE_THRESHOLD + 1):
+        with pytest.raises(TugAgentClientError) as e:
+            await client.public.health()
+        assert e.value.status == 500
+    assert client.is_available
+
+
+@pytest.mark.asyncio
+async def test_records_latency_of_default_timeout_requests(mocker: MockerFixture):
+    client = AgentClient(1, "http://agent:8001", timeout=5)
+    send = mocker.patch.object(client, "_send", return_value=b"true")
+    mocker.patch.object(client._latency, "get_timeout", return_value=2)
+
+    await client.public.health()
+    assert send.call_args.args[-1] == 2
+    assert client._latency._samples["/api/public/health"]
+
+    await client._request("GET", "/api/image/pull", timeout=600)
+    assert send.call_args.args[-1] == 600
+    assert "/api/image/pull" not in client._latency._samples
+
+
+@pytest.mark.asyncio
+async def test_metrics_of_requests(mocker: MockerFixture):
+    client = AgentClient(901, "http://agent:8001")
+    mocker.patch.object(client, "_send", return_value=b"{}")
+    await client.container.inspect("app")
+    assert AGENT_REQUEST_SECONDS.count("901", "/api/container/inspect") == 1
+
+    mocker.patch.object(client, "_send", side_effect=TimeoutError)
+    with pytest.raises(TugAgentClientError):
+        await client.container.inspect("app")
+    assert AGENT_REQUEST_SECONDS.count("901", "/api/container/inspect") == 2
+    assert AGENT_REQUEST_ERRORS.get("901", "/api/container/inspect", "timeout") == 1
+
+
+@pytest.mark.asyncio
+async def test_signed_query_is_verified_by_agent(mocker: MockerFixture):
+    """Request with a query and a secret, served by the agent app"""
+    mocker.patch("agent.auth.Config.ALLOW_UNAUTHENTICATED_AGENT", False)
+    mocker.patch("agent.auth.Config.AGENT_SECRET", "secret")
+    mocker.patch("agent.api.profiling_api.Config.ENABLE_PROFILING", True)
+    mocker.patch("backend.core.agent_client.validate_agent_url_against_ssrf")
+    # Other tests of the agent override the signature check
+    mocker.patch.dict(agent_app.dependency_overrides, clear=True)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            agent_app, port=0, lifespan="off", ws="none", log_level="warning"
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        client = AgentClient(1, f"http://127.0.0.1:{port}", secret="secret")
+
+        profile = await client.profiling.cpu(0.1, 10, "speedscope")
+        assert json.loads(profile)["profiles"]
+        await client.profiling.memory_start(5)
+        await client.profiling.memory_stop()
+
+        client._secret = "wrong"
+        with pytest.raises(TugAgentClientError) as e:
+            await client.profiling.memory_stop()
+        assert e.value.status == 401
+        await client.close_session()
+    finally:
+        server.should_exit = True
+        await serving
@@ -0,0 +1,81 @@
+from pytest_mock import MockerFixture
+
+from backend.core.circuit_breaker import CircuitBreaker
+from backend.enums.circuit_state_enum import ECircuitState
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record_failure()
+        breaker.release()
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker()
+    _fail(breaker, CircuitBreaker.FAILURE_THRESHOLD - 1)
+    assert breaker.state == ECircuitState.CLOSED
+
+    breaker.record_success()
+    _fail(breaker, CircuitBreaker.FAILURE_THRESHOLD - 1)
+    assert breaker.state == ECircuitState.CLOSED
+
+    _fail(breaker, 1)
+    assert breaker.state == ECircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_allows_single_probe(mocker: MockerFixture):
+    now = mocker.patch("backend.core.circuit_breaker.time.monotonic", return_value=0)
+    breaker = CircuitBreaker()
+    _fail(breaker, CircuitBreaker.FAILURE_THRESHOLD)
+
+    now.return_value = CircuitBreaker.BASE_BACKOFF
+    assert breaker.state == ECircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    breaker.release()
+    assert breaker.state == ECircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_backoff_grows_exponentially(mocker: MockerFixture):
+    now = mocker.patch("backend.core.circuit_breaker.time.monotonic", return_value=0)
+    breaker = CircuitBreaker()
+    _fail(breaker, CircuitBreaker.FAILURE_THRESHOLD)
+    assert breaker.retry_in == CircuitBreaker.BASE_BACKOFF
+
+    # Failed probe reopens the circuit with doubled backoff
+    now.return_value = CircuitBreaker.BASE_BACKOFF
+    _fail(breaker, 1)
+    assert breaker.state == ECircuitState.OPEN
+    assert breaker.retry_in == CircuitBreaker.BASE_BACKOFF * 2
+
+    for _ in range(20):
+        now.return_value += breaker.retry_in
+        _fail(breaker, 1)
+    assert breaker.retry_in == CircuitBreaker.MAX_BACKOFF
+
+
+def test_cancelled_probe_frees_slot(mocker: MockerFixture):
+    now = mocker.patch("backend.core.circuit_breaker.time.monotonic", return_value=0)
+    breaker = CircuitBreaker()
+    _fail(breaker, CircuitBreaker.FAILURE_THRESHOLD)
+    now.return_value = CircuitBreaker.BASE_BACKOFF
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_failures_of_requests_in_flight_do_not_reopen(mocker: MockerFixture):
+    mocker.patch("backend.core.circuit_breaker.time.monotonic", return_value=0)
+    breaker = CircuitBreaker()
+    for _ in range(10):
+        breaker.record_failure()
+
+    assert breaker.state == ECircuitState.OPEN
+    assert breaker.retry_in == CircuitBreaker.BASE_BACKOFF
+    assert breaker._openings == 1
@@ -0,0 +1,79 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.core.host_health import HostHealthMonitor
+from backend.exception import TugAgentClientError
+
+
+@pytest.fixture(autouse=True)
+def clear_health():
+    HostHealthMonitor.forget()
+    yield
+    HostHealthMonitor.forget()
+
+
+def _host(mocker: MockerFixture, id: int = 1):
+    host = mocker.Mock()
+    host.id = id
+    host.enabled = True
+    return host
+
+
+def _client(mocker: MockerFixture):
+    client = mocker.Mock()
+    client.public.health = mocker.AsyncMock(return_value={})
+    client.public.access = mocker.AsyncMock(return_value={})
+    mocker.patch(
+        "backend.core.host_health.AgentClientManager.get_host_client",
+        return_value=client,
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_probe_records_result(mocker: MockerFixture):
+    host = _host(mocker)
+    client = _client(mocker)
+
+    health = await HostHealthMonitor.probe(host)
+
+    assert health.ok
+    assert health.err is None
+    assert health.latency is not None
+    assert health.last_ok_at == health.checked_at
+    assert HostHealthMonitor.get(host.id) is health
+    client.public.access.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_keeps_last_ok(mocker: MockerFixture):
+    host = _host(mocker)
+    client = _client(mocker)
+    ok = await HostHealthMonitor.probe(host)
+
+    client.public.health.side_effect = TugAgentClientError(
+        "Agent connection error", "http://agent", "GET", 502, "refused"
+    )
+    failed = await HostHealthMonitor.probe(host)
+
+    assert not failed.ok
+    assert failed.err and "Agent connection error" in failed.err
+    assert failed.last_ok_at == ok.last_ok_at
+    assert failed.checked_at is not None
+
+
+@pytest.mark.asyncio
+async def test_probe_all_drops_removed_hosts(mocker: MockerFixture):
+    _client(mocker)
+    await HostHealthMonitor.probe(_host(mocker, 1))
+    await HostHealthMonitor.probe(_host(mocker, 2))
+
+    mocker.patch(
+        "backend.core.host_health.HostRegistry.get_all",
+        mocker.AsyncMock(return_value=[_host(mocker, 2)]),
+    )
+
+    await HostHealthMonitor.probe_all()
+
+    assert HostHealthMonitor.get(1) is None
+    assert HostHealthMonitor.get(2) is not None
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.core.host_inventory import HostInventory
+
+
+@pytest.fixture(autouse=True)
+def clear_inventory():
+    HostInventory.invalidate()
+    yield
+    HostInventory.invalidate()
+
+
+def _host(mocker: MockerFixture, id: int = 1):
+    host = mocker.Mock()
+    host.id = id
+    return host
+
+
+def _client(mocker: MockerFixture, delay: float = 0):
+    calls: list[int] = []
+
+    async def _list(_body):
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return [f"container{len(calls)}"]
+
+    client = mocker.Mock()
+    client.container.list = mocker.AsyncMock(side_effect=_list)
+    client.image.list = mocker.AsyncMock(return_value=["image"])
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_containers_reuses_snapshot(mocker: MockerFixture):
+    host = _host(mocker)
+    client = _client(mocker)
+
+    assert await HostInventory.get_containers(host, client) == ["container1"]
+    assert await HostInventory.get_containers(host, client) == ["container1"]
+    assert client.container.list.await_count == 1
+
+    mocker.patch.object(HostInventory, "TTL", 0)
+    assert await HostInventory.get_containers(host, client) == ["container2"]
+    assert client.container.list.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_containers_coalesces_concurrent_requests(mocker: MockerFixture):
+    host = _host(mocker)
+    client = _client(mocker, delay=0.05)
+
+    results = await asyncio.gather(
+        *(HostInventory.get_containers(host, client) for _ in range(10))
+    )
+
+    assert all(r == ["container1"] for r in results)
+    assert client.container.list.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_snapshot_and_inflight(mocker: MockerFixture):
+    host = _host(mocker)
+    client = _client(mocker, delay=0.05)
+
+    inflight = asyncio.create_task(HostInventory.get_containers(host, client))
+    await asyncio.sleep(0)
+    HostInventory.invalidate(host.id)
+
+    # Started before invalidation, must not be cached
+    assert await inflight == ["container1"]
+    assert await HostInventory.get_containers(host, client) == ["container2"]
+    assert client.container.list.await_count == 2
+
+    # Other hosts and kinds are independent
+    other_host = _host(mocker, 2)
+    await HostInventory.get_images(host, client)
+    await HostInventory.get_containers(other_host, client)
+    HostInventory.invalidate(other_host.id)
+    await HostInventory.get_images(host, client)
+    assert client.image.list.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached(mocker: MockerFixture):
+    host = _host(mocker)
+    client = mocker.Mock()
+    client.container.list = mocker.AsyncMock(side_effect=RuntimeError("down"))
+
+    results = await asyncio.gather(
+        HostInventory.get_containers(host, client),
+        HostInventory.get_containers(host, client),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert client.container.list.await_count == 1
+    with pytest.raises(RuntimeError):
+        await HostInventory.get_containers(host, client)
+    assert client.container.list.await_count == 2
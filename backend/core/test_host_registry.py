@@ -0,0 +1,62 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.core.host_registry import HostRegistry
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    HostRegistry.invalidate()
+    yield
+    HostRegistry.invalidate()
+
+
+def _mock_db(mocker: MockerFixture, hosts: list, on_execute=None):
+    async def _execute(_stmt):
+        if on_execute:
+            on_execute()
+        result = mocker.Mock()
+        result.scalars.return_value.all.return_value = list(hosts)
+        return result
+
+    session = mocker.Mock()
+    session.execute = mocker.AsyncMock(side_effect=_execute)
+    session_maker = mocker.patch("backend.core.host_registry.async_session_maker")
+    session_maker.return_value.__aenter__.return_value = session
+    return session
+
+
+@pytest.mark.asyncio
+async def test_hosts_are_loaded_once(mocker: MockerFixture):
+    hosts = [
+        mocker.Mock(id=2, enabled=False),
+        mocker.Mock(id=1, enabled=True),
+    ]
+    session = _mock_db(mocker, hosts)
+
+    assert await HostRegistry.get(1) is hosts[1]
+    assert await HostRegistry.get(3) is None
+    assert [h.id for h in await HostRegistry.get_all()] == [1, 2]
+    assert [h.id for h in await HostRegistry.get_all(enabled_only=True)] == [1]
+    assert session.execute.await_count == 1
+
+    HostRegistry.invalidate()
+    await HostRegistry.get(1)
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_reloads(mocker: MockerFixture):
+    hosts = [mocker.Mock(id=1, enabled=True)]
+    calls: list[int] = []
+
+    def _on_execute():
+        calls.append(1)
+        if len(calls) == 1:
+            # Host was modified while the first query was running
+            HostRegistry.invalidate()
+
+    _mock_db(mocker, hosts, _on_execute)
+
+    assert await HostRegistry.get(1) is hosts[0]
+    assert len(calls) == 2
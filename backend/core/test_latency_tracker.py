@@ -0,0 +1,30 @@
+from backend.core.latency_tracker import LatencyTracker
+
+
+def test_default_timeout_until_enough_samples():
+    tracker = LatencyTracker()
+    for _ in range(LatencyTracker.MIN_SAMPLES - 1):
+        tracker.record("/api/public/health", 0.01)
+    assert tracker.get_timeout("/api/public/health", 5) == 5
+
+
+def test_timeout_adapts_to_percentile():
+    tracker = LatencyTracker()
+    for i in range(100):
+        tracker.record("/api/container/list", 0.5 if i else 1.0)
+        tracker.record("/api/public/health", 0.01)
+
+    assert tracker.percentile("/api/container/list", 99) == 0.5
+    assert tracker.get_timeout("/api/container/list", 5) == 0.5 * LatencyTracker.FACTOR
+    # Bounded by min timeout and by configured timeout
+    assert tracker.get_timeout("/api/public/health", 5) == LatencyTracker.MIN_TIMEOUT
+    assert tracker.get_timeout("/api/container/list", 1.5) == 1.5
+
+
+def test_window_forgets_old_samples():
+    tracker = LatencyTracker()
+    for _ in range(LatencyTracker.WINDOW):
+        tracker.record("/api/container/list", 3)
+    for _ in range(LatencyTracker.WINDOW):
+        tracker.record("/api/container/list", 0.1)
+    assert tracker.percentile("/api/container/list", 100) == 0.1
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.core.loop_lag_monitor import LoopLagMonitor
+from backend.metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_SLOW_CALLBACKS
+
+base_module = "backend.core.loop_lag_monitor"
+
+
+def _blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocked_loop_is_reported(
+    mocker: MockerFixture, caplog: pytest.LogCaptureFixture
+):
+    mocker.patch.object(LoopLagMonitor, "INTERVAL", 0.02)
+    mocker.patch(f"{base_module}.Config.SLOW_CALLBACK_THRESHOLD_MS", 100)
+    mocker.patch(f"{base_module}.Config.ASYNCIO_DEBUG", False)
+    slow = EVENT_LOOP_SLOW_CALLBACKS.get()
+    lags = EVENT_LOOP_LAG_SECONDS.count()
+
+    LoopLagMonitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        with caplog.at_level(logging.WARNING, "LoopLagMonitor"):
+            _blocking_call()
+            await asyncio.sleep(0.1)
+    finally:
+        await LoopLagMonitor.stop()
+
+    assert EVENT_LOOP_SLOW_CALLBACKS.get() == slow + 1
+    assert EVENT_LOOP_LAG_SECONDS.count() > lags
+    blocked, unblocked = [r.getMessage() for r in caplog.records]
+    assert "in _blocking_call" in blocked
+    assert unblocked.startswith("Event loop was blocked for 0.")
+
+
+@pytest.mark.asyncio
+async def test_debug_mode(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.SLOW_CALLBACK_THRESHOLD_MS", 500)
+    mocker.patch(f"{base_module}.Config.ASYNCIO_DEBUG", True)
+    loop = asyncio.get_running_loop()
+
+    LoopLagMonitor.start()
+    await LoopLagMonitor.stop()
+
+    assert loop.get_debug()
+    assert loop.slow_callback_duration == 0.5
@@ -0,0 +1,187 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from backend.core.action_result import (
+    ContainerActionResult,
+    ContainerSummary,
+    HostActionResult,
+)
+from backend.core.notification_dispatcher import NotificationDispatcher, _Digest
+from backend.modules.notifications.notifications_model import (
+    NotificationOutboxModel,
+)
+from backend.modules.settings.settings_enum import ESettingKey
+from backend.util.now import now
+
+URLS = "https://one.example/hook\nhttps://two.example/hook"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def dispatcher(mocker: MockerFixture):
+    mocker.patch.object(NotificationDispatcher, "WINDOW", 0.01)
+    mocker.patch.object(NotificationDispatcher, "MIN_INTERVAL", 0)
+    mocker.patch.object(NotificationDispatcher, "BASE_BACKOFF", 0.01)
+    mocker.patch.object(NotificationDispatcher, "_SENT_AT", {})
+    mocker.patch.object(NotificationDispatcher, "_load_outbox", return_value=[])
+    settings = {
+        ESettingKey.NOTIFICATION_URLS: URLS,
+        ESettingKey.NOTIFICATION_TITLE_TEMPLATE: "Title",
+        ESettingKey.NOTIFICATION_BODY_TEMPLATE: (
+            "{% for r in results %}{% for i in r.items %}"
+            "{{ i.container.name }}={{ i.result }};"
+            "{% endfor %}{% endfor %}"
+        ),
+    }
+    mocker.patch(
+        "backend.core.notification_dispatcher.SettingsStorage.get",
+        side_effect=settings.get,
+    )
+    mocker.patch(
+        "backend.core.notifications_core.SettingsStorage.get",
+        side_effect=settings.get,
+    )
+    db = mocker.patch(
+        "backend.core.notification_dispatcher.DbWriter.submit",
+        new_callable=mocker.AsyncMock,
+    )
+    yield db
+    await NotificationDispatcher.stop()
+    NotificationDispatcher._OUTBOX.clear()
+
+
+def _send(mocker: MockerFixture, side_effect=None):
+    return mocker.patch(
+        "backend.core.notification_dispatcher.send_notification",
+        new_callable=mocker.AsyncMock,
+        side_effect=side_effect,
+    )
+
+
+def _result(*items: tuple[str, str], host_id: int = 1) -> HostActionResult:
+    return HostActionResult(
+        host_id=host_id,
+        host_name=f"host{host_id}",
+        items=[
+            ContainerActionResult(
+                container=ContainerSummary(id=name, name=name),
+                result=result,  # type: ignore[arg-type]
+            )
+            for name, result in items
+        ],
+    )
+
+
+async def _wait_for(condition, timeout: float = 1) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+def test_digest_keeps_worthy_results():
+    digest = _Digest()
+    digest.add([_result(("a", "available"), ("b", "not_available"))])
+    digest.add([_result(("a", "available(notified)"), ("b", "available"))])
+    digest.add([_result(("a", "updated"))])
+    digest.add([_result(("c", "available"), host_id=2)])
+
+    assert [
+        [(i.container.name, i.result) for i in r.items] for r in digest.results()
+    ] == [
+        [("a", "updated"), ("b", "available")],
+        [("c", "available")],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_results_within_window_sent_as_one_digest(mocker: MockerFixture):
+    send = _send(mocker)
+    await NotificationDispatcher.start()
+
+    NotificationDispatcher.enqueue([_result(("a", "available"))])
+    NotificationDispatcher.enqueue([_result(("b", "updated"))])
+    await _wait_for(lambda: send.await_count == 2)
+    await asyncio.sleep(0.05)
+
+    assert send.await_count == 2
+    assert {c.args[2][0] for c in send.await_args_list} == set(URLS.splitlines())
+    assert all(
+        c.args[:2] == ("Title", "a=available;b=updated;") for c in send.await_args_list
+    )
+    assert not NotificationDispatcher._OUTBOX
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_retried_with_backoff(mocker: MockerFixture, dispatcher):
+    send = _send(mocker, side_effect=[RuntimeError("down"), None, None])
+    await NotificationDispatcher.start()
+
+    NotificationDispatcher.enqueue([_result(("a", "available"))])
+    await _wait_for(lambda: send.await_count == 3)
+    await _wait_for(lambda: not NotificationDispatcher._OUTBOX)
+
+    # insert, update of the failed one, delete of both
+    assert dispatcher.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_delivery_rate_limited_per_url(mocker: MockerFixture):
+    mocker.patch.object(NotificationDispatcher, "MIN_INTERVAL", 0.2)
+    url = "https://one.example/hook"
+    NotificationDispatcher._load_outbox.return_value = [  # type: ignore[attr-defined]
+        NotificationOutboxModel(
+            url=url, title="t", body=f"b{i}", attempts=0, not_before=now()
+        )
+        for i in range(2)
+    ]
+    send = _send(mocker)
+    await NotificationDispatcher.start()
+
+    await _wait_for(lambda: send.await_count == 1)
+    await asyncio.sleep(0.1)
+    assert send.await_count == 1
+    await _wait_for(lambda: send.await_count == 2)
+    assert [c.args[1] for c in send.await_args_list] == ["b0", "b1"]
+
+
+@pytest.mark.asyncio
+async def test_persisted_messages_loaded_on_start(mocker: MockerFixture):
+    NotificationDispatcher._load_outbox.return_value = [  # type: ignore[attr-defined]
+        NotificationOutboxModel(
+            url="https://one.example/hook",
+            title="t",
+            body="later",
+            attempts=3,
+            not_before=now() + timedelta(hours=1),
+        ),
+        NotificationOutboxModel(
+            url="https://removed.example/hook",
+            title="t",
+            body="b",
+            attempts=0,
+            not_before=now(),
+        ),
+    ]
+    send = _send(mocker)
+    await NotificationDispatcher.start()
+
+    await _wait_for(lambda: len(NotificationDispatcher._OUTBOX) == 1)
+    assert NotificationDispatcher._OUTBOX[0].body == "later"
+    send.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stop_persists_collected_digest(mocker: MockerFixture, dispatcher):
+    mocker.patch.object(NotificationDispatcher, "WINDOW", 60)
+    send = _send(mocker)
+    await NotificationDispatcher.start()
+
+    NotificationDispatcher.enqueue([_result(("a", "available"))])
+    await NotificationDispatcher.stop()
+
+    dispatcher.assert_awaited_once()
+    assert len(NotificationDispatcher._OUTBOX) == 2
+    send.assert_not_awaited()
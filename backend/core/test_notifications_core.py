@@ -1,9 +1,15 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from backend.config import Config
-from backend.core.notifications_core import send_notification
+from backend.core import notifications_core
+from backend.core.notifications_core import (
+    clear_notification_caches,
+    send_check_notification,
+    send_notification,
+)
 from backend.exception import (
     TugNotificationException,
     TugUrlValidationError,
@@ -11,6 +17,13 @@ from backend.exception import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    clear_notification_caches()
+    yield
+    clear_notification_caches()
+
+
 @pytest.mark.asyncio
 async def test_send_notification_revalidates_urls_before_dispatch():
     apprise = MagicMock()
@@ -22,19 +35,23 @@ async def test_send_notification_revalidates_urls_before_dispatch():
             "backend.core.notifications_core.validate_url_against_ssrf",
             new_callable=AsyncMock,
         ) as validate,
-        patch("backend.core.notifications_core.Apprise", return_value=apprise),
+        patch("apprise.Apprise", return_value=apprise),
     ):
         await send_notification("title", "body", urls)
 
     assert validate.await_args_list == [
         (
-            (url, Config.NOTIFICATION_ALLOW_NETWORKS, Config.NOTIFICATION_ALLOW_ENDPOINTS),
+            (
+                url,
+                Config.NOTIFICATION_ALLOW_NETWORKS,
+                Config.NOTIFICATION_ALLOW_ENDPOINTS,
+            ),
             {},
         )
         for url in urls
     ]
-    apprise.add.assert_called_once_with(urls)
-    apprise.async_notify.assert_awaited_once()
+    assert [c.args[0] for c in apprise.add.call_args_list] == urls
+    assert apprise.async_notify.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -45,7 +62,7 @@ async def test_send_notification_blocks_url_that_rebinds_to_restricted_network()
             new_callable=AsyncMock,
             side_effect=TugUrlValidationSSRFError("restricted address"),
         ),
-        patch("backend.core.notifications_core.Apprise") as apprise_class,
+        patch("apprise.Apprise") as apprise_class,
     ):
         with pytest.raises(TugNotificationException, match="SSRF protection"):
             await send_notification(
@@ -57,6 +74,51 @@ async def test_send_notification_blocks_url_that_rebinds_to_restricted_network()
     apprise_class.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_send_notification_blocked_url_does_not_stop_others():
+    apprise = MagicMock()
+    apprise.async_notify = AsyncMock(return_value=True)
+
+    async def _validate(url, *args):
+        if "attacker" in url:
+            raise TugUrlValidationSSRFError("restricted address")
+
+    with (
+        patch(
+            "backend.core.notifications_core.validate_url_against_ssrf",
+            side_effect=_validate,
+        ),
+        patch("apprise.Apprise", return_value=apprise),
+    ):
+        with pytest.raises(TugNotificationException, match="1 of 2.*SSRF"):
+            await send_notification(
+                "title",
+                "body",
+                ["https://attacker-controlled.example/hook", "https://ok.example"],
+            )
+
+    assert [c.args[0] for c in apprise.add.call_args_list] == ["https://ok.example"]
+    apprise.async_notify.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_notification_unsupported_url_fails():
+    apprise = MagicMock()
+    apprise.add.return_value = False
+
+    with (
+        patch(
+            "backend.core.notifications_core.validate_url_against_ssrf",
+            new_callable=AsyncMock,
+        ),
+        patch("apprise.Apprise", return_value=apprise),
+    ):
+        with pytest.raises(TugNotificationException, match="1 of 1.*not supported"):
+            await send_notification("title", "body", ["unknown://hook"])
+
+    apprise.async_notify.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_send_notification_allows_nonstandard_apprise_urls():
     apprise = MagicMock()
@@ -69,8 +131,89 @@ async def test_send_notification_allows_nonstandard_apprise_urls():
             new_callable=AsyncMock,
             side_effect=TugUrlValidationError("not a standard URL"),
         ),
-        patch("backend.core.notifications_core.Apprise", return_value=apprise),
+        patch("apprise.Apprise", return_value=apprise),
     ):
         await send_notification("title", "body", urls)
 
     apprise.async_notify.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_send_notification_reuses_apprise_and_validation():
+    apprise = MagicMock()
+    apprise.async_notify = AsyncMock(return_value=True)
+    urls = ["https://one.example/hook"]
+
+    with (
+        patch(
+            "backend.core.notifications_core.validate_url_against_ssrf",
+            new_callable=AsyncMock,
+        ) as validate,
+        patch("apprise.Apprise", return_value=apprise) as apprise_class,
+    ):
+        await send_notification("title", "body", urls)
+        await send_notification("title", "body", urls)
+
+    validate.assert_awaited_once()
+    apprise_class.assert_called_once()
+    assert apprise.async_notify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_send_notification_slow_url_does_not_delay_others(monkeypatch):
+    monkeypatch.setattr(notifications_core, "NOTIFICATION_URL_TIMEOUT", 0.05)
+    delivered: list[str] = []
+
+    def _apprise():
+        instance = MagicMock()
+
+        def _add(url):
+            instance.url = url
+            return True
+
+        async def _notify(**kwargs):
+            if "slow" in instance.url:
+                await asyncio.sleep(10)
+            delivered.append(instance.url)
+            return True
+
+        instance.add = MagicMock(side_effect=_add)
+        instance.async_notify = _notify
+        return instance
+
+    urls = ["https://slow.example/hook", "https://fast.example/hook"]
+    with (
+        patch(
+            "backend.core.notifications_core.validate_url_against_ssrf",
+            new_callable=AsyncMock,
+        ),
+        patch("apprise.Apprise", side_effect=_apprise),
+    ):
+        async with asyncio.timeout(1):
+            with pytest.raises(TugNotificationException, match="1 of 2"):
+                await send_notification("title", "body", urls)
+
+    assert delivered == ["https://fast.example/hook"]
+
+
+@pytest.mark.asyncio
+async def test_send_check_notification_compiles_templates_once():
+    send = AsyncMock()
+    with (
+        patch("backend.core.notifications_core.send_notification", send),
+        patch.object(
+            notifications_core._jinja2_env(),
+            "from_string",
+            wraps=notifications_core._jinja2_env().from_string,
+        ) as from_string,
+    ):
+        for _ in range(2):
+            await send_check_notification(
+                [],
+                title_template="Title",
+                body_template="Body {{ results | length }}",
+                urls="https://one.example/hook",
+            )
+            assert send.await_args.args[1].startswith("Body")
+
+    assert from_string.call_count == 2
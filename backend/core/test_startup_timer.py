@@ -0,0 +1,31 @@
+import logging
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.core.startup_timer import StartupTimer, get_process_age
+from backend.metrics import STARTUP_SECONDS
+
+
+def test_process_age():
+    age = get_process_age()
+
+    assert age is not None and age > 0
+
+
+def test_report(mocker: MockerFixture, caplog: pytest.LogCaptureFixture):
+    phases: dict[str, float] = {}
+    mocker.patch.object(StartupTimer, "_PHASES", phases)
+
+    StartupTimer.checkpoint("first")
+    time.sleep(0.05)
+    StartupTimer.checkpoint("second")
+    with caplog.at_level(logging.INFO, "StartupTimer"):
+        StartupTimer.report()
+
+    assert list(phases) == ["first", "second"]
+    assert phases["second"] >= 0.05
+    assert STARTUP_SECONDS.get("second") == phases["second"]
+    assert STARTUP_SECONDS.get("total") >= sum(phases.values())
+    assert caplog.records[0].getMessage().startswith("Started in ")
@@ -9,6 +9,7 @@ from backend.enums.hook_name_enum import EHookName
 from backend.modules.containers.containers_model import ContainersModel
 from backend.modules.containers.containers_schemas import ContainerHooks
 from shared.schemas.container_schemas import ExecContainerRequestBodySchema
+from shared.util.tracing import Tracer
 
 logger: Final = logging.getLogger("hooks_executor")
 
@@ -52,18 +53,24 @@ async def run_hooks(
         return []
     commands = getattr(hooks, hook_name.value)
     errors: list[Exception] = []
-    for command in commands:
-        try:
-            logger.info(
-                f"Running {hook_name.value} hook for {container_name}: {command}"
-            )
-            await client.container.exec(
-                container_name,
-                ExecContainerRequestBodySchema(command=command),
-            )
-        except Exception as e:
-            logger.exception(
-                f"Error while running {hook_name.value} hook for {container_name}"
-            )
-            errors.append(e)
+    if not commands:
+        return errors
+    with Tracer.span(
+        "hooks", container=container_name, hook=hook_name.value
+    ) as span:
+        for command in commands:
+            try:
+                logger.info(
+                    f"Running {hook_name.value} hook for {container_name}: {command}"
+                )
+                await client.container.exec(
+                    container_name,
+                    ExecContainerRequestBodySchema(command=command),
+                )
+            except Exception as e:
+                logger.exception(
+                    f"Error while running {hook_name.value} hook for {container_name}"
+                )
+                errors.append(e)
+                span.set_error(e)
     return errors
@@ -0,0 +1,116 @@
+import pytest
+from python_on_whales.components.container.models import (
+    ContainerConfig,
+    ContainerInspectResult,
+)
+
+from backend.const import (
+    DOCKER_COMPOSE_DEPENDS_ON_LABEL,
+    TUGTAINER_DEPENDS_ON_LABEL,
+)
+from backend.core.update_actions.update_actions_graph import (
+    build_dependency_graph,
+    get_affected,
+    get_dependency_graph,
+    get_topological_order,
+    invalidate_dependency_graph,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_cache():
+    invalidate_dependency_graph()
+    yield
+    invalidate_dependency_graph()
+
+
+def _container(name: str, labels: dict[str, str] | None = None):
+    return ContainerInspectResult(
+        name=name,
+        config=ContainerConfig(labels=labels or {}),
+    )
+
+
+def _compose(name: str, service: str, depends_on: str = ""):
+    labels = {
+        "com.docker.compose.project": "proj",
+        "com.docker.compose.project.config_files": "/compose.yml",
+        "com.docker.compose.service": service,
+    }
+    if depends_on:
+        labels[DOCKER_COMPOSE_DEPENDS_ON_LABEL] = depends_on
+    return _container(name, labels)
+
+
+def test_build_dependency_graph_compose_and_custom_labels():
+    containers = [
+        _compose("proj-db-1", "db"),
+        _compose("proj-api-1", "api", "db:service_healthy:false"),
+        _container("standalone", {TUGTAINER_DEPENDS_ON_LABEL: "proj-api-1"}),
+    ]
+    graph = build_dependency_graph(containers)
+    assert graph.depends_on == {
+        "proj-db-1": set(),
+        "proj-api-1": {"proj-db-1"},
+        "standalone": {"proj-api-1"},
+    }
+    assert graph.dependables == {
+        "proj-db-1": {"proj-api-1"},
+        "proj-api-1": {"standalone"},
+    }
+
+
+def test_get_affected_and_order():
+    containers = [
+        _container("db"),
+        _container("api", {TUGTAINER_DEPENDS_ON_LABEL: "db"}),
+        _container("fe", {TUGTAINER_DEPENDS_ON_LABEL: "api"}),
+        _container("other"),
+    ]
+    graph = build_dependency_graph(containers)
+    affected = get_affected(graph, {"db"})
+    assert affected == {"api", "fe"}
+    result = get_topological_order(graph, affected | {"db"})
+    assert result.order == ["db", "api", "fe"]
+    assert not result.cycles
+
+
+def test_get_topological_order_reports_cycles():
+    containers = [
+        _container("a", {TUGTAINER_DEPENDS_ON_LABEL: "b"}),
+        _container("b", {TUGTAINER_DEPENDS_ON_LABEL: "a"}),
+        _container("c", {TUGTAINER_DEPENDS_ON_LABEL: "a"}),
+        _container("d"),
+    ]
+    graph = build_dependency_graph(containers)
+    result = get_topological_order(graph, {"a", "b", "c", "d"})
+    assert result.cycles == {"a", "b", "c"}
+    assert result.order == ["d", "a", "b", "c"]
+
+
+def test_get_topological_order_deep_chain():
+    depth = 5000
+    containers = [_container("c0")] + [
+        _container(f"c{i}", {TUGTAINER_DEPENDS_ON_LABEL: f"c{i - 1}"})
+        for i in range(1, depth)
+    ]
+    graph = build_dependency_graph(containers)
+    affected = get_affected(graph, {"c0"})
+    assert len(affected) == depth - 1
+    result = get_topological_order(graph, {f"c{depth - 1}"})
+    assert result.order == [f"c{i}" for i in range(depth)]
+
+
+def test_get_dependency_graph_cache_invalidated_on_labels_change():
+    containers = [_container("db"), _container("api")]
+    graph = get_dependency_graph(1, containers)
+    assert get_dependency_graph(1, containers) is graph
+    assert get_dependency_graph(2, containers) is not graph
+
+    changed = [_container("db"), _container("api", {TUGTAINER_DEPENDS_ON_LABEL: "db"})]
+    changed_graph = get_dependency_graph(1, changed)
+    assert changed_graph is not graph
+    assert changed_graph.depends_on["api"] == {"db"}
+
+    invalidate_dependency_graph(1)
+    assert get_dependency_graph(1, changed) is not changed_graph
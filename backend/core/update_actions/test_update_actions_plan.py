@@ -5,6 +5,9 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from backend.core.update_actions.update_actions_graph import (
+    invalidate_dependency_graph,
+)
 from backend.core.update_actions.update_actions_plan import (
     build_update_plan,
 )
@@ -12,12 +15,21 @@ from backend.modules.settings.settings_enum import ESettingKey
 from backend.util.now import now
 
 base_module = "backend.core.update_actions.update_actions_plan"
+graph_module = "backend.core.update_actions.update_actions_graph"
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_cache():
+    invalidate_dependency_graph()
+    yield
+    invalidate_dependency_graph()
 
 
 class DummyContainer:
     def __init__(self, name, labels=None):
         self.name = name
         self.labels = labels or {}
+        self.config = None
 
 
 class DummyDB:
@@ -69,14 +81,14 @@ def _patch_common(mocker, db_list, deps, *, settings=None):
     )
     mocker.patch(f"{base_module}.is_protected_container", return_value=False)
     mocker.patch(f"{base_module}.is_running_container", return_value=True)
-    mocker.patch(f"{base_module}.get_service_name", return_value=None)
-    mocker.patch(f"{base_module}.get_compose_id", return_value=None)
+    mocker.patch(f"{graph_module}.get_service_name", return_value=None)
+    mocker.patch(f"{graph_module}.get_compose_id", return_value=None)
 
     def get_deps(container, _label):
         return deps.get(container.name, set())
 
     mocker.patch(
-        f"{base_module}.get_dependencies",
+        f"{graph_module}.get_dependencies",
         side_effect=get_deps,
     )
 
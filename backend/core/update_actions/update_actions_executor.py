@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import time
+from collections.abc import Iterator
 from typing import Final, cast
 
 from python_on_whales.components.container.models import (
@@ -12,7 +14,9 @@ from python_on_whales.components.image.models import (
 from backend.config import Config
 from backend.core.action_result import (
     ContainerActionResult,
+    ContainerSummary,
     UpdatePlanResult,
+    get_image_summary,
 )
 from backend.core.agent_client import AgentClient
 from backend.core.container_util.container_config import (
@@ -26,11 +30,11 @@ from backend.core.container_util.is_running_container import is_running_containe
 from backend.core.container_util.wait_for_container_healthy import (
     wait_for_container_healthy,
 )
+from backend.core.host_inventory import HostInventory
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import UpdatePlanProgress
 from backend.core.progress.progress_util import (
     get_plan_cache_key,
-    is_allowed_start_cache,
 )
 from backend.core.update_actions.hooks_executor import get_hooks_map, run_hooks
 from backend.core.update_actions.update_actions_schema import (
@@ -43,7 +47,9 @@ from backend.core.update_actions.update_actions_util import (
 )
 from backend.enums.action_status_enum import EActionStatus
 from backend.enums.hook_name_enum import EHookName
+from backend.metrics import CONTAINER_LAST_UPDATE_SECONDS, CONTAINER_UPDATE_SECONDS
 from backend.modules.hosts.hosts_model import HostsModel
+from backend.modules.public.public_summary import FleetSummary
 from backend.modules.settings.settings_enum import ESettingKey
 from backend.modules.settings.settings_storage import SettingsStorage
 from backend.util.jitter import jitter
@@ -57,10 +63,25 @@ from shared.schemas.image_schemas import (
     PullImageRequestBodySchema,
     TagImageRequestBodySchema,
 )
+from shared.util.tracing import Tracer
 
 logger: Final = logging.getLogger("execute_update_plan")
 
 
+def _timed_order(host: HostsModel, plan: UpdatePlan) -> Iterator[str]:
+    """
+    Names of the plan order. The time until the next name is requested
+    is observed as the duration of the update or restart of the container.
+    """
+    for name in plan.order:
+        started = time.perf_counter()
+        yield name
+        if name in plan.to_update or name in plan.affected:
+            took = time.perf_counter() - started
+            CONTAINER_UPDATE_SECONDS.observe(took, str(host.id))
+            CONTAINER_LAST_UPDATE_SECONDS.set(took, str(host.id), name)
+
+
 async def execute_update_plan(
     client: AgentClient,
     host: HostsModel,
@@ -71,18 +92,39 @@ async def execute_update_plan(
     logger.info(
         f"to_update={plan.to_update}, affected={plan.affected}, order={plan.order}"
     )
-    delay: Final = SettingsStorage.get(ESettingKey.REGISTRY_REQ_DELAY)
     status_key: Final = get_plan_cache_key(host, plan)
     cache: Final = ProgressCache[UpdatePlanProgress](status_key)
-    state: Final = cache.get()
-    if not is_allowed_start_cache(state):
-        logger.warning(f"{status_key} is already running. Exiting.")
-        return None
 
     if not plan.to_update:
         logger.warning(f"{status_key} has no containers to update. Exiting.")
         return None
 
+    if not cache.try_lock():
+        logger.warning(f"{status_key} is already running. Exiting.")
+        return None
+
+    try:
+        # Root of the trace when a single container is updated
+        with Tracer.span("update_plan", host_id=host.id, host_name=host.name):
+            return await _execute_update_plan(
+                client, host, containers, plan, docker_version, cache
+            )
+    except Exception:
+        cache.update({"status": EActionStatus.ERROR})
+        raise
+    finally:
+        cache.unlock()
+
+
+async def _execute_update_plan(
+    client: AgentClient,
+    host: HostsModel,
+    containers: list[ContainerInspectResult],
+    plan: UpdatePlan,
+    docker_version: DockerVersionScheme | None,
+    cache: ProgressCache[UpdatePlanProgress],
+) -> UpdatePlanResult:
+    delay: Final = SettingsStorage.get(ESettingKey.REGISTRY_REQ_DELAY)
     cache.set({"status": EActionStatus.PREPARING})
 
     items: Final = [
@@ -107,48 +149,52 @@ async def execute_update_plan(
     # We will check the state before updating
     for item in items:
         if item.name in plan.to_update:
-            # Get local image
-            try:
-                logger.info(f"Getting local image for {item.name}")
-                if item.container.image:
-                    local_image = await client.image.inspect(
-                        InspectImageRequestBodySchema(spec_or_id=item.container.image)
-                    )
-                elif item.image_spec:
-                    local_image = await client.image.inspect(
-                        InspectImageRequestBodySchema(spec_or_id=item.image_spec)
-                    )
-                else:
-                    raise Exception("No image id or image spec specified")
-                item.local_image = local_image
-            except Exception as e:
-                logger.exception(f"Failed to get local image for {item.name}")
-                item.errors.append(e)
+            with Tracer.span("prepare", container=item.name):
+                # Get local image
+                try:
+                    logger.info(f"Getting local image for {item.name}")
+                    if item.container.image:
+                        local_image = await client.image.inspect(
+                            InspectImageRequestBodySchema(
+                                spec_or_id=item.container.image
+                            )
+                        )
+                    elif item.image_spec:
+                        local_image = await client.image.inspect(
+                            InspectImageRequestBodySchema(spec_or_id=item.image_spec)
+                        )
+                    else:
+                        raise Exception("No image id or image spec specified")
+                    item.local_image = local_image
+                except Exception as e:
+                    logger.exception(f"Failed to get local image for {item.name}")
+                    item.errors.append(e)
 
-            # Pull new image
-            try:
-                logger.info(f"Pulling image for {item.name}")
-                remote_image = await client.image.pull(
-                    PullImageRequestBodySchema(image=cast(str, item.image_spec))
-                )
-                item.remote_image = remote_image
-            except Exception as e:
-                logger.exception(f"Failed to pull image for {item.name}")
-                item.errors.append(e)
+                # Pull new image
+                try:
+                    logger.info(f"Pulling image for {item.name}")
+                    with Tracer.span("pull", image=str(item.image_spec)):
+                        remote_image = await client.image.pull(
+                            PullImageRequestBodySchema(image=cast(str, item.image_spec))
+                        )
+                    item.remote_image = remote_image
+                except Exception as e:
+                    logger.exception(f"Failed to pull image for {item.name}")
+                    item.errors.append(e)
 
-            # Prepare config
-            try:
-                logger.info(f"Getting config for {item.name}")
-                config, commands = get_container_config(
-                    item.container,
-                    item.local_image,
-                    docker_version,
-                )
-                item.config = config
-                item.commands = commands
-            except Exception as e:
-                logger.exception(f"Failed to get config for {item.name}")
-                item.errors.append(e)
+                # Prepare config
+                try:
+                    logger.info(f"Getting config for {item.name}")
+                    config, commands = get_container_config(
+                        item.container,
+                        item.local_image,
+                        docker_version,
+                    )
+                    item.config = config
+                    item.commands = commands
+                except Exception as e:
+                    logger.exception(f"Failed to get config for {item.name}")
+                    item.errors.append(e)
 
             await asyncio.sleep(jitter(delay))
 
@@ -168,52 +214,56 @@ async def execute_update_plan(
     for name in reversed(plan.order):
         item = items_map.get(name)
         if item and item.was_running:
-            hooks = hooks_map.get(name)
-            hook_errors = await run_hooks(client, name, hooks, EHookName.PRE_STOP)
-            if not hook_errors and name in plan.to_update:
-                hook_errors = await run_hooks(client, name, hooks, EHookName.PRE_UPDATE)
-            if hook_errors:
-                item.errors.extend(hook_errors)
-                logger.warning(
-                    f"Skipping stop of {name} due to pre_stop/pre_update hook failure"
-                )
-                continue
-            try:
-                logger.info(f"Stopping container {name}")
-                await client.container.stop(name)
-                item.container = await client.container.inspect(name)
-            except Exception as e:
-                logger.exception(f"Failed to stop container {name}")
-                item.errors.append(e)
+            with Tracer.span("stop", container=name):
+                hooks = hooks_map.get(name)
+                hook_errors = await run_hooks(client, name, hooks, EHookName.PRE_STOP)
+                if not hook_errors and name in plan.to_update:
+                    hook_errors = await run_hooks(
+                        client, name, hooks, EHookName.PRE_UPDATE
+                    )
+                if hook_errors:
+                    item.errors.extend(hook_errors)
+                    logger.warning(
+                        f"Skipping stop of {name} due to pre_stop/pre_update hook failure"
+                    )
+                    continue
+                try:
+                    logger.info(f"Stopping container {name}")
+                    await client.container.stop(name)
+                    item.container = await client.container.inspect(name)
+                except Exception as e:
+                    logger.exception(f"Failed to stop container {name}")
+                    item.errors.append(e)
 
     async def _attempt_start_with_health(item: UpdatePlanItem):
         """
         Try to start a container with waiting for healthchecks.
         Mutates the item's container attribute.
         """
-        if not item.was_running:
-            logger.info(f"{item.name} wasn't running before execution, continue...")
-            return
-
-        item.container = await client.container.inspect(item.name)
-        if is_running_container(item.container):
-            logger.info(f"{item.name} already running, continue...")
-            return
-
-        logger.info(f"Starting container {item.name}")
-        await client.container.start(item.name)
-
-        logger.info("Waiting for healthchecks...")
-        healthy, container = await wait_for_container_healthy(
-            client,
-            item.container,
-            host.container_hc_timeout,
-        )
-        item.container = container
-        if healthy:
-            logger.info("Container is healthy!")
-            return
-        raise Exception(f"{item.name} is unhealthy!")
+        with Tracer.span("start", container=item.name):
+            if not item.was_running:
+                logger.info(f"{item.name} wasn't running before execution, continue...")
+                return
+
+            item.container = await client.container.inspect(item.name)
+            if is_running_container(item.container):
+                logger.info(f"{item.name} already running, continue...")
+                return
+
+            logger.info(f"Starting container {item.name}")
+            await client.container.start(item.name)
+
+            logger.info("Waiting for healthchecks...")
+            healthy, container = await wait_for_container_healthy(
+                client,
+                item.container,
+                host.container_hc_timeout,
+            )
+            item.container = container
+            if healthy:
+                logger.info("Container is healthy!")
+                return
+            raise Exception(f"{item.name} is unhealthy!")
 
     async def _run_commands(item: UpdatePlanItem):
         """Run commands after container started"""
@@ -233,7 +283,7 @@ async def execute_update_plan(
 
     # Updating and/or starting containers in order
     # from most dependable to most dependent
-    for name in plan.order:
+    for name in _timed_order(host, plan):
         item = items_map.get(name)
         if item:
             # Updating containers
@@ -255,141 +305,147 @@ async def execute_update_plan(
                 remote_image = cast(ImageInspectResult, item.remote_image)
                 config = cast(CreateContainerRequestBodySchema, item.config)
 
-                try:
-                    # Refresh the attachment list when possible, but always
-                    # attempt the disconnect: a force disconnect also clears
-                    # endpoints left behind by an already gone container.
-                    if await client.container.exists(item.name):
-                        item.container = await client.container.inspect(item.name)
-                    await disconnect_all_networks(client, item.container, True)
-
-                    logger.info("Removing container...")
-                    await client.container.remove(item.name)
+                with Tracer.span("recreate", container=item.name) as span:
+                    try:
+                        # Refresh the attachment list when possible, but always
+                        # attempt the disconnect: a force disconnect also clears
+                        # endpoints left behind by an already gone container.
+                        if await client.container.exists(item.name):
+                            item.container = await client.container.inspect(item.name)
+                        await disconnect_all_networks(client, item.container, True)
 
-                    logger.info("Merging configs")
-                    merged_config = diff_container_config_with_image(
-                        config, remote_image
-                    )
+                        logger.info("Removing container...")
+                        await client.container.remove(item.name)
 
-                    logger.info("Recreating container...")
-                    item.container = await client.container.create(merged_config)
-                    if not item.was_running:
-                        logger.info(
-                            "Container recreated. It wasn't running before update, consider as success and continue..."
+                        logger.info("Merging configs")
+                        merged_config = diff_container_config_with_image(
+                            config, remote_image
                         )
-                        item.result = "updated"
-                        continue
 
-                    logger.info("Starting container...")
-                    await client.container.start(item.name)
-                    await _run_commands(item)
-                    item.container = await client.container.inspect(item.name)
+                        logger.info("Recreating container...")
+                        item.container = await client.container.create(merged_config)
+                        if not item.was_running:
+                            logger.info(
+                                "Container recreated. It wasn't running before update, consider as success and continue..."
+                            )
+                            item.result = "updated"
+                            continue
+
+                        logger.info("Starting container...")
+                        await client.container.start(item.name)
+                        await _run_commands(item)
+                        item.container = await client.container.inspect(item.name)
 
-                    logger.info("Waiting for healthchecks...")
-                    healthy, container = await wait_for_container_healthy(
-                        client,
-                        item.container,
-                        host.container_hc_timeout,
-                    )
-                    item.container = container
-                    if healthy:
-                        logger.info("Container is healthy!")
-                        item.result = "updated"
+                        logger.info("Waiting for healthchecks...")
+                        healthy, container = await wait_for_container_healthy(
+                            client,
+                            item.container,
+                            host.container_hc_timeout,
+                        )
+                        item.container = container
+                        if healthy:
+                            logger.info("Container is healthy!")
+                            item.result = "updated"
+                            hook_errors = await run_hooks(
+                                client,
+                                item.name,
+                                hooks_map.get(item.name),
+                                EHookName.POST_UPDATE,
+                            )
+                            item.errors.extend(hook_errors)
+                            continue
+
+                        logger.warning("Container is unhealthy, rolling back...")
                         hook_errors = await run_hooks(
                             client,
                             item.name,
                             hooks_map.get(item.name),
-                            EHookName.POST_UPDATE,
+                            EHookName.PRE_ROLLBACK,
                         )
                         item.errors.extend(hook_errors)
-                        continue
+                        await client.container.stop(item.name)
+                        item.container = await client.container.inspect(item.name)
+                        await disconnect_all_networks(client, item.container, True)
+                        await client.container.remove(item.name)
+                    except Exception as e:
+                        logger.exception(
+                            f"Failed to update {item.name}, cleanup before rollback..."
+                        )
+                        item.errors.append(e)
+                        span.set_error(e)
+                        # Cleanup after update error
+                        try:
+                            if await client.container.exists(item.name):
+                                existing = await client.container.inspect(item.name)
+                                item.container = existing
+                                if is_running_container(existing):
+                                    hook_errors = await run_hooks(
+                                        client,
+                                        item.name,
+                                        hooks_map.get(item.name),
+                                        EHookName.PRE_ROLLBACK,
+                                    )
+                                    item.errors.extend(hook_errors)
+                                logger.warning("Removing failed container")
+                                await client.container.stop(item.name)
+                                existing = await client.container.inspect(item.name)
+                                item.container = existing
+                                await disconnect_all_networks(client, existing, True)
+                                await client.container.remove(name_or_id=item.name)
+                        except Exception as e:
+                            logger.exception("Cleanup error")
+                            item.errors.append(e)
 
-                    logger.warning("Container is unhealthy, rolling back...")
-                    hook_errors = await run_hooks(
-                        client,
-                        item.name,
-                        hooks_map.get(item.name),
-                        EHookName.PRE_ROLLBACK,
-                    )
-                    item.errors.extend(hook_errors)
-                    await client.container.stop(item.name)
-                    item.container = await client.container.inspect(item.name)
-                    await disconnect_all_networks(client, item.container, True)
-                    await client.container.remove(item.name)
-                except Exception as e:
-                    logger.exception(
-                        f"Failed to update {item.name}, cleanup before rollback..."
-                    )
-                    item.errors.append(e)
-                    # Cleanup after update error
+                # Rolling back
+                with Tracer.span("rollback", container=item.name) as span:
                     try:
-                        if await client.container.exists(item.name):
-                            existing = await client.container.inspect(item.name)
-                            item.container = existing
-                            if is_running_container(existing):
-                                hook_errors = await run_hooks(
-                                    client,
-                                    item.name,
-                                    hooks_map.get(item.name),
-                                    EHookName.PRE_ROLLBACK,
-                                )
-                                item.errors.extend(hook_errors)
-                            logger.warning("Removing failed container")
-                            await client.container.stop(item.name)
-                            existing = await client.container.inspect(item.name)
-                            item.container = existing
-                            await disconnect_all_networks(client, existing, True)
-                            await client.container.remove(name_or_id=item.name)
+                        logger.warning(
+                            f"Tagging previous image of {item.name} with {item.image_spec}"
+                        )
+                        await client.image.tag(
+                            TagImageRequestBodySchema(
+                                spec_or_id=str(local_image.id),
+                                tag=image_spec,
+                            )
+                        )
                     except Exception as e:
-                        logger.exception("Cleanup error")
+                        logger.exception("Failed to tag previous image")
                         item.errors.append(e)
+                    try:
+                        logger.warning(
+                            "Creating container with previous configuration..."
+                        )
+                        item.container = await client.container.create(config)
 
-                # Rolling back
-                try:
-                    logger.warning(
-                        f"Tagging previous image of {item.name} with {item.image_spec}"
-                    )
-                    await client.image.tag(
-                        TagImageRequestBodySchema(
-                            spec_or_id=str(local_image.id),
-                            tag=image_spec,
+                        logger.warning("Starting container...")
+                        await client.container.start(item.name)
+                        await _run_commands(item)
+                        item.container = await client.container.inspect(item.name)
+                        item.result = "rolled_back"
+                        hook_errors = await run_hooks(
+                            client,
+                            item.name,
+                            hooks_map.get(item.name),
+                            EHookName.POST_ROLLBACK,
                         )
-                    )
-                except Exception as e:
-                    logger.exception("Failed to tag previous image")
-                    item.errors.append(e)
-                try:
-                    logger.warning("Creating container with previous configuration...")
-                    item.container = await client.container.create(config)
-
-                    logger.warning("Starting container...")
-                    await client.container.start(item.name)
-                    await _run_commands(item)
-                    item.container = await client.container.inspect(item.name)
-                    item.result = "rolled_back"
-                    hook_errors = await run_hooks(
-                        client,
-                        item.name,
-                        hooks_map.get(item.name),
-                        EHookName.POST_ROLLBACK,
-                    )
-                    item.errors.extend(hook_errors)
+                        item.errors.extend(hook_errors)
 
-                    logger.warning("Waiting for healthchecks...")
-                    healthy, container = await wait_for_container_healthy(
-                        client,
-                        item.container,
-                        host.container_hc_timeout,
-                    )
-                    item.container = container
-                    if healthy:
-                        logger.warning("Container is heailthy after rolling back!")
-                        continue
-                    logger.error("Container is unhealthy after rolling back!")
-                except Exception as e:
-                    logger.exception("Error while rolling back!")
-                    item.errors.append(e)
-                    item.result = "failed"
+                        logger.warning("Waiting for healthchecks...")
+                        healthy, container = await wait_for_container_healthy(
+                            client,
+                            item.container,
+                            host.container_hc_timeout,
+                        )
+                        item.container = container
+                        if healthy:
+                            logger.warning("Container is heailthy after rolling back!")
+                            continue
+                        logger.error("Container is unhealthy after rolling back!")
+                    except Exception as e:
+                        logger.exception("Error while rolling back!")
+                        item.errors.append(e)
+                        span.set_error(e)
+                        item.result = "failed"
 
             # Starting non-updatable containers
             if name in plan.affected:
@@ -400,6 +456,8 @@ async def execute_update_plan(
                     item.errors.append(e)
 
     logger.info("Finished plan execution")
+    HostInventory.invalidate(host.id)
+    FleetSummary.invalidate()
 
     errors_count = sum(len(item.errors) for item in items)
     if errors_count:
@@ -410,9 +468,10 @@ async def execute_update_plan(
         host_name=host.name,
         items=[
             ContainerActionResult(
-                container=item.container,
-                local_image=item.local_image,
-                remote_image=item.remote_image,
+                container=ContainerSummary.from_inspect(item.container),
+                image_spec=item.image_spec,
+                local_image=get_image_summary(item.local_image),
+                remote_image=get_image_summary(item.remote_image),
                 result=item.result,
             )
             for item in items
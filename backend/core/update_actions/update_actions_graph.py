@@ -0,0 +1,207 @@
+import logging
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Final, cast
+
+from python_on_whales.components.container.models import (
+    ContainerInspectResult,
+)
+
+from backend.const import (
+    DOCKER_COMPOSE_DEPENDS_ON_LABEL,
+    TUGTAINER_DEPENDS_ON_LABEL,
+)
+from backend.core.container_util.get_service_name import get_service_name
+
+from .update_actions_util import get_compose_id, get_dependencies
+
+logger: Final = logging.getLogger("update_actions_graph")
+
+
+@dataclass
+class DependencyGraph:
+    """
+    Dependency graph of the host containers.
+    :param depends_on: container to its dependencies
+    :param dependables: container to its dependables (reverse)
+    """
+
+    depends_on: dict[str, set[str]] = field(default_factory=dict)
+    dependables: dict[str, set[str]] = field(default_factory=dict)
+
+
+@dataclass
+class TopologicalOrder:
+    """
+    Result of the topological sort.
+    :param order: nodes from most dependable to most dependent
+    :param cycles: nodes that are part of (or depend on) a cycle
+    """
+
+    order: list[str]
+    cycles: set[str] = field(default_factory=set)
+
+
+# Per host cache of the graph and the fingerprint it was built from
+_GRAPH_CACHE: dict[int, tuple[int, DependencyGraph]] = {}
+
+
+def _get_graph_fingerprint(containers: Sequence[ContainerInspectResult]) -> int:
+    """
+    Get hash of everything the graph depends on,
+    i.e. names and dependency related labels of the containers.
+    """
+    items: list[tuple[str | None, ...]] = []
+    for c in containers:
+        labels = c.config.labels if c.config and c.config.labels else {}
+        items.append(
+            (
+                c.name,
+                get_service_name(c),
+                get_compose_id(c),
+                labels.get(TUGTAINER_DEPENDS_ON_LABEL),
+                labels.get(DOCKER_COMPOSE_DEPENDS_ON_LABEL),
+            )
+        )
+    return hash(tuple(items))
+
+
+def build_dependency_graph(
+    containers: Sequence[ContainerInspectResult],
+) -> DependencyGraph:
+    """
+    Build dependency graph from the custom and compose labels.
+    :param containers: containers of the host
+    """
+    graph: Final = DependencyGraph()
+    # Map of service name to container name per compose
+    compose_service_names: dict[str, dict[str, str]] = {}
+
+    for c in containers:
+        srvn = get_service_name(c)
+        compose_id = get_compose_id(c)
+        if srvn and compose_id:
+            compose_service_names.setdefault(compose_id, {})[srvn] = cast(
+                str, c.name
+            )
+
+    for c in containers:
+        c_name = cast(str, c.name)
+        deps = get_dependencies(c, TUGTAINER_DEPENDS_ON_LABEL)
+
+        compose_id = get_compose_id(c)
+        if compose_id:
+            neighbors = compose_service_names.get(compose_id, {})
+            for d in get_dependencies(c, DOCKER_COMPOSE_DEPENDS_ON_LABEL):
+                if d_name := neighbors.get(d):
+                    deps.add(d_name)
+
+        graph.depends_on[c_name] = deps
+
+    for name, deps in graph.depends_on.items():
+        for dep in deps:
+            graph.dependables.setdefault(dep, set()).add(name)
+
+    return graph
+
+
+def get_dependency_graph(
+    host_id: int,
+    containers: Sequence[ContainerInspectResult],
+) -> DependencyGraph:
+    """
+    Get cached dependency graph of the host.
+    The graph is rebuilt if names or dependency labels of the containers changed.
+    :param host_id: id of the host
+    :param containers: containers of the host
+    """
+    fingerprint: Final = _get_graph_fingerprint(containers)
+    cached: Final = _GRAPH_CACHE.get(host_id)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+    graph: Final = build_dependency_graph(containers)
+    _GRAPH_CACHE[host_id] = (fingerprint, graph)
+    return graph
+
+
+def invalidate_dependency_graph(host_id: int | None = None) -> None:
+    """
+    Drop cached graph of the host.
+    :param host_id: id of the host, drop all if None
+    """
+    if host_id is None:
+        _GRAPH_CACHE.clear()
+    else:
+        _GRAPH_CACHE.pop(host_id, None)
+
+
+def get_affected(graph: DependencyGraph, to_update: Iterable[str]) -> set[str]:
+    """
+    Get containers affected by the update (BFS over dependables).
+    Updatable containers themselves are not included.
+    :param graph: dependency graph
+    :param to_update: names of the updatable containers
+    """
+    _to_update: Final = set(to_update)
+    affected: Final[set[str]] = set()
+    queue: Final = deque(_to_update)
+    visited: Final = set(_to_update)
+
+    while queue:
+        node = queue.popleft()
+        if node not in _to_update:
+            affected.add(node)
+        for dep in graph.dependables.get(node, ()):
+            if dep not in visited:
+                visited.add(dep)
+                queue.append(dep)
+
+    return affected
+
+
+def get_topological_order(
+    graph: DependencyGraph, nodes: Iterable[str]
+) -> TopologicalOrder:
+    """
+    Sort the nodes and all their transitive dependencies
+    from most dependable to most dependent (Kahn's algorithm).
+    Nodes that cannot be ordered due to a cycle are reported
+    and appended to the end in a stable order.
+    :param graph: dependency graph
+    :param nodes: names of the containers to sort
+    """
+    # Collect subgraph of the nodes with their transitive dependencies
+    subgraph: Final[set[str]] = set()
+    queue: Final = deque(nodes)
+    while queue:
+        node = queue.popleft()
+        if node in subgraph:
+            continue
+        subgraph.add(node)
+        for dep in graph.depends_on.get(node, ()):
+            if dep not in subgraph:
+                queue.append(dep)
+
+    in_degree: Final = {
+        node: len(graph.depends_on.get(node, ())) for node in subgraph
+    }
+    ready: Final = deque(sorted(node for node, deg in in_degree.items() if not deg))
+    order: Final[list[str]] = []
+
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependable in sorted(graph.dependables.get(node, ())):
+            if dependable not in in_degree:
+                continue
+            in_degree[dependable] -= 1
+            if not in_degree[dependable]:
+                ready.append(dependable)
+
+    cycles: Final = {node for node, deg in in_degree.items() if deg}
+    if cycles:
+        logger.warning(f"Dependency cycle detected between {sorted(cycles)}")
+        order.extend(sorted(cycles))
+
+    return TopologicalOrder(order=order, cycles=cycles)
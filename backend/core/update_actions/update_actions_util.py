@@ -4,12 +4,13 @@ from python_on_whales.components.container.models import (
     ContainerInspectResult,
 )
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.action_result import (
     UpdatePlanResult,
 )
 from backend.core.agent_client import AgentClient
-from backend.db.session import async_session_maker
+from backend.db.db_writer import DbWriter
 from backend.modules.containers.containers_model import (
     ContainersModel,
 )
@@ -30,7 +31,7 @@ async def update_containers_data_after_execution(
         return
     _now = now()
 
-    async with async_session_maker() as session:
+    async def _write(session: AsyncSession) -> None:
         container_names = [item.container.name for item in valid_items]
         containers = await session.scalars(
             select(ContainersModel).where(
@@ -48,7 +49,7 @@ async def update_containers_data_after_execution(
                     container.updated_at = _now
                     container.local_digests = item.remote_digests
 
-        await session.commit()
+    await DbWriter.submit(_write)
 
 
 async def disconnect_all_networks(
@@ -1,24 +1,20 @@
 import logging
 from typing import Final
 
-from sqlalchemy import select
-
 from backend.core.action_result import (
     HostActionResult,
 )
 from backend.core.agent_client import AgentClientManager
-from backend.core.notifications_core import send_check_notification
+from backend.core.host_registry import HostRegistry
+from backend.core.notification_dispatcher import NotificationDispatcher
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import (
     AllActionProgress,
 )
 from backend.core.progress.progress_util import (
     ALL_CONTAINERS_STATUS_KEY,
-    is_allowed_start_cache,
 )
-from backend.db.session import async_session_maker
 from backend.enums.action_status_enum import EActionStatus
-from backend.modules.hosts.hosts_model import HostsModel
 
 from .update_host_containers import update_host_containers
 
@@ -33,9 +29,8 @@ async def update_all_containers():
     cache: Final = ProgressCache[AllActionProgress](
         ALL_CONTAINERS_STATUS_KEY
     )
-    state: Final = cache.get()
 
-    if not is_allowed_start_cache(state):
+    if not cache.try_lock():
         logger.warning("Update process is already running.")
         return
 
@@ -45,30 +40,23 @@ async def update_all_containers():
         )
         logger.info("Start updating of all containers for all hosts")
 
-        async with async_session_maker() as session:
-            hosts: Final = (
-                (
-                    await session.execute(
-                        select(HostsModel).where(
-                            HostsModel.enabled
-                        )
-                    )
-                )
-                .scalars()
-                .all()
-            )
+        hosts: Final = await HostRegistry.get_all(enabled_only=True)
 
         cache.update({"status": EActionStatus.UPDATING})
         results: list[HostActionResult] = []
         for host in hosts:
             try:
                 client = AgentClientManager.get_host_client(host)
+                if not client.is_available:
+                    logger.warning(f"Agent of {host.name} is unavailable. Skipping.")
+                    continue
                 result = await update_host_containers(
                     host,
                     client,
                 )
                 if result:
                     results += [result]
+                    cache.publish_item(result)
             except Exception:
                 logger.exception(
                     f"Failed to update containers of {host.name}"
@@ -83,10 +71,10 @@ async def update_all_containers():
             }
         )
         try:
-            await send_check_notification(results)
+            NotificationDispatcher.enqueue(results)
         except Exception:
             logger.exception(
-                "Failed to send notification after update"
+                "Failed to enqueue notification after update"
             )
 
     except Exception:
@@ -94,3 +82,5 @@ async def update_all_containers():
         logger.exception(
             "Error while updating of all containers for all hosts"
         )
+    finally:
+        cache.unlock()
@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Final
 
 from python_on_whales.components.container.models import (
@@ -9,13 +10,13 @@ from backend.core.action_result import (
     HostActionResult,
 )
 from backend.core.agent_client import AgentClient
+from backend.core.host_inventory import HostInventory
 from backend.core.progress.progress_cache import ProgressCache
 from backend.core.progress.progress_schemas import (
     HostActionProgress,
 )
 from backend.core.progress.progress_util import (
     get_host_cache_key,
-    is_allowed_start_cache,
 )
 from backend.core.update_actions.update_actions_executor import (
     execute_update_plan,
@@ -24,11 +25,11 @@ from backend.core.update_actions.update_actions_plan import (
     build_update_plan,
 )
 from backend.enums.action_status_enum import EActionStatus
+from backend.metrics import HOST_UPDATE_SECONDS
 from backend.modules.hosts.hosts_model import HostsModel
-from shared.schemas.container_schemas import (
-    GetContainerListBodySchema,
-)
+from backend.modules.public.public_summary import FleetSummary
 from shared.schemas.image_schemas import PruneImagesRequestBodySchema
+from shared.util.tracing import Tracer
 
 
 async def update_host_containers(
@@ -43,59 +44,69 @@ async def update_host_containers(
     result: Final = HostActionResult(host_id=host.id, host_name=host.name)
     status_key: Final = get_host_cache_key(host)
     cache: Final = ProgressCache[HostActionProgress](status_key)
-    state: Final = cache.get()
     logger: Final = logging.getLogger(f"update_host_containers.{host.id}:{host.name}")
 
-    if not is_allowed_start_cache(state):
+    if not cache.try_lock():
         logger.warning("Update already running. Exiting.")
         return None
 
-    try:
-        cache.set(
-            {"status": EActionStatus.PREPARING},
-        )
-        logger.info("Starting update")
-
+    started: Final = time.perf_counter()
+    with Tracer.span("update_host", host_id=host.id, host_name=host.name) as span:
         try:
-            docker_version = await client.common.version()
-        except Exception:
-            logger.exception("Failed to get docker version")
-            docker_version = None
+            cache.set(
+                {"status": EActionStatus.PREPARING},
+            )
+            logger.info("Starting update")
+
+            try:
+                docker_version = await client.common.version()
+            except Exception:
+                logger.exception("Failed to get docker version")
+                docker_version = None
 
-        containers: list[ContainerInspectResult] = await client.container.list(
-            GetContainerListBodySchema(all=True)
-        )
-        manual_for = containers if manual else []
+            containers: list[ContainerInspectResult] = (
+                await HostInventory.get_containers(host, client)
+            )
+            manual_for = containers if manual else []
 
-        plan = await build_update_plan(host, containers, manual_for)
+            with Tracer.span("plan"):
+                plan = await build_update_plan(host, containers, manual_for)
 
-        cache.update(
-            {"status": EActionStatus.UPDATING},
-        )
+            cache.update(
+                {"status": EActionStatus.UPDATING},
+            )
 
-        plan_res = await execute_update_plan(
-            client, host, containers, plan, docker_version
-        )
+            plan_res = await execute_update_plan(
+                client, host, containers, plan, docker_version
+            )
 
-        if plan_res:
-            result.items.extend(plan_res.items)
+            if plan_res:
+                result.items.extend(plan_res.items)
 
-        if host.prune:
-            cache.update({"status": EActionStatus.PRUNING})
-            logger.info("Pruning images...")
-            try:
-                result.prune_result = await client.image.prune(
-                    PruneImagesRequestBodySchema(all=host.prune_all)
-                )
-            except Exception:
-                logger.exception("Failed to prune images")
+            if host.prune:
+                cache.update({"status": EActionStatus.PRUNING})
+                logger.info("Pruning images...")
+                try:
+                    with Tracer.span("prune"):
+                        result.prune_result = await client.image.prune(
+                            PruneImagesRequestBodySchema(all=host.prune_all)
+                        )
+                except Exception:
+                    logger.exception("Failed to prune images")
+                finally:
+                    HostInventory.invalidate(host.id)
+                    FleetSummary.invalidate()
 
-        cache.update({"status": EActionStatus.DONE, "result": result})
-        logger.info("Update completed")
-        return result
-    except Exception:
-        logger.exception("Failed to update")
-        cache.update(
-            {"status": EActionStatus.ERROR},
-        )
-        return None
+            cache.update({"status": EActionStatus.DONE, "result": result})
+            logger.info("Update completed")
+            return result
+        except Exception as e:
+            logger.exception("Failed to update")
+            span.set_error(e)
+            cache.update(
+                {"status": EActionStatus.ERROR},
+            )
+            return None
+        finally:
+            cache.unlock()
+            HOST_UPDATE_SECONDS.observe(time.perf_counter() - started, str(host.id))
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Final
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.session import async_session_maker
+
+type WriteJob[T] = Callable[[AsyncSession], Awaitable[T]]
+
+
+@dataclass
+class _PendingWrite:
+    job: WriteJob[Any]
+    future: asyncio.Future[Any] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class DbWriter:
+    """
+    Single writer of the background check/update results.
+    Jobs queued while the previous batch is committed are executed
+    in one session and committed together, so concurrent tasks
+    don't compete for the database write lock.
+    """
+
+    MAX_BATCH: ClassVar[int] = 100
+    _QUEUE: ClassVar[asyncio.Queue[_PendingWrite] | None] = None
+    _TASK: ClassVar[asyncio.Task | None] = None
+    _LOGGER: Final = logging.getLogger("DbWriter")
+
+    @classmethod
+    async def submit[T](cls, job: WriteJob[T]) -> T:
+        """
+        Queue the job and wait for its commit.
+        Job must not commit the session itself.
+        :param job: coroutine function receiving the batch session
+        """
+        pending = _PendingWrite(job)
+        cls._get_queue().put_nowait(pending)
+        return await pending.future
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Wait for the queued jobs and stop the writer"""
+        if cls._TASK is None or cls._QUEUE is None:
+            return
+        if not cls._TASK.done():
+            await cls._QUEUE.join()
+            cls._TASK.cancel()
+            try:
+                await cls._TASK
+            except asyncio.CancelledError:
+                pass
+        cls._TASK = None
+        cls._QUEUE = None
+
+    @classmethod
+    def _get_queue(cls) -> asyncio.Queue[_PendingWrite]:
+        loop = asyncio.get_running_loop()
+        if (
+            cls._QUEUE is None
+            or cls._TASK is None
+            or cls._TASK.done()
+            or cls._TASK.get_loop() is not loop
+        ):
+            cls._QUEUE = asyncio.Queue()
+            cls._TASK = asyncio.create_task(cls._run(cls._QUEUE))
+        return cls._QUEUE
+
+    @classmethod
+    async def _run(cls, queue: asyncio.Queue[_PendingWrite]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < cls.MAX_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await cls._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @classmethod
+    async def _write(cls, batch: list[_PendingWrite]) -> None:
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+        try:
+            async with async_session_maker() as session:
+                results = [await item.job(session) for item in batch]
+                await session.commit()
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0].future.done():
+                    batch[0].future.set_exception(e)
+                return
+            # Don't let one failed job drop the whole batch
+            cls._LOGGER.warning(
+                f"Batch of {len(batch)} writes failed, retrying one by one"
+            )
+            for item in batch:
+                await cls._write([item])
+            return
+        for item, result in zip(batch, results, strict=True):
+            if not item.future.done():
+                item.future.set_result(result)
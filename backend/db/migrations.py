@@ -0,0 +1,39 @@
+import asyncio
+import os
+from typing import Final
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from backend.db.session import async_engine
+
+ALEMBIC_INI: Final = os.path.join(os.path.dirname(__file__), "..", "alembic.ini")
+
+
+async def get_current_heads() -> set[str]:
+    """Get revisions the database is at, the engine is disposed afterwards"""
+    try:
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(
+                lambda c: set(MigrationContext.configure(c).get_current_heads())
+            )
+    finally:
+        # Connections are bound to the loop of asyncio.run
+        await async_engine.dispose()
+
+
+def run_migrations() -> bool:
+    """
+    Upgrade the database to the head revision in the current process.
+    The upgrade is skipped if the database is already at head,
+    which is the case on most restarts.
+    Returns whether the database was upgraded.
+    """
+    config: Final = AlembicConfig(ALEMBIC_INI)
+    heads: Final = set(ScriptDirectory.from_config(config).get_heads())
+    if asyncio.run(get_current_heads()) == heads:
+        return False
+    command.upgrade(config, "head")
+    return True
@@ -1,8 +1,30 @@
 from collections.abc import AsyncGenerator
+from typing import Any, Final
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from backend.config import Config
+from backend.metrics import (
+    on_after_cursor_execute,
+    on_before_cursor_execute,
+    on_handle_error,
+)
+
+SQLITE_PRAGMAS: Final[dict[str, str | int]] = {
+    # Readers don't block the writer and vice versa
+    "journal_mode": "WAL",
+    # Safe with WAL, fsync only on checkpoints
+    "synchronous": "NORMAL",
+    "busy_timeout": 15000,  # ms
+    "cache_size": -64000,  # KiB
+    "mmap_size": 256 * 1024 * 1024,  # bytes
+}
 
 
 def _get_async_url() -> str:
@@ -15,6 +37,12 @@ def _get_async_url() -> str:
         url = url.replace("mysql+pymysql:", "mysql+asyncmy:")
     elif url.startswith("mysql:"):
         url = url.replace("mysql:", "mysql+asyncmy:")
+    if url.startswith("postgresql+asyncpg:"):
+        parsed = make_url(url)
+        if "prepared_statement_cache_size" not in parsed.query:
+            url = parsed.update_query_dict(
+                {"prepared_statement_cache_size": str(Config.DB_STATEMENT_CACHE_SIZE)}
+            ).render_as_string(hide_password=False)
     return url
 
 
@@ -26,14 +54,44 @@ def _get_connect_args(
     return {}
 
 
+def _get_pool_args(url: str) -> dict[str, Any]:
+    """Pool of sqlite connections is managed by the dialect"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        connect_args=_get_connect_args(url),
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        echo=False,
+        **_get_pool_args(url),
+    )
+    if url.startswith("sqlite"):
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine.sync_engine, "before_cursor_execute", on_before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", on_after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", on_handle_error)
+    return engine
+
+
 async_url = _get_async_url()
-async_engine = create_async_engine(
-    async_url,
-    connect_args=_get_connect_args(async_url),
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    echo=False,
-)
+async_engine = create_engine(async_url)
 async_session_maker = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
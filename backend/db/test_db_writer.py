@@ -0,0 +1,88 @@
+import asyncio
+from functools import partial
+
+import pytest
+import pytest_asyncio
+from pytest_mock import MockerFixture
+
+from backend.db.db_writer import DbWriter
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def stop_writer():
+    yield
+    await DbWriter.stop()
+
+
+def _session_maker(mocker: MockerFixture):
+    sessions: list = []
+
+    def _make():
+        session = mocker.Mock()
+        session.commit = mocker.AsyncMock()
+        sessions.append(session)
+        cm = mocker.AsyncMock()
+        cm.__aenter__.return_value = session
+        return cm
+
+    mocker.patch("backend.db.db_writer.async_session_maker", side_effect=_make)
+    return sessions
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_batched(mocker: MockerFixture):
+    sessions = _session_maker(mocker)
+
+    async def _job(session, i: int):
+        await asyncio.sleep(0)
+        return i
+
+    results = await asyncio.gather(
+        *(DbWriter.submit(partial(_job, i=i)) for i in range(10))
+    )
+
+    assert results == list(range(10))
+    assert len(sessions) == 1
+    sessions[0].commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_does_not_drop_batch(mocker: MockerFixture):
+    sessions = _session_maker(mocker)
+
+    async def _ok(session):
+        return "ok"
+
+    async def _fail(session):
+        raise ValueError("bad row")
+
+    results = await asyncio.gather(
+        DbWriter.submit(_ok),
+        DbWriter.submit(_fail),
+        DbWriter.submit(_ok),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "ok"
+    # Batch attempt and then one session per job
+    assert len(sessions) == 4
+    assert sum(s.commit.await_count for s in sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_queued_jobs(mocker: MockerFixture):
+    _session_maker(mocker)
+    done: list[int] = []
+
+    async def _job(session):
+        await asyncio.sleep(0.01)
+        done.append(1)
+
+    pending = asyncio.ensure_future(DbWriter.submit(_job))
+    await asyncio.sleep(0)
+    await DbWriter.stop()
+
+    assert done == [1]
+    await pending
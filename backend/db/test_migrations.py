@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from pytest_mock import MockerFixture
+
+from backend.db import migrations
+from backend.db import session as session_module
+from backend.db.session import create_engine
+
+
+@pytest.fixture(autouse=True)
+def engine(mocker: MockerFixture, tmp_path: Path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    # env.py of alembic takes the engine from the session module
+    mocker.patch.object(session_module, "async_engine", engine)
+    mocker.patch.object(migrations, "async_engine", engine)
+    return engine
+
+
+def test_upgrade_is_skipped_at_head(mocker: MockerFixture):
+    upgrade = mocker.spy(migrations.command, "upgrade")
+    heads = ScriptDirectory.from_config(
+        AlembicConfig(migrations.ALEMBIC_INI)
+    ).get_heads()
+
+    assert asyncio.run(migrations.get_current_heads()) == set()
+    assert migrations.run_migrations() is True
+    assert asyncio.run(migrations.get_current_heads()) == set(heads)
+
+    assert migrations.run_migrations() is False
+    assert upgrade.call_count == 1
+
+
+def test_upgrade_keeps_loggers():
+    logger = logging.getLogger("test_migrations")
+
+    migrations.run_migrations()
+
+    assert not logger.disabled
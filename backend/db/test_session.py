@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+
+from backend.config import Config
+from backend.db import session as session_module
+from backend.db.session import _get_pool_args, create_engine
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_applied_on_connect(tmp_path: Path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 15000
+
+
+def test_pool_args_only_for_server_databases(mocker: MockerFixture):
+    mocker.patch.object(Config, "DB_POOL_SIZE", 20)
+    mocker.patch.object(Config, "DB_MAX_OVERFLOW", 5)
+
+    assert _get_pool_args("sqlite+aiosqlite:///test.db") == {}
+    assert _get_pool_args("postgresql+asyncpg://u:p@db/tug") == {
+        "pool_size": 20,
+        "max_overflow": 5,
+    }
+
+
+def test_asyncpg_statement_cache_size(mocker: MockerFixture):
+    mocker.patch.object(Config, "DB_STATEMENT_CACHE_SIZE", 0)
+
+    mocker.patch.object(Config, "DB_URL", "postgresql+psycopg2://u:p@db/tug")
+    assert (
+        session_module._get_async_url()
+        == "postgresql+asyncpg://u:p@db/tug?prepared_statement_cache_size=0"
+    )
+
+    # Explicit url parameter wins
+    mocker.patch.object(
+        Config,
+        "DB_URL",
+        "postgresql+asyncpg://u:p@db/tug?prepared_statement_cache_size=50",
+    )
+    assert session_module._get_async_url().endswith("prepared_statement_cache_size=50")
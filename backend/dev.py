@@ -1,27 +1,24 @@
 import os
-import subprocess
 
 import uvicorn
 from dotenv import load_dotenv
 
+from backend.db import migrations
+
 load_dotenv()
 log_level = os.getenv("LOG_LEVEL", "INFO").lower()
 
 
 def run_migrations():
     print("Running Alembic migrations...")
-    result = subprocess.run(
-        [
-            "alembic",
-            "-c",
-            os.path.join(os.path.dirname(__file__), "alembic.ini"),
-            "upgrade",
-            "head",
-        ]
-    )
-    if result.returncode != 0:
-        raise Exception("Alembic migrations failed. Exiting.")
-    print("Alembic migrations completed.")
+    try:
+        upgraded = migrations.run_migrations()
+    except Exception as e:
+        raise Exception("Alembic migrations failed. Exiting.") from e
+    if upgraded:
+        print("Alembic migrations completed.")
+    else:
+        print("Database is up to date.")
 
 
 if __name__ == "__main__":
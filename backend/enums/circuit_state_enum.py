@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class ECircuitState(StrEnum):
+    """Enum of circuit breaker states"""
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
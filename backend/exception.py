@@ -53,6 +53,13 @@ class TugAgentClientError(TugException):
         return res
 
 
+class TugAgentUnavailableError(TugAgentClientError):
+    """
+    Exception for requests rejected without reaching the agent,
+    as the agent is considered down (circuit breaker is open)
+    """
+
+
 class TugUrlValidationError(TugException):
     """Tugtainer exception for URL validation"""
 
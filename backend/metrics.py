@@ -0,0 +1,175 @@
+"""
+Metrics of the backend, exposed on /api/metrics in the Prometheus format.
+Updates are a dict lookup and a few additions, so they stay always on.
+"""
+
+import time
+from collections.abc import Collection, Iterator
+from types import SimpleNamespace
+from typing import Any, Final
+
+import aiohttp
+
+from backend.core.progress.progress_store import get_progress_store
+from shared.util.metrics import Counter, Gauge, Histogram, LabelValues
+
+AGENT_REQUEST_SECONDS: Final = Histogram(
+    "tugtainer_agent_request_seconds",
+    "Duration of the agent requests",
+    ["host", "endpoint"],
+)
+AGENT_REQUEST_ERRORS: Final = Counter(
+    "tugtainer_agent_request_errors_total",
+    "Failed agent requests by kind: timeout, connection, status, unavailable",
+    ["host", "endpoint", "kind"],
+)
+REGISTRY_REQUEST_SECONDS: Final = Histogram(
+    "tugtainer_registry_request_seconds",
+    "Duration of the registry requests until response headers",
+    ["registry", "request", "status"],
+)
+HOST_CHECK_SECONDS: Final = Histogram(
+    "tugtainer_host_check_seconds", "Duration of the check of the host", ["host"]
+)
+HOST_UPDATE_SECONDS: Final = Histogram(
+    "tugtainer_host_update_seconds", "Duration of the update of the host", ["host"]
+)
+CONTAINER_CHECK_SECONDS: Final = Histogram(
+    "tugtainer_container_check_seconds",
+    "Duration of the check of one container",
+    ["host"],
+)
+CONTAINER_UPDATE_SECONDS: Final = Histogram(
+    "tugtainer_container_update_seconds",
+    "Duration of the update or restart of one container",
+    ["host"],
+)
+# Gauges of the last run, a histogram per container would be too many series
+CONTAINER_LAST_CHECK_SECONDS: Final = Gauge(
+    "tugtainer_container_last_check_seconds",
+    "Duration of the last check of the container",
+    ["host", "container"],
+)
+CONTAINER_LAST_UPDATE_SECONDS: Final = Gauge(
+    "tugtainer_container_last_update_seconds",
+    "Duration of the last update or restart of the container",
+    ["host", "container"],
+)
+
+
+def forget_containers(host: str, keep: Collection[str] = ()) -> None:
+    """
+    Drop the series of the containers of the host, so removed or renamed
+    containers and deleted hosts don't stay on /api/metrics.
+    :param host: id of the host
+    :param keep: names of the existing containers
+    """
+    for gauge in (CONTAINER_LAST_CHECK_SECONDS, CONTAINER_LAST_UPDATE_SECONDS):
+        gauge.remove_where(lambda labels: labels[0] == host and labels[1] not in keep)
+
+
+DB_QUERY_SECONDS: Final = Histogram(
+    "tugtainer_db_query_seconds",
+    "Duration of the database statements",
+    ["statement"],
+)
+EVENT_LOOP_LAG_SECONDS: Final = Histogram(
+    "tugtainer_event_loop_lag_seconds",
+    "Delay of the scheduled callbacks of the event loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_SLOW_CALLBACKS: Final = Counter(
+    "tugtainer_event_loop_slow_callbacks_total",
+    "Blocks of the event loop longer than SLOW_CALLBACK_THRESHOLD_MS",
+)
+NOTIFICATION_DELIVERY_SECONDS: Final = Histogram(
+    "tugtainer_notification_delivery_seconds",
+    "Duration of the notification delivery",
+    ["scheme", "result"],
+)
+STARTUP_SECONDS: Final = Gauge(
+    "tugtainer_startup_seconds",
+    "Duration of the startup phases of the backend, total is the whole startup",
+    ["phase"],
+)
+
+
+def _progress_sizes() -> Iterator[tuple[LabelValues, float]]:
+    for kind, size in get_progress_store().sizes().items():
+        yield (kind,), size
+
+
+PROGRESS_CACHE_ENTRIES: Final = Gauge(
+    "tugtainer_progress_cache_entries",
+    "Number of the progress entries by kind",
+    ["kind"],
+    collect=_progress_sizes,
+)
+
+_STATEMENTS: Final = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+def on_before_cursor_execute(conn: Any, *args: Any) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def on_after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    started = conn.info["query_started"].pop()
+    kind = statement.lstrip()[:6].upper()
+    DB_QUERY_SECONDS.observe(
+        time.perf_counter() - started, kind if kind in _STATEMENTS else "OTHER"
+    )
+
+
+def on_handle_error(context: Any) -> None:
+    """Drop the start of the failed statement"""
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+async def _on_registry_request_start(
+    session: aiohttp.ClientSession,
+    ctx: SimpleNamespace,
+    params: aiohttp.TraceRequestStartParams,
+) -> None:
+    ctx.started = time.perf_counter()
+
+
+def _observe_registry_request(
+    ctx: SimpleNamespace, method: str, url: Any, status: str
+) -> None:
+    request = "manifest" if method == "HEAD" else "token"
+    REGISTRY_REQUEST_SECONDS.observe(
+        time.perf_counter() - ctx.started,
+        str(url.host_port_subcomponent),
+        request,
+        status,
+    )
+
+
+async def _on_registry_request_end(
+    session: aiohttp.ClientSession,
+    ctx: SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    _observe_registry_request(
+        ctx, params.method, params.url, str(params.response.status)
+    )
+
+
+async def _on_registry_request_exception(
+    session: aiohttp.ClientSession,
+    ctx: SimpleNamespace,
+    params: aiohttp.TraceRequestExceptionParams,
+) -> None:
+    _observe_registry_request(ctx, params.method, params.url, "error")
+
+
+def registry_trace_config() -> aiohttp.TraceConfig:
+    """Trace config of the registry sessions, observes every request"""
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_on_registry_request_start)
+    config.on_request_end.append(_on_registry_request_end)
+    config.on_request_exception.append(_on_registry_request_exception)
+    return config
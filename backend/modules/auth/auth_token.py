@@ -0,0 +1,50 @@
+import time
+from typing import Any, Final, cast
+
+from cachetools import TLRUCache
+from jose import jwt
+
+from backend.config import Config
+
+from .auth_schemas import TokenPayload
+
+type _TokenKey = tuple[str, str | bytes, str]
+
+
+def _token_ttu(key: _TokenKey, payload: TokenPayload, now: float) -> float:
+    """Cache payload until the token expires, tokens without exp are not cached"""
+    exp: Any = payload.get("exp")
+    return float(exp) if isinstance(exp, int | float) else now
+
+
+# Same cookies come with every request, some requests decode them twice
+_DECODED: Final[TLRUCache[_TokenKey, TokenPayload]] = TLRUCache(
+    maxsize=1024,
+    ttu=_token_ttu,
+    timer=time.time,
+)
+
+
+def decode_token(token: str) -> TokenPayload:
+    """
+    Verify token and return its payload.
+    Payloads of the valid tokens are cached until their expiration.
+    Raise JWTError if not valid.
+    """
+    key: Final = (token, Config.JWT_SECRET_KEY, Config.JWT_ALGORITHM)
+    payload = _DECODED.get(key)
+    if payload is None:
+        payload = cast(
+            TokenPayload,
+            jwt.decode(
+                token,
+                key=Config.JWT_SECRET_KEY,
+                algorithms=[Config.JWT_ALGORITHM],
+            ),
+        )
+        _DECODED[key] = payload
+    return payload
+
+
+def clear_decoded_tokens() -> None:
+    _DECODED.clear()
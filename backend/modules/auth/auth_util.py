@@ -1,11 +1,9 @@
-from typing import cast
-
 from fastapi import HTTPException, Request, status
-from jose import jwt
 
 from backend.config import Config
 from backend.modules.auth.auth_schemas import AuthProviderType, TokenPayload
 
+from .auth_token import decode_token
 from .providers.auth_oidc_provider import AuthOidcProvider
 from .providers.auth_password_provider import (
     AuthPasswordProvider,
@@ -22,14 +20,7 @@ AUTH_PROVIDERS: dict[AuthProviderType, AuthProvider] = {
 
 def _decode_token(token: str) -> TokenPayload | None:
     try:
-        return cast(
-            TokenPayload,
-            jwt.decode(
-                token,
-                key=Config.JWT_SECRET_KEY,
-                algorithms=[Config.JWT_ALGORITHM],
-            ),
-        )
+        return decode_token(token)
     except Exception:
         return None
 
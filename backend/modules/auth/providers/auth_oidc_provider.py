@@ -1,7 +1,12 @@
+import asyncio
 import logging
+import re
 import secrets
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any, Literal, cast
+from typing import Any, Final, Literal, cast
 from urllib.parse import urlencode
 
 import aiohttp
@@ -26,7 +31,58 @@ OIDC_ASYMMETRIC_SIGNING_ALGORITHMS = {
 }
 
 
+# Lifetime of the discovery document and JWKS
+# if the provider doesn't specify Cache-Control max-age
+OIDC_DEFAULT_CACHE_TTL: Final = 3600  # seconds
+OIDC_MAX_CACHE_TTL: Final = 24 * 3600  # seconds
+# Min interval between JWKS refreshes caused by an unknown key id
+OIDC_JWKS_REFRESH_INTERVAL: Final = 60  # seconds
+
+_MAX_AGE_RE: Final = re.compile(r"(?:^|,)\s*(?:s-)?max-age\s*=\s*\"?(\d+)")
+
+
+def get_cache_ttl(headers: Mapping[str, str]) -> float:
+    """
+    Get lifetime of the response from its Cache-Control header.
+    Returns 0 if the response must not be cached.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return OIDC_DEFAULT_CACHE_TTL
+    return min(int(match.group(1)), OIDC_MAX_CACHE_TTL)
+
+
+@dataclass
+class _CachedDocument:
+    url: str
+    data: dict[str, Any]
+    fetched_at: float
+    expires_at: float
+
+
 class AuthOidcProvider(AuthProvider):
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+        self._session_lock = asyncio.Lock()
+        self._discovery: _CachedDocument | None = None
+        self._jwks: _CachedDocument | None = None
+
+    async def close_session(self):
+        async with self._session_lock:
+            if self._session and not self._session.closed:
+                await self._session.close()
+            self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get existing session or create a new one."""
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(trust_env=True)
+            return self._session
+
     async def is_enabled(self) -> bool:
         return not Config.DISABLE_AUTH and Config.OIDC_ENABLED
 
@@ -228,17 +284,31 @@ class AuthOidcProvider(AuthProvider):
         }
 
     async def _fetch_oidc_discovery(self, well_known_url: str) -> dict[str, Any]:
-        """Fetch OIDC discovery document from well-known URL"""
+        """
+        Fetch OIDC discovery document from well-known URL.
+        The document is cached according to its Cache-Control.
+        """
+        cached = self._discovery
+        if (
+            cached
+            and cached.url == well_known_url
+            and time.monotonic() < cached.expires_at
+        ):
+            return cached.data
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(well_known_url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Failed to fetch OIDC discovery document: {response.status}",
-                        )
+            session = await self._get_session()
+            async with session.get(well_known_url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self._discovery = self._cache_document(
+                        well_known_url, data, response.headers
+                    )
+                    return data
+                else:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Failed to fetch OIDC discovery document: {response.status}",
+                    )
         except aiohttp.ClientError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -297,31 +367,31 @@ class AuthOidcProvider(AuthProvider):
             }
 
             # Exchange code for token
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(token_endpoint, data=data) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Token exchange failed: {error_text}",
-                        )
-
-                    token = await response.json()
-
-                id_token = token.get("id_token")
-                if not isinstance(id_token, str) or not id_token:
-                    raise ValueError("OIDC provider did not return an ID token")
-
-                id_token_claims = await self._verify_oidc_id_token(
-                    id_token,
-                    token.get("access_token"),
-                    discovery_doc,
-                    config["client_id"],
-                )
-                return {
-                    "access_token": token.get("access_token"),
-                    "id_token_claims": id_token_claims,
-                }
+            session = await self._get_session()
+            async with session.post(token_endpoint, data=data) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Token exchange failed: {error_text}",
+                    )
+
+                token = await response.json()
+
+            id_token = token.get("id_token")
+            if not isinstance(id_token, str) or not id_token:
+                raise ValueError("OIDC provider did not return an ID token")
+
+            id_token_claims = await self._verify_oidc_id_token(
+                id_token,
+                token.get("access_token"),
+                discovery_doc,
+                config["client_id"],
+            )
+            return {
+                "access_token": token.get("access_token"),
+                "id_token_claims": id_token_claims,
+            }
 
         except Exception as e:
             raise HTTPException(
@@ -361,19 +431,30 @@ class AuthOidcProvider(AuthProvider):
                 "ID token signing algorithm is not advertised by the OIDC provider"
             )
 
-        jwks = await self._fetch_oidc_jwks(jwks_uri)
-        keys = jwks.get("keys")
-        if not isinstance(keys, list):
-            raise ValueError("OIDC JWKS document does not contain a keys list")
-
-        matching_keys = [
-            key
-            for key in keys
-            if isinstance(key, dict)
-            and (key_id is None or key.get("kid") == key_id)
-            and key.get("use", "sig") == "sig"
-            and key.get("alg", algorithm) == algorithm
-        ]
+        def _matching_keys(jwks: dict[str, Any]) -> list[dict[str, Any]]:
+            keys = jwks.get("keys")
+            if not isinstance(keys, list):
+                raise ValueError("OIDC JWKS document does not contain a keys list")
+            return [
+                key
+                for key in keys
+                if isinstance(key, dict)
+                and (key_id is None or key.get("kid") == key_id)
+                and key.get("use", "sig") == "sig"
+                and key.get("alg", algorithm) == algorithm
+            ]
+
+        now = time.monotonic()
+        cached = self._jwks
+        if cached and (cached.url != jwks_uri or now >= cached.expires_at):
+            cached = None
+        matching_keys = _matching_keys(cached.data) if cached else []
+        # Unknown key id means the keys were rotated,
+        # refresh is rate limited as the key id comes from the token
+        if len(matching_keys) != 1 and (
+            cached is None or now - cached.fetched_at >= OIDC_JWKS_REFRESH_INTERVAL
+        ):
+            matching_keys = _matching_keys(await self._fetch_oidc_jwks(jwks_uri))
         if len(matching_keys) != 1:
             raise ValueError("Unable to resolve a unique OIDC signing key")
 
@@ -407,20 +488,36 @@ class AuthOidcProvider(AuthProvider):
     async def _fetch_oidc_jwks(self, jwks_uri: str) -> dict[str, Any]:
         """Fetch the OIDC provider's JSON Web Key Set."""
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(jwks_uri) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Failed to fetch OIDC JWKS: {response.status}",
-                    )
+            session = await self._get_session()
+            async with session.get(jwks_uri) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self._jwks = self._cache_document(jwks_uri, data, response.headers)
+                    return data
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Failed to fetch OIDC JWKS: {response.status}",
+                )
         except aiohttp.ClientError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error fetching OIDC JWKS: {str(e)}",
             ) from e
 
+    def _cache_document(
+        self,
+        url: str,
+        data: dict[str, Any],
+        headers: Mapping[str, str],
+    ) -> _CachedDocument:
+        fetched_at = time.monotonic()
+        return _CachedDocument(
+            url=url,
+            data=data,
+            fetched_at=fetched_at,
+            expires_at=fetched_at + get_cache_ttl(headers),
+        )
+
     def _create_oidc_user_session(
         self,
         user_data: dict[str, Any],
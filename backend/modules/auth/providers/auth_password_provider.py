@@ -1,6 +1,9 @@
+import asyncio
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import Literal, cast
+from typing import Final, Literal, cast
 
 import bcrypt
 from fastapi import HTTPException, Request, Response, status
@@ -11,8 +14,16 @@ from backend.config import Config
 from ..auth_schemas import PasswordSetRequestBody
 from .auth_provider import AuthProvider
 
+# bcrypt is slow by design, keep it off the event loop
+# and limit the number of hashes computed at once
+BCRYPT_EXECUTOR: Final = ThreadPoolExecutor(2, thread_name_prefix="bcrypt")
+
 
 class AuthPasswordProvider(AuthProvider):
+    def __init__(self):
+        # Version of the password file (path, inode, mtime, size) and its content
+        self._password_hash: tuple[tuple[str, int, int, int], str] | None = None
+
     async def is_enabled(self) -> bool:
         return not Config.DISABLE_AUTH and not Config.DISABLE_PASSWORD
 
@@ -33,7 +44,7 @@ class AuthPasswordProvider(AuthProvider):
                 detail="Password not set",
             )
 
-        if not self._verify_password(password, stored_password_hash):
+        if not await self._verify_password(password, stored_password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid password",
@@ -137,45 +148,63 @@ class AuthPasswordProvider(AuthProvider):
         Set new password if there is no password yet or if user authorized.
         """
 
-        def write_and_return() -> PlainTextResponse:
-            password_hash: str = self._get_password_hash(payload.password)
+        async def write_and_return() -> PlainTextResponse:
+            password_hash: str = await self._get_password_hash(payload.password)
             self._write_password_hash(password_hash)
             return PlainTextResponse(status_code=status.HTTP_201_CREATED)
 
         if not self._read_password_hash():
-            return write_and_return()
+            return await write_and_return()
 
         # Just verify authorization; will raise HTTPException if invalid
         await self.is_authorized(request)
-        return write_and_return()
+        return await write_and_return()
 
     def is_password_set(self) -> bool:
         """Check if a password is set"""
         password_hash: str | None = self._read_password_hash()
         return password_hash not in [None, ""]
 
-    def _verify_password(self, plain: str, hashed: str) -> bool:
+    async def _verify_password(self, plain: str, hashed: str) -> bool:
         """Compare plain text password with hashed password"""
         plain_bytes: bytes = plain.encode("utf-8")
         hashed_bytes: bytes = hashed.encode("utf-8")
-        return bcrypt.checkpw(plain_bytes, hashed_bytes)
+        return await asyncio.get_running_loop().run_in_executor(
+            BCRYPT_EXECUTOR, bcrypt.checkpw, plain_bytes, hashed_bytes
+        )
 
-    def _get_password_hash(self, password: str) -> str:
+    async def _get_password_hash(self, password: str) -> str:
         """Hash password"""
         pwd_bytes: bytes = password.encode("utf-8")
         salt: bytes = bcrypt.gensalt()
-        hashed_password: bytes = bcrypt.hashpw(password=pwd_bytes, salt=salt)
+        hashed_password: bytes = await asyncio.get_running_loop().run_in_executor(
+            BCRYPT_EXECUTOR, bcrypt.hashpw, pwd_bytes, salt
+        )
         return hashed_password.decode("utf-8")
 
     def _read_password_hash(self) -> str | None:
-        """Read password hash from file"""
-        if not os.path.isfile(Config.PASSWORD_FILE):
+        """
+        Read password hash from file.
+        The content is cached until the file is modified.
+        """
+        try:
+            st = os.stat(Config.PASSWORD_FILE)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
             return None
+        version = (Config.PASSWORD_FILE, st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._password_hash and self._password_hash[0] == version:
+            return self._password_hash[1]
         with open(Config.PASSWORD_FILE) as f:
-            return f.read()
+            content = f.read()
+        self._password_hash = (version, content)
+        return content
 
     def _write_password_hash(self, password_hash: str) -> None:
         """Write password hash to file"""
+        # mtime may not change if rewritten quickly
+        self._password_hash = None
         with open(Config.PASSWORD_FILE, "w") as f:
             f.write(password_hash)
             f.flush()
@@ -1,13 +1,14 @@
 import textwrap
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Any, Literal, cast
+from typing import Any, Literal
 
 from fastapi import HTTPException, Request, Response, status
 from jose import JWTError, jwt
 
 from backend.config import Config
 from backend.modules.auth.auth_schemas import TokenPayload
+from backend.modules.auth.auth_token import decode_token
 from backend.util.now import now
 
 
@@ -71,14 +72,7 @@ class AuthProvider(ABC):
         Raise 401 error if not valid.
         """
         try:
-            return cast(
-                TokenPayload,
-                jwt.decode(
-                    token,
-                    key=Config.JWT_SECRET_KEY,
-                    algorithms=[Config.JWT_ALGORITHM],
-                ),
-            )
+            return decode_token(token)
         except JWTError as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
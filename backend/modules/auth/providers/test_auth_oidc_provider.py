@@ -1,6 +1,6 @@
 import base64
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import rsa
@@ -8,7 +8,12 @@ from fastapi import HTTPException, status
 from jose import JWTError, jwt
 
 from backend.config import Config
-from backend.modules.auth.providers.auth_oidc_provider import AuthOidcProvider
+from backend.modules.auth.providers.auth_oidc_provider import (
+    OIDC_DEFAULT_CACHE_TTL,
+    OIDC_MAX_CACHE_TTL,
+    AuthOidcProvider,
+    get_cache_ttl,
+)
 
 
 def _base64url_uint(value: int) -> str:
@@ -42,7 +47,22 @@ def _jwk(signing_key, kid: str = "signing-key") -> dict[str, str]:
     }
 
 
-def _id_token(signing_key, **claim_overrides) -> str:
+def _session(*documents: dict, headers: dict[str, str] | None = None) -> MagicMock:
+    """Fake aiohttp session answering GET requests with the documents in order"""
+    responses = []
+    for doc in documents:
+        response = MagicMock(status=200, headers=headers or {})
+        response.json = AsyncMock(return_value=doc)
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=response)
+        cm.__aexit__ = AsyncMock(return_value=None)
+        responses.append(cm)
+    session = MagicMock()
+    session.get = MagicMock(side_effect=responses)
+    return session
+
+
+def _id_token(signing_key, kid: str = "signing-key", **claim_overrides) -> str:
     _, private_key = signing_key
     now = datetime.now(UTC)
     claims = {
@@ -58,7 +78,7 @@ def _id_token(signing_key, **claim_overrides) -> str:
         claims,
         private_key.save_pkcs1(),
         algorithm="RS256",
-        headers={"kid": "signing-key"},
+        headers={"kid": kid},
     )
 
 
@@ -138,3 +158,88 @@ def test_oidc_identity_allowlist_rejects_unlisted_identity(monkeypatch):
         )
 
     assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.parametrize(
+    "cache_control, expected",
+    [
+        ("", OIDC_DEFAULT_CACHE_TTL),
+        ("public, max-age=600", 600),
+        ("s-maxage=10, max-age=600", 600),
+        ("max-age=9999999", OIDC_MAX_CACHE_TTL),
+        ("no-store", 0),
+        ("no-cache, max-age=600", 0),
+    ],
+)
+def test_get_cache_ttl(cache_control, expected):
+    assert get_cache_ttl({"Cache-Control": cache_control}) == expected
+
+
+@pytest.mark.asyncio
+async def test_fetch_oidc_discovery_cached(discovery_doc):
+    provider = AuthOidcProvider()
+    session = _session(discovery_doc, {**discovery_doc, "issuer": "changed"})
+    provider._get_session = AsyncMock(return_value=session)
+    url = "https://idp.example.com/.well-known/openid-configuration"
+
+    assert await provider._fetch_oidc_discovery(url) == discovery_doc
+    assert await provider._fetch_oidc_discovery(url) == discovery_doc
+    assert session.get.call_count == 1
+
+    # Another url (configuration changed)
+    assert (await provider._fetch_oidc_discovery(url + "?v=2"))["issuer"] == "changed"
+
+
+@pytest.mark.asyncio
+async def test_fetch_oidc_discovery_not_cached_if_no_store(discovery_doc):
+    provider = AuthOidcProvider()
+    session = _session(
+        discovery_doc, discovery_doc, headers={"Cache-Control": "no-store"}
+    )
+    provider._get_session = AsyncMock(return_value=session)
+    url = "https://idp.example.com/.well-known/openid-configuration"
+
+    await provider._fetch_oidc_discovery(url)
+    await provider._fetch_oidc_discovery(url)
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_jwks_refreshed_on_unknown_kid(signing_key, discovery_doc):
+    rotated_key = rsa.newkeys(1024)
+    provider = AuthOidcProvider()
+    session = _session(
+        {"keys": [_jwk(signing_key)]},
+        {"keys": [_jwk(signing_key), _jwk(rotated_key, "rotated-key")]},
+    )
+    provider._get_session = AsyncMock(return_value=session)
+
+    for _ in range(2):
+        await provider._verify_oidc_id_token(
+            _id_token(signing_key), None, discovery_doc, "tugtainer"
+        )
+    assert session.get.call_count == 1
+
+    # Refreshed once the token is signed with a new key
+    provider._jwks.fetched_at -= 60
+    claims = await provider._verify_oidc_id_token(
+        _id_token(rotated_key, "rotated-key"), None, discovery_doc, "tugtainer"
+    )
+    assert claims["sub"] == "user-123"
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_jwks_refresh_rate_limited(signing_key, discovery_doc):
+    provider = AuthOidcProvider()
+    session = _session({"keys": [_jwk(signing_key)]})
+    provider._get_session = AsyncMock(return_value=session)
+
+    await provider._verify_oidc_id_token(
+        _id_token(signing_key), None, discovery_doc, "tugtainer"
+    )
+    with pytest.raises(ValueError, match="signing key"):
+        await provider._verify_oidc_id_token(
+            _id_token(signing_key, "unknown-key"), None, discovery_doc, "tugtainer"
+        )
+    assert session.get.call_count == 1
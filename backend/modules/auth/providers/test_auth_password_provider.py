@@ -0,0 +1,83 @@
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import bcrypt
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.config import Config
+from backend.modules.auth.providers.auth_password_provider import (
+    AuthPasswordProvider,
+)
+
+
+@pytest.fixture
+def password_file(tmp_path: Path, mocker: MockerFixture) -> Path:
+    path = tmp_path / "password_hash"
+    mocker.patch.object(Config, "PASSWORD_FILE", str(path))
+    return path
+
+
+def test_read_password_hash_cached_until_modified(password_file: Path):
+    provider = AuthPasswordProvider()
+    assert provider._read_password_hash() is None
+    assert not provider.is_password_set()
+
+    password_file.write_text("hash1")
+    assert provider._read_password_hash() == "hash1"
+    assert provider.is_password_set()
+
+    password_file.write_text("hash22")
+    assert provider._read_password_hash() == "hash22"
+
+    # Unchanged size and mtime, the file is not read again
+    st = password_file.stat()
+    password_file.write_text("hash33")
+    os.utime(password_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert provider._read_password_hash() == "hash22"
+
+    # Own writes always drop the cache
+    provider._write_password_hash("hash44")
+    os.utime(password_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert provider._read_password_hash() == "hash44"
+
+    password_file.unlink()
+    assert provider._read_password_hash() is None
+
+
+@pytest.mark.asyncio
+async def test_bcrypt_runs_off_event_loop(mocker: MockerFixture):
+    threads: list[threading.Thread] = []
+
+    def _checkpw(password: bytes, hashed: bytes) -> bool:
+        threads.append(threading.current_thread())
+        return True
+
+    mocker.patch("bcrypt.checkpw", side_effect=_checkpw)
+    provider = AuthPasswordProvider()
+
+    assert await provider._verify_password("secret", "hash")
+    assert threads and threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_verify_password_does_not_block_other_requests():
+    provider = AuthPasswordProvider()
+    hashed = bcrypt.hashpw(b"secret", bcrypt.gensalt(12)).decode()
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker = asyncio.create_task(_ticker())
+    try:
+        assert await provider._verify_password("secret", hashed)
+        assert not await provider._verify_password("wrong", hashed)
+    finally:
+        ticker.cancel()
+    assert ticks > 0
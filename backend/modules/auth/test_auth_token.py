@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from jose import JWTError, jwt
+from pytest_mock import MockerFixture
+
+from backend.config import Config
+from backend.modules.auth.auth_token import clear_decoded_tokens, decode_token
+
+
+@pytest.fixture(autouse=True)
+def clear_tokens():
+    clear_decoded_tokens()
+    yield
+    clear_decoded_tokens()
+
+
+def _token(exp: float | None) -> str:
+    claims: dict = {"type": "access", "auth_provider": "password"}
+    if exp is not None:
+        claims["exp"] = int(exp)
+    return jwt.encode(claims, key=Config.JWT_SECRET_KEY, algorithm=Config.JWT_ALGORITHM)
+
+
+def test_decode_token_cached(mocker: MockerFixture):
+    decode = mocker.spy(jwt, "decode")
+    token = _token(time.time() + 60)
+
+    assert decode_token(token)["type"] == "access"
+    assert decode_token(token)["type"] == "access"
+    assert decode.call_count == 1
+
+    # Secret rotation makes cached payloads unusable
+    mocker.patch.object(Config, "JWT_SECRET_KEY", "other")
+    with pytest.raises(JWTError):
+        decode_token(token)
+
+
+def test_decode_token_not_cached_after_exp(mocker: MockerFixture):
+    decode = mocker.patch(
+        "jose.jwt.decode",
+        side_effect=[
+            {"type": "access", "exp": time.time() - 1},
+            JWTError("Signature has expired."),
+        ],
+    )
+
+    decode_token("token")
+    with pytest.raises(JWTError):
+        decode_token("token")
+    assert decode.call_count == 2
+
+
+def test_decode_token_without_exp_not_cached(mocker: MockerFixture):
+    decode = mocker.spy(jwt, "decode")
+    token = _token(None)
+
+    decode_token(token)
+    decode_token(token)
+    assert decode.call_count == 2
+
+
+def test_invalid_token_not_cached():
+    with pytest.raises(JWTError):
+        decode_token("invalid")
+    with pytest.raises(JWTError):
+        decode_token("invalid")
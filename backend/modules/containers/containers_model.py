@@ -6,6 +6,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     text,
@@ -23,6 +24,15 @@ class ContainersModel(BaseModel):
     """Model of docker container"""
 
     __tablename__ = "containers"
+    __table_args__ = (
+        # Containers are always looked up by name within the host
+        Index(
+            "ix_containers_host_id_name",
+            "host_id",
+            "name",
+            unique=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, nullable=False
@@ -31,7 +41,7 @@ class ContainersModel(BaseModel):
         Integer, ForeignKey("hosts.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(
-        String, index=True, nullable=False
+        String, nullable=False
     )
     check_enabled: Mapped[bool] = mapped_column(
         Boolean,
@@ -1,9 +1,13 @@
 import asyncio
+import json
 import logging
-from collections.abc import Awaitable, Callable
-from typing import Any, Literal, cast
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any, Final, Literal, cast
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from python_on_whales.components.container.models import (
     ContainerInspectResult,
 )
@@ -22,7 +26,9 @@ from backend.core.check_actions.check_one_container import (
     check_one_container,
 )
 from backend.core.container_util.is_protected_container import is_protected_container
+from backend.core.host_inventory import HostInventory
 from backend.core.progress.progress_cache import ProgressCache
+from backend.core.progress.progress_pubsub import ProgressPubSub
 from backend.core.progress.progress_schemas import (
     AllActionProgress,
     ContainerActionProgress,
@@ -34,6 +40,7 @@ from backend.core.progress.progress_util import (
     get_container_cache_key,
     get_host_cache_key,
     get_plan_cache_key,
+    is_finished_cache,
 )
 from backend.core.update_actions.update_actions_executor import (
     execute_update_plan,
@@ -48,11 +55,12 @@ from backend.core.update_actions.update_host_containers import (
     update_host_containers,
 )
 from backend.db.session import get_async_session
+from backend.enums.action_status_enum import EActionStatus
 from backend.modules.auth.auth_util import is_authorized
 from backend.modules.hosts.hosts_model import HostsModel
 from backend.modules.hosts.hosts_util import get_host
+from backend.modules.public.public_summary import FleetSummary
 from shared.schemas.container_schemas import (
-    GetContainerListBodySchema,
     GetContainerLogsRequestBody,
 )
 
@@ -67,6 +75,9 @@ from .containers_util import (
     insert_or_update_container,
 )
 
+PROGRESS_KEEPALIVE_INTERVAL: Final = 15  # seconds
+_CONTAINERS_LIST_ADAPTER: Final = TypeAdapter(list[ContainersListItem])
+
 containers_router = APIRouter(
     prefix="/containers",
     tags=["containers"],
@@ -97,24 +108,75 @@ def _raise_for_protected_container(container: ContainerInspectResult):
 async def containers_list(
     host_id: int,
     session: AsyncSession = Depends(get_async_session),
-) -> list[ContainersListItem]:
-    host = await get_host(host_id, session)
+) -> Response:
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
-    containers = await client.container.list(GetContainerListBodySchema(all=True))
+    containers = await HostInventory.get_containers(host, client)
     result = await session.execute(
         select(ContainersModel).where(ContainersModel.host_id == host_id)
     )
-    containers_db = result.scalars().all()
-    _list: list[ContainersListItem] = []
-    for c in containers:
-        _db_item = next(
-            (item for item in containers_db if item.name == c.name),
-            None,
+    containers_db_map = {item.name: item for item in result.scalars().all()}
+    _list = [
+        ContainersListItem.from_sources(
+            host_id, c, containers_db_map.get(cast(str, c.name))
         )
-        _item = ContainersListItem.from_sources(host_id, c, _db_item)
-        _list.append(_item)
-    return _list
+        for c in containers
+    ]
+    # Serialize directly, otherwise FastAPI would dump and validate items again
+    return Response(
+        _CONTAINERS_LIST_ADAPTER.dump_json(_list),
+        media_type="application/json",
+    )
+
+
+def _format_sse(event: str, data: Any) -> str:
+    """Format server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def _progress_events(request: Request, cache_id: str) -> AsyncGenerator[str]:
+    """
+    Yield current progress and then its changes until the action ends.
+    Events are 'set' (replace progress), 'update' (merge into progress)
+    and 'item' (intermediate result e.g. of a single container).
+    """
+    with ProgressPubSub.subscribe(cache_id) as queue:
+        state = ProgressCache[Any](cache_id).get()
+        yield _format_sse("set", state)
+        if is_finished_cache(state):
+            return
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), PROGRESS_KEEPALIVE_INTERVAL
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _format_sse(event.type, event.data)
+            if event.type != "item" and event.data.get("status") in [
+                EActionStatus.DONE,
+                EActionStatus.ERROR,
+            ]:
+                return
+
+
+# Declared before /{host_id}/{container_name_or_id} which would match it otherwise
+@containers_router.get(
+    path="/progress/stream",
+    description="Stream progress of check/update as server-sent events",
+    response_class=StreamingResponse,
+)
+async def progress_stream(request: Request, cache_id: str) -> StreamingResponse:
+    return StreamingResponse(
+        _progress_events(request, cache_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @containers_router.get(
@@ -127,7 +189,7 @@ async def get_container(
     container_name_or_id: str,
     session: AsyncSession = Depends(get_async_session),
 ) -> ContainerGetResponseBody:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
     inspect = await client.container.inspect(container_name_or_id)
@@ -175,7 +237,8 @@ async def patch_container_data(
             **cast(ContainerInsertOrUpdateData, body.model_dump(exclude_unset=True))
         ),
     )
-    host = await get_host(host_id, session)
+    FleetSummary.invalidate()
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
     d_cont = await client.container.inspect(db_cont.name)
@@ -206,9 +269,8 @@ async def check_all():
 )
 async def check_host(
     host_id: int,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
     asyncio.create_task(
@@ -224,9 +286,8 @@ async def check_host(
 async def check_container(
     host_id: int,
     c_name: str,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
     container = await client.container.inspect(c_name)
@@ -252,9 +313,8 @@ async def update_all():
 )
 async def update_host(
     host_id: int,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
     client = AgentClientManager.get_host_client(host)
     asyncio.create_task(
@@ -270,9 +330,8 @@ async def update_host(
 async def update_container(
     host_id: int,
     c_name: str,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
 
     client = AgentClientManager.get_host_client(host)
@@ -281,7 +340,7 @@ async def update_container(
         raise HTTPException(404, "Container not found")
 
     container = await client.container.inspect(c_name)
-    containers = await client.container.list(GetContainerListBodySchema(all=True))
+    containers = await HostInventory.get_containers(host, client)
 
     plan = await build_update_plan(
         host,
@@ -303,15 +362,16 @@ async def update_container(
 
 @containers_router.get(
     path="/progress",
-    description="Get progress of general check",
+    description="Get progress of general check. With wait > 0 responds on the next progress change or after wait seconds (long polling).",
     response_model=AllActionProgress
     | HostActionProgress
     | UpdatePlanProgress
     | ContainerActionProgress
     | None,
 )
-def progress(
+async def progress(
     cache_id: str,
+    wait: float = Query(0, ge=0, le=60),
 ) -> (
     AllActionProgress
     | HostActionProgress
@@ -320,6 +380,15 @@ def progress(
     | None
 ):
     CACHE = ProgressCache[Any](cache_id)
+    if not wait:
+        return CACHE.get()
+    with ProgressPubSub.subscribe(cache_id) as queue:
+        if is_finished_cache(CACHE.get()):
+            return CACHE.get()
+        try:
+            await asyncio.wait_for(queue.get(), wait)
+        except TimeoutError:
+            pass
     return CACHE.get()
 
 
@@ -332,9 +401,8 @@ async def logs(
     host_id: int,
     container_name_or_id: str,
     body: GetContainerLogsRequestBody,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
 
     client = AgentClientManager.get_host_client(host)
@@ -360,7 +428,7 @@ async def control_container(
     container_name_or_id: str,
     session: AsyncSession = Depends(get_async_session),
 ):
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     _raise_for_host_status(host)
 
     client = AgentClientManager.get_host_client(host)
@@ -371,6 +439,8 @@ async def control_container(
     if not asyncio.iscoroutinefunction(_command):
         raise HTTPException(status.HTTP_403_FORBIDDEN, "Command not allowed")
     await _command(container_name_or_id)
+    HostInventory.invalidate(host.id)
+    FleetSummary.invalidate()
 
     inspect = await client.container.inspect(container_name_or_id)
     stmt = (
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field, field_validator
 from python_on_whales.components.container.models import (
@@ -69,7 +69,11 @@ class ContainersListItem(BaseModel):
         docker_cont: "ContainerInspectResult",
         db_cont: "ContainersModel | None",
     ) -> "ContainersListItem":
-        data = {
+        """
+        Build item from already validated docker and db data.
+        Constructed without validation, as it's the hot path of the list views.
+        """
+        data: dict[str, Any] = {
             "host_id": host_id,
             "name": docker_cont.name or "",
             "container_id": docker_cont.id or "",
@@ -98,7 +102,7 @@ class ContainersListItem(BaseModel):
                     "hooks": ContainerHooks.model_validate(db_cont.hooks or {}),
                 }
             )
-        return cls.model_validate(data)
+        return cls.model_construct(**data)
 
 
 class ContainerGetResponseBody(BaseModel):
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import TypedDict
 
 from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .containers_model import ContainersModel
@@ -32,12 +33,13 @@ class ContainerInsertOrUpdateData(TypedDict, total=False):
     hooks: dict[str, list[str]]
 
 
-async def insert_or_update_container(
+async def upsert_container(
     session: AsyncSession,
     host_id: int,
     c_name: str,
     c_data: ContainerInsertOrUpdateData,
 ) -> ContainersModel:
+    """Insert or update container in the session without commit"""
     stmt = (
         select(ContainersModel)
         .where(
@@ -54,12 +56,26 @@ async def insert_or_update_container(
         for key, value in c_data.items():
             if hasattr(container, key) and getattr(container, key) != value:
                 setattr(container, key, value)
-        await session.commit()
-        await session.refresh(container)
         return container
     else:
         new_container = ContainersModel(**c_data, host_id=host_id, name=c_name)
         session.add(new_container)
-        await session.commit()
-        await session.refresh(new_container)
         return new_container
+
+
+async def insert_or_update_container(
+    session: AsyncSession,
+    host_id: int,
+    c_name: str,
+    c_data: ContainerInsertOrUpdateData,
+) -> ContainersModel:
+    container = await upsert_container(session, host_id, c_name, c_data)
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Inserted concurrently (unique host_id + name), update it instead
+        await session.rollback()
+        container = await upsert_container(session, host_id, c_name, c_data)
+        await session.commit()
+    await session.refresh(container)
+    return container
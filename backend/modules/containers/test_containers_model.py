@@ -0,0 +1,110 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Select, create_engine, inspect, select, text
+from sqlalchemy.engine import Connection
+
+from backend.db.base_model import BaseModel
+from backend.modules.containers.containers_model import ContainersModel
+from backend.modules.hosts.hosts_model import HostsModel  # noqa: F401
+
+INDEX_NAME = "ix_containers_host_id_name"
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+# Statements of the hot paths, lookups are always scoped by host
+HOT_QUERIES: list[Select] = [
+    select(ContainersModel)
+    .where(ContainersModel.host_id == 1, ContainersModel.name == "nginx")
+    .limit(1),
+    select(ContainersModel).where(ContainersModel.host_id == 1),
+    select(ContainersModel).where(
+        ContainersModel.host_id == 1,
+        ContainersModel.name.in_(["nginx", "redis"]),
+    ),
+]
+
+
+def _sqlite_conn() -> Connection:
+    engine = create_engine("sqlite://")
+    conn = engine.connect()
+    BaseModel.metadata.create_all(conn)
+    return conn
+
+
+def _plan(conn: Connection, query: Select) -> str:
+    compiled = query.compile(conn, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    rows = conn.execute(text(f"{prefix} {compiled}")).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES)
+def test_hot_queries_use_index_sqlite(query: Select):
+    with _sqlite_conn() as conn:
+        assert INDEX_NAME in _plan(conn, query)
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+@pytest.mark.parametrize("query", HOT_QUERIES)
+def test_hot_queries_use_index_postgres(query: Select):
+    engine = create_engine(str(POSTGRES_URL))
+    with engine.connect() as conn:
+        BaseModel.metadata.create_all(conn)
+        # Planner prefers sequential scan of tiny tables
+        conn.execute(text("SET enable_seqscan = off"))
+        try:
+            assert INDEX_NAME in _plan(conn, query)
+        finally:
+            conn.rollback()
+
+
+def test_unique_host_id_name():
+    with _sqlite_conn() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO containers (host_id, name) VALUES (1, 'nginx'), (2, 'nginx')"
+            )
+        )
+        with pytest.raises(Exception, match="UNIQUE"):
+            conn.execute(
+                text("INSERT INTO containers (host_id, name) VALUES (1, 'nginx')")
+            )
+
+
+def test_migration_deduplicates_containers():
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    path = next(
+        Path(__file__)
+        .parents[2]
+        .joinpath("alembic", "versions")
+        .glob("*_containers_host_name_unique.py")
+    )
+    spec = importlib.util.spec_from_file_location("migration", path)
+    assert spec and spec.loader
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with _sqlite_conn() as conn:
+        # Schema before the migration
+        conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+        conn.execute(text("CREATE INDEX ix_containers_name ON containers (name)"))
+        conn.execute(
+            text(
+                "INSERT INTO containers (host_id, name, check_enabled) VALUES "
+                "(1, 'nginx', TRUE), (1, 'nginx', FALSE), (2, 'nginx', FALSE)"
+            )
+        )
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+
+        rows = conn.execute(
+            text("SELECT id, host_id, check_enabled FROM containers ORDER BY id")
+        ).all()
+        indexes = {i["name"] for i in inspect(conn).get_indexes("containers")}
+
+    assert [tuple(r) for r in rows] == [(1, 1, 1), (3, 2, 0)]
+    assert indexes == {INDEX_NAME}
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -13,11 +14,14 @@ from backend.core.agent_client import (
     AgentClient,
     AgentClientContainer,
 )
+from backend.core.progress.progress_cache import ProgressCache
 from backend.db.session import get_async_session
+from backend.enums.action_status_enum import EActionStatus
 from backend.modules.auth.auth_util import is_authorized
 from backend.modules.containers.containers_model import (
     ContainersModel,
 )
+from backend.modules.containers.containers_router import _progress_events
 from backend.modules.containers.containers_schemas import (
     ContainerHooks,
     ContainersListItem,
@@ -98,6 +102,54 @@ async def test_get_container(mocker: MockerFixture):
     assert res["item"]["image"] == "test:latest"
 
 
+@pytest.mark.asyncio
+async def test_containers_list_merges_db_data(mocker: MockerFixture):
+    mocker.patch(
+        f"{base_module}.get_host",
+        mocker.AsyncMock(return_value=mocker.Mock(enabled=True)),
+    )
+    mocker.patch(f"{base_module}.AgentClientManager.get_host_client")
+    mocker.patch(
+        f"{base_module}.HostInventory.get_containers",
+        mocker.AsyncMock(
+            return_value=[
+                ContainerInspectResult(id="id-1", name="one"),
+                ContainerInspectResult(id="id-2", name="two"),
+            ]
+        ),
+    )
+
+    db_item = ContainersModel(
+        id=5,
+        host_id=1,
+        name="two",
+        check_enabled=True,
+        update_enabled=False,
+        hooks=None,
+    )
+    mock_result = mocker.Mock()
+    mock_result.scalars.return_value.all.return_value = [db_item]
+    async_session_mock = AsyncMock(spec=AsyncSession)
+    async_session_mock.execute.return_value = mock_result
+
+    async def override_get_async_session():
+        return async_session_mock
+
+    app.dependency_overrides[get_async_session] = override_get_async_session
+
+    response = client.get("/containers/1/list")
+
+    assert response.status_code == 200
+    one, two = response.json()
+    assert one["name"] == "one"
+    assert one["container_id"] == "id-1"
+    assert one["id"] is None
+    assert two["name"] == "two"
+    assert two["id"] == 5
+    assert two["check_enabled"] is True
+    assert two["hooks"] == ContainerHooks().model_dump()
+
+
 @pytest.mark.asyncio
 async def test_hooks_enabled_reflects_config(mocker: MockerFixture):
     mocker.patch(f"{base_module}.Config.ALLOW_HOOKS", True)
@@ -182,3 +234,54 @@ async def test_patch_container_hooks_allowed_when_enabled(
 
     assert response.status_code == 200
     assert response.json()["hooks"]["pre_update"] == ["echo hi"]
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_sends_changes_until_done(mocker: MockerFixture):
+    cache_id = "host:test_progress_stream"
+    cache = ProgressCache[dict](cache_id)
+    cache.set({"status": EActionStatus.CHECKING})
+    request = mocker.Mock()
+    request.is_disconnected = mocker.AsyncMock(return_value=False)
+
+    async def _run_action():
+        await asyncio.sleep(0.01)
+        cache.publish_item({"name": "container"})
+        cache.update({"status": EActionStatus.DONE})
+
+    task = asyncio.create_task(_run_action())
+    events = [e async for e in _progress_events(request, cache_id)]
+    await task
+
+    assert events == [
+        'event: set\ndata: {"status": "CHECKING"}\n\n',
+        'event: item\ndata: {"name": "container"}\n\n',
+        'event: update\ndata: {"status": "DONE"}\n\n',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_progress_stream_ends_for_finished_action():
+    ProgressCache[dict]("host:test_progress_stream_done", {"status": EActionStatus.DONE})
+
+    response = client.get(
+        "/containers/progress/stream",
+        params={"cache_id": "host:test_progress_stream_done"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == 'event: set\ndata: {"status": "DONE"}\n\n'
+
+
+@pytest.mark.asyncio
+async def test_progress_long_poll_returns_finished_action_immediately():
+    ProgressCache[dict]("host:test_progress_long_poll", {"status": EActionStatus.ERROR})
+
+    response = client.get(
+        "/containers/progress",
+        params={"cache_id": "host:test_progress_long_poll", "wait": 30},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ERROR"}
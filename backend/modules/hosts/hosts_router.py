@@ -1,16 +1,26 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.agent_client import AgentClientManager
+from backend.core.host_health import HostHealthMonitor
+from backend.core.host_inventory import HostInventory
+from backend.core.host_registry import HostRegistry
+from backend.core.update_actions.update_actions_graph import (
+    invalidate_dependency_graph,
+)
 from backend.db.session import get_async_session
-from backend.exception import TugAgentClientError
+from backend.metrics import forget_containers
 from backend.modules.auth.auth_util import is_authorized
 from backend.modules.hosts.hosts_util import (
     annotate_available_updates_count,
+    get_db_host,
     get_host,
     validate_agent_url_against_ssrf,
 )
+from backend.modules.public.public_summary import FleetSummary
 
 from .hosts_model import HostsModel
 from .hosts_schemas import (
@@ -35,14 +45,25 @@ hosts_router = APIRouter(
 async def get_list(
     session: AsyncSession = Depends(get_async_session),
 ):
-    stmt = select(HostsModel)
-    result = await session.execute(stmt)
-    hosts = list(result.scalars().all())
+    hosts = await HostRegistry.get_all()
     hosts_dto: list[HostInfo] = [HostInfo.model_validate(h) for h in hosts]
     await annotate_available_updates_count(hosts_dto, session)
     return hosts_dto
 
 
+@hosts_router.get(
+    "/status",
+    response_model=list[HostStatusResponseBody],
+    description="Get status of all hosts",
+)
+async def get_status_all(
+    response: Response,
+) -> list[HostStatusResponseBody]:
+    _set_no_cache_headers(response)
+    hosts = await HostRegistry.get_all()
+    return list(await asyncio.gather(*(_get_host_status(h) for h in hosts)))
+
+
 @hosts_router.post(
     path="",
     response_model=HostInfo,
@@ -64,8 +85,10 @@ async def create(
     session.add(new_host)
     await session.commit()
     await session.refresh(new_host)
+    HostRegistry.invalidate()
     if new_host.enabled:
         await AgentClientManager.set_client(new_host)
+    FleetSummary.invalidate()
     host_dto = HostInfo.model_validate(new_host)
     await annotate_available_updates_count([host_dto], session)
     return host_dto
@@ -80,7 +103,7 @@ async def read(
     id: int,
     session: AsyncSession = Depends(get_async_session),
 ):
-    host = await get_host(id, session)
+    host = await get_host(id)
     host_dto = HostInfo.model_validate(host)
     await annotate_available_updates_count([host_dto], session)
     return host_dto
@@ -97,7 +120,7 @@ async def update(
     session: AsyncSession = Depends(get_async_session),
 ):
     await validate_agent_url_against_ssrf(body.url)
-    host = await get_host(id, session)
+    host = await get_db_host(id, session)
     changes = body.model_dump(
         exclude={"is_changing_secret", "secret"},
         exclude_unset=True,
@@ -109,7 +132,12 @@ async def update(
             setattr(host, key, value)
     await session.commit()
     await session.refresh(host)
+    HostRegistry.invalidate()
     await AgentClientManager.remove_client(host.id)
+    HostInventory.invalidate(host.id)
+    invalidate_dependency_graph(host.id)
+    HostHealthMonitor.forget(host.id)
+    FleetSummary.invalidate()
     if host.enabled:
         await AgentClientManager.set_client(host)
     host_dto = HostInfo.model_validate(host)
@@ -122,13 +150,40 @@ async def delete(
     id: int,
     session: AsyncSession = Depends(get_async_session),
 ):
-    host = await get_host(id, session)
+    host = await get_db_host(id, session)
     await AgentClientManager.remove_client(host.id)
+    HostInventory.invalidate(host.id)
+    invalidate_dependency_graph(host.id)
+    HostHealthMonitor.forget(host.id)
+    forget_containers(str(host.id))
+    FleetSummary.invalidate()
     await session.delete(host)
     await session.commit()
+    HostRegistry.invalidate()
     return {"detail": "Host deleted successfully"}
 
 
+def _set_no_cache_headers(response: Response):
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    response.headers["Pragma"] = "no-cache"
+    response.headers["Expires"] = "0"
+
+
+async def _get_host_status(host: HostsModel) -> HostStatusResponseBody:
+    """Get status from the last probe, probe now if there is none yet"""
+    if not host.enabled:
+        return HostStatusResponseBody(id=host.id)
+    health = HostHealthMonitor.get(host.id) or await HostHealthMonitor.probe(host)
+    return HostStatusResponseBody(
+        id=host.id,
+        ok=health.ok,
+        err=health.err,
+        latency=health.latency,
+        checked_at=health.checked_at,
+        last_ok_at=health.last_ok_at,
+    )
+
+
 @hosts_router.get(
     path="/{id}/status",
     description="Get host status",
@@ -137,30 +192,7 @@ async def delete(
 async def get_status(
     id: int,
     response: Response,
-    session: AsyncSession = Depends(get_async_session),
 ) -> HostStatusResponseBody:
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    host = await get_host(id, session)
-    if not host.enabled:
-        return HostStatusResponseBody(id=id)
-    client = AgentClientManager.get_host_client(host)
-    try:
-        _ = await client.public.health()
-        _ = await client.public.access()
-        return HostStatusResponseBody(id=id, ok=True)
-    except HTTPException:
-        raise
-    except TugAgentClientError as e:
-        return HostStatusResponseBody(
-            id=id,
-            ok=False,
-            err=str(e),
-        )
-    except Exception as e:
-        return HostStatusResponseBody(
-            id=id,
-            ok=False,
-            err=f"Unknown error\n{str(e)}",
-        )
+    _set_no_cache_headers(response)
+    host = await get_host(id)
+    return await _get_host_status(host)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -32,6 +34,9 @@ class HostStatusResponseBody(BaseModel):
     id: int
     ok: bool | None = None
     err: str | None = None
+    latency: float | None = None  # Duration of the last probe in seconds
+    checked_at: datetime | None = None  # Date of the last probe
+    last_ok_at: datetime | None = None  # Date of the last successful probe
 
 
 class HostSummary(BaseModel):
@@ -3,6 +3,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import Config
+from backend.core.host_registry import HostRegistry
 from backend.exception import TugUrlValidationError, TugUrlValidationSSRFError
 from backend.modules.containers.containers_model import ContainersModel
 from backend.modules.hosts.hosts_schemas import HostInfo
@@ -37,8 +38,18 @@ async def validate_agent_url_against_ssrf(url: str) -> None:
         ) from e
 
 
-async def get_host(host_id: int, session: AsyncSession) -> HostsModel:
-    """Get host info from db. Raise 404 if no host found."""
+async def get_host(host_id: int) -> HostsModel:
+    """
+    Get host info from the registry (read only). Raise 404 if no host found.
+    """
+    host = await HostRegistry.get(host_id)
+    if not host:
+        raise HTTPException(404, "Docker host not found in database")
+    return host
+
+
+async def get_db_host(host_id: int, session: AsyncSession) -> HostsModel:
+    """Get host info from db (for modification). Raise 404 if no host found."""
     stmt = select(HostsModel).where(HostsModel.id == host_id).limit(1)
     result = await session.execute(stmt)
     host = result.scalar_one_or_none()
@@ -2,18 +2,14 @@ from typing import Final
 
 from fastapi import APIRouter, Depends
 from python_on_whales.components.image.models import ImageInspectResult
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.agent_client import AgentClientManager
-from backend.db.session import get_async_session
+from backend.core.host_inventory import HostInventory
 from backend.modules.auth.auth_util import is_authorized
 from backend.modules.hosts.hosts_util import get_host
 from backend.modules.images.images_util import map_image_schema
-from shared.schemas.container_schemas import (
-    GetContainerListBodySchema,
-)
+from backend.modules.public.public_summary import FleetSummary
 from shared.schemas.image_schemas import (
-    GetImageListBodySchema,
     InspectImageRequestBodySchema,
     PruneImagesRequestBodySchema,
 )
@@ -29,16 +25,14 @@ images_router = APIRouter(
 
 @images_router.get(path="/{host_id}/list", response_model=list[ImageGetResponseBody])
 async def get_list(
-    host_id: int, session: AsyncSession = Depends(get_async_session)
+    host_id: int,
 ) -> list[ImageGetResponseBody]:
-    host: Final = await get_host(host_id, session)
+    host: Final = await get_host(host_id)
     client: Final = AgentClientManager.get_host_client(host)
 
-    containers: Final = await client.container.list(
-        GetContainerListBodySchema(all=True)
-    )
+    containers: Final = await HostInventory.get_containers(host, client)
     used_images: Final[set[str]] = {c.image for c in containers if c.image}
-    images: Final = await client.image.list(GetImageListBodySchema(all=True))
+    images: Final = await HostInventory.get_images(host, client)
 
     return [
         map_image_schema(
@@ -58,9 +52,8 @@ async def get_list(
 async def inspect(
     host_id: int,
     image_spec_or_id: str,
-    session: AsyncSession = Depends(get_async_session),
 ) -> ImageInspectResult:
-    host: Final = await get_host(host_id, session)
+    host: Final = await get_host(host_id)
     client: Final = AgentClientManager.get_host_client(host)
     return await client.image.inspect(
         InspectImageRequestBodySchema(spec_or_id=image_spec_or_id)
@@ -71,8 +64,11 @@ async def inspect(
 async def prune(
     host_id: int,
     body: PruneImagesRequestBodySchema,
-    session: AsyncSession = Depends(get_async_session),
 ) -> str:
-    host = await get_host(host_id, session)
+    host = await get_host(host_id)
     client = AgentClientManager.get_host_client(host)
-    return await client.image.prune(body)
+    try:
+        return await client.image.prune(body)
+    finally:
+        HostInventory.invalidate(host.id)
+        FleetSummary.invalidate()
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from backend.config import Config
+from backend.modules.auth.auth_util import is_authorized
+from shared.util.metrics import CONTENT_TYPE, REGISTRY
+
+metrics_router = APIRouter(tags=["metrics"], prefix="/metrics")
+
+
+@metrics_router.get(
+    "",
+    description="Get metrics of the backend in the Prometheus text format",
+    response_class=Response,
+)
+async def get_metrics(request: Request):
+    try:
+        await is_authorized(request)
+    except Exception:
+        if not Config.ENABLE_PUBLIC_METRICS:
+            raise HTTPException(403, "Public metrics disabled") from None
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
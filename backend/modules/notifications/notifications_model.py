@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base_model import BaseModel
+from backend.util.now import now
+
+
+class NotificationOutboxModel(BaseModel):
+    """Notification waiting for delivery to a single URL"""
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+    )
+    # Not delivered before this date (retry backoff)
+    not_before: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=now,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=text("CURRENT_TIMESTAMP"),
+        default=now,
+        nullable=False,
+    )
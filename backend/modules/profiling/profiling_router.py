@@ -0,0 +1,177 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from backend.config import Config
+from backend.core.agent_client import AgentClientManager
+from backend.modules.auth.auth_util import is_authorized
+from backend.modules.hosts.hosts_util import get_host
+from shared.schemas.profiling_schemas import (
+    CpuProfileFormat,
+    MemoryGroupBy,
+    MemorySnapshotSchema,
+)
+from shared.util.profiling import (
+    CpuProfiler,
+    MemoryTracker,
+    attachment_response,
+    cpu_profile_response,
+)
+
+
+def is_enabled():
+    if not Config.ENABLE_PROFILING:
+        raise HTTPException(
+            status.HTTP_403_FORBIDDEN,
+            "Profiling is disabled. Set ENABLE_PROFILING=true to enable it.",
+        )
+
+
+profiling_router = APIRouter(
+    prefix="/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(is_authorized), Depends(is_enabled)],
+)
+
+
+@profiling_router.get(
+    "/cpu",
+    description="Sample stacks of the backend for the seconds and download the profile",
+)
+async def cpu(
+    seconds: float = Query(10, gt=0, le=CpuProfiler.MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: CpuProfileFormat = "speedscope",
+):
+    profile = await CpuProfiler.profile(seconds, interval_ms / 1000)
+    return cpu_profile_response(profile, format, "tugtainer-backend")
+
+
+@profiling_router.post(
+    "/memory/start",
+    description="Start tracing of the allocations, it slows the backend down",
+)
+def memory_start(frames: int = Query(25, ge=1, le=100)):
+    MemoryTracker.start(frames)
+
+
+@profiling_router.post("/memory/stop", description="Stop tracing of the allocations")
+def memory_stop():
+    MemoryTracker.stop()
+
+
+@profiling_router.get(
+    "/memory/snapshot",
+    description="Get the biggest allocations, the snapshot is the baseline of the diffs",
+    response_model=MemorySnapshotSchema,
+)
+async def memory_snapshot(
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    return await MemoryTracker.snapshot(limit, group_by)
+
+
+@profiling_router.get(
+    "/memory/diff",
+    description="Get the biggest changes of the allocations since the snapshot",
+    response_model=MemorySnapshotSchema,
+)
+async def memory_diff(
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    return await MemoryTracker.diff(limit, group_by)
+
+
+@profiling_router.get(
+    "/memory/dump",
+    description="Download the snapshot for tracemalloc.Snapshot.load",
+)
+async def memory_dump():
+    return attachment_response(
+        await MemoryTracker.dump(),
+        "tugtainer-backend.tracemalloc",
+        "application/octet-stream",
+    )
+
+
+# The same for the agent of the host, it requires ENABLE_PROFILING on the agent too
+
+
+@profiling_router.get(
+    "/host/{host_id}/cpu",
+    description="Sample stacks of the host's agent for the seconds and download the profile",
+)
+async def host_cpu(
+    host_id: int,
+    seconds: float = Query(10, gt=0, le=CpuProfiler.MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: CpuProfileFormat = "speedscope",
+) -> Response:
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    content = await client.profiling.cpu(seconds, interval_ms, format)
+    if format == "pstats":
+        return attachment_response(
+            content, f"tugtainer-agent-{host_id}.pstats", "application/octet-stream"
+        )
+    return attachment_response(
+        content, f"tugtainer-agent-{host_id}.speedscope.json", "application/json"
+    )
+
+
+@profiling_router.post(
+    "/host/{host_id}/memory/start",
+    description="Start tracing of the allocations of the host's agent",
+)
+async def host_memory_start(host_id: int, frames: int = Query(25, ge=1, le=100)):
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    await client.profiling.memory_start(frames)
+
+
+@profiling_router.post(
+    "/host/{host_id}/memory/stop",
+    description="Stop tracing of the allocations of the host's agent",
+)
+async def host_memory_stop(host_id: int):
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    await client.profiling.memory_stop()
+
+
+@profiling_router.get(
+    "/host/{host_id}/memory/snapshot",
+    description="Get the biggest allocations of the host's agent",
+    response_model=MemorySnapshotSchema,
+)
+async def host_memory_snapshot(
+    host_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    return await client.profiling.memory_snapshot(limit, group_by)
+
+
+@profiling_router.get(
+    "/host/{host_id}/memory/diff",
+    description="Get the biggest changes of the allocations of the host's agent",
+    response_model=MemorySnapshotSchema,
+)
+async def host_memory_diff(
+    host_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    group_by: MemoryGroupBy = "lineno",
+):
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    return await client.profiling.memory_diff(limit, group_by)
+
+
+@profiling_router.get(
+    "/host/{host_id}/memory/dump",
+    description="Download the snapshot of the host's agent for tracemalloc.Snapshot.load",
+)
+async def host_memory_dump(host_id: int):
+    client = AgentClientManager.get_host_client(await get_host(host_id))
+    return attachment_response(
+        await client.profiling.memory_dump(),
+        f"tugtainer-agent-{host_id}.tracemalloc",
+        "application/octet-stream",
+    )
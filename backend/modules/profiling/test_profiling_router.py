@@ -0,0 +1,66 @@
+import pstats
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from backend.app import app
+from backend.modules.auth.auth_util import is_authorized
+
+base_module = "backend.modules.profiling.profiling_router"
+
+client = TestClient(app)
+
+
+async def override_is_authorized():
+    return True
+
+
+app.dependency_overrides[is_authorized] = override_is_authorized
+
+
+def test_disabled_by_default(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", False)
+
+    assert client.get("/api/profiling/cpu").status_code == 403
+    assert client.post("/api/profiling/memory/start").status_code == 403
+
+
+def test_cpu_pstats(mocker: MockerFixture, tmp_path):
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", True)
+
+    response = client.get(
+        "/api/profiling/cpu", params={"seconds": 0.2, "format": "pstats"}
+    )
+
+    assert response.status_code == 200
+    path = tmp_path / "backend.pstats"
+    path.write_bytes(response.content)
+    stats = pstats.Stats(str(path))
+    assert stats.total_tt > 0  # type: ignore[attr-defined]
+
+
+def test_host_cpu_is_proxied(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", True)
+    mocker.patch(f"{base_module}.get_host", AsyncMock())
+    agent_client = MagicMock()
+    agent_client.profiling.cpu = AsyncMock(return_value=b'{"profiles":[]}')
+    mocker.patch(
+        f"{base_module}.AgentClientManager.get_host_client",
+        return_value=agent_client,
+    )
+
+    response = client.get("/api/profiling/host/3/cpu", params={"seconds": 1})
+
+    assert response.status_code == 200
+    assert response.content == b'{"profiles":[]}'
+    assert (
+        "tugtainer-agent-3.speedscope.json" in (response.headers["content-disposition"])
+    )
+    agent_client.profiling.cpu.assert_awaited_once_with(1, 10, "speedscope")
+
+
+def test_memory_requires_start(mocker: MockerFixture):
+    mocker.patch(f"{base_module}.Config.ENABLE_PROFILING", True)
+
+    assert client.get("/api/profiling/memory/diff").status_code == 409
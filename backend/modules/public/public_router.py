@@ -1,29 +1,20 @@
-import asyncio
 import logging
-from typing import cast
 
 from cachetools import TTLCache
 from cachetools_async import cached as cached_async
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from packaging import version
-from sqlalchemy import select, text
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import Config
-from backend.core.agent_client import AgentClientManager
 from backend.core.cron_manager import CronManager
 from backend.db.session import get_async_session
 from backend.enums.cron_jobs_enum import ECronJob
 from backend.modules.auth.auth_util import is_authorized
-from backend.modules.containers.containers_model import (
-    ContainersModel,
-)
-from backend.modules.hosts.hosts_model import HostsModel
 from backend.modules.hosts.hosts_schemas import HostSummary
-from backend.modules.public.public_util import fetch_latest_release, get_host_summary
-from shared.schemas.container_schemas import (
-    GetContainerListBodySchema,
-)
+from backend.modules.public.public_summary import FleetSummary, get_etag
+from backend.modules.public.public_util import fetch_latest_release
 
 from .public_schemas import (
     IsUpdateAvailableResponseBodySchema,
@@ -55,6 +46,22 @@ async def health(session: AsyncSession = Depends(get_async_session)):
     return "OK"
 
 
+def _etag_response(
+    request: Request,
+    response: Response,
+    etag: str,
+) -> Response | None:
+    """
+    Set caching headers of the response.
+    Returns 304 response if client already has the content.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 @public_router.get(
     path="/summary",
     description="Get summary statistics for all hosts",
@@ -62,17 +69,18 @@ async def health(session: AsyncSession = Depends(get_async_session)):
 )
 async def get_summary(
     request: Request,
-    session: AsyncSession = Depends(get_async_session),
-) -> list[HostSummary]:
+    response: Response,
+):
     try:
         await is_authorized(request)
     except Exception:
         if not Config.ENABLE_PUBLIC_API:
             raise HTTPException(403, "Public api disabled") from None
 
-    hosts = (await session.execute(select(HostsModel))).scalars().all()
-
-    return await asyncio.gather(*(get_host_summary(host, session) for host in hosts))
+    summary = await FleetSummary.get()
+    if not_modified := _etag_response(request, response, summary.etag):
+        return not_modified
+    return summary.hosts
 
 
 @public_router.get(
@@ -82,36 +90,20 @@ async def get_summary(
 )
 async def get_update_count(
     request: Request,
-    session: AsyncSession = Depends(get_async_session),
-) -> TotalUpdateCountResponseBodySchema:
+    response: Response,
+):
     try:
         await is_authorized(request)
     except Exception:
         if not Config.ENABLE_PUBLIC_API:
             raise HTTPException(403, "Public api disabled") from None
 
-    stmt = select(HostsModel).where(HostsModel.enabled)
-    result = await session.execute(stmt)
-    hosts = result.scalars().all()
-
-    total_updates = 0
-    for host in hosts:
-        client = AgentClientManager.get_host_client(host)
-        containers = await client.container.list(GetContainerListBodySchema(all=True))
-        db_result = await session.execute(
-            select(ContainersModel).where(ContainersModel.host_id == host.id)
-        )
-        containers_db = db_result.scalars().all()
-        containers_db_map = {item.name: item for item in containers_db}
-
-        for container in containers:
-            db_item = containers_db_map.get(cast(str, container.name))
-            if db_item and db_item.update_available:
-                total_updates += 1
-
-    return TotalUpdateCountResponseBodySchema.model_validate(
-        {"total_updates": total_updates}
-    )
+    summary = await FleetSummary.get()
+    body = TotalUpdateCountResponseBodySchema(total_updates=summary.update_count)
+    etag = get_etag(body.model_dump_json().encode())
+    if not_modified := _etag_response(request, response, etag):
+        return not_modified
+    return body
 
 
 @public_router.get(
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import ClassVar, Final
+
+from backend.core.agent_client import AgentClientManager
+from backend.core.host_registry import HostRegistry
+from backend.db.session import async_session_maker
+from backend.modules.hosts.hosts_model import HostsModel
+from backend.modules.hosts.hosts_schemas import HostSummary
+
+from .public_util import get_host_summary
+
+
+@dataclass
+class FleetSummarySnapshot:
+    """
+    Materialised summary of all hosts.
+    :param hosts: summary per host
+    :param update_count: total number of containers with available updates
+    :param etag: etag of the hosts summary
+    :param computed_at: monotonic time of the computation
+    """
+
+    hosts: list[HostSummary]
+    update_count: int
+    etag: str
+    computed_at: float
+
+
+class FleetSummary:
+    """
+    Summary of all hosts served with stale-while-revalidate semantics.
+    Only the very first request waits for agents, later requests get
+    the last computed summary while the refresh runs in the background.
+    """
+
+    TTL: ClassVar[float] = 30  # seconds
+    _VALUE: ClassVar[FleetSummarySnapshot | None] = None
+    _STALE: ClassVar[bool] = False
+    _REFRESH: ClassVar[asyncio.Task | None] = None
+    _LOGGER: Final = logging.getLogger("FleetSummary")
+
+    @classmethod
+    async def get(cls) -> FleetSummarySnapshot:
+        """Get summary, start refresh in background if it is stale"""
+        value = cls._VALUE
+        if value is None:
+            return await cls.refresh()
+        if cls._STALE or time.monotonic() - value.computed_at > cls.TTL:
+            cls.schedule_refresh()
+        return value
+
+    @classmethod
+    async def refresh(cls) -> FleetSummarySnapshot:
+        """Recompute summary and wait for the result"""
+        return await asyncio.shield(cls.schedule_refresh())
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Mark summary as stale, the next request will trigger refresh"""
+        cls._STALE = True
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop summary completely"""
+        cls._VALUE = None
+        cls._STALE = False
+
+    @classmethod
+    def schedule_refresh(cls) -> asyncio.Task[FleetSummarySnapshot]:
+        """Start refresh in background unless it is already running"""
+        if cls._REFRESH is None or cls._REFRESH.done():
+            cls._REFRESH = asyncio.create_task(cls._compute())
+            cls._REFRESH.add_done_callback(
+                lambda t: t.cancelled() or t.exception()
+            )
+        return cls._REFRESH
+
+    @classmethod
+    async def _compute(cls) -> FleetSummarySnapshot:
+        cls._STALE = False
+        hosts = await HostRegistry.get_all()
+        previous: Final = (
+            {item.host_id: item for item in cls._VALUE.hosts} if cls._VALUE else {}
+        )
+
+        async def _host_summary(host: HostsModel) -> HostSummary:
+            if (
+                host.id in previous
+                and host.enabled
+                and not AgentClientManager.get_host_client(host).is_available
+            ):
+                return previous[host.id]
+            try:
+                # Every host gets its own session, they run concurrently
+                async with async_session_maker() as session:
+                    return await get_host_summary(host, session)
+            except Exception:
+                if host.id not in previous:
+                    raise
+                cls._LOGGER.exception(
+                    f"Failed to get summary of {host.name}, keeping previous"
+                )
+                return previous[host.id]
+
+        summaries: Final = list(
+            await asyncio.gather(*(_host_summary(h) for h in hosts))
+        )
+        value: Final = FleetSummarySnapshot(
+            hosts=summaries,
+            update_count=sum(
+                s.by_update_available.get("true", 0)
+                for s in summaries
+                if s.host_enabled
+            ),
+            etag=get_etag(
+                "".join(s.model_dump_json() for s in summaries).encode()
+            ),
+            computed_at=time.monotonic(),
+        )
+        cls._VALUE = value
+        return value
+
+
+def get_etag(content: bytes) -> str:
+    """Get strong etag of the content"""
+    return f'"{hashlib.sha1(content, usedforsecurity=False).hexdigest()}"'
@@ -6,12 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import Config
 from backend.core.agent_client import AgentClientManager
+from backend.core.host_inventory import HostInventory
 from backend.modules.containers.containers_model import ContainersModel
 from backend.modules.containers.containers_schemas import ContainersListItem
 from backend.modules.hosts.hosts_model import HostsModel
 from backend.modules.hosts.hosts_schemas import HostSummary
-from shared.schemas.container_schemas import GetContainerListBodySchema
-from shared.schemas.image_schemas import GetImageListBodySchema
 
 
 async def fetch_latest_release() -> dict[str, Any]:
@@ -51,9 +50,7 @@ async def get_host_summary(host: HostsModel, session: AsyncSession) -> HostSumma
         )
 
     client: Final = AgentClientManager.get_host_client(host)
-    containers: Final = await client.container.list(
-        GetContainerListBodySchema(all=True)
-    )
+    containers: Final = await HostInventory.get_containers(host, client)
 
     containers_db: Final = (
         (
@@ -115,7 +112,7 @@ async def get_host_summary(host: HostsModel, session: AsyncSession) -> HostSumma
             avail_key = "true" if container.update_available else "false"
             by_update_available[avail_key] += 1
 
-    images: Final = await client.image.list(GetImageListBodySchema(all=True))
+    images: Final = await HostInventory.get_images(host, client)
     used_images: Final[set[str]] = {c.image for c in containers if c.image}
 
     total_images: Final = len(images)
@@ -3,11 +3,15 @@ from typing import Any, cast
 import pytest
 from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
+from python_on_whales.components.container.models import (
+    ContainerInspectResult,
+)
 
 from backend.app import app
-from backend.db.session import get_async_session
 
 module_path = "backend.modules.public.public_router"
+summary_module_path = "backend.modules.public.public_summary"
+util_module_path = "backend.modules.public.public_util"
 
 client = TestClient(app)
 
@@ -59,12 +63,17 @@ async def test_is_update_available(
 async def test_get_update_count(
     mocker: MockerFixture,
 ):
+    from backend.core.host_inventory import HostInventory
     from backend.modules.containers.containers_model import (
         ContainersModel,
     )
     from backend.modules.hosts.hosts_model import (
         HostsModel,
     )
+    from backend.modules.public.public_summary import FleetSummary
+
+    HostInventory.invalidate()
+    FleetSummary.clear()
 
     mocker.patch(
         f"{module_path}.Config.ENABLE_PUBLIC_API",
@@ -98,9 +107,6 @@ async def test_get_update_count(
         stmt_text = str(statement).lower()
         result = mocker.Mock()
         result.scalars.return_value = result
-        if "from hosts" in stmt_text:
-            result.all.return_value = [fake_host]
-            return result
         if "from containers" in stmt_text:
             result.all.return_value = [fake_container_db]
             return result
@@ -108,22 +114,46 @@ async def test_get_update_count(
 
     fake_session.execute = mocker.AsyncMock(side_effect=fake_execute)
 
-    async def fake_get_async_session():
-        yield fake_session
+    fake_session_ctx = mocker.AsyncMock()
+    fake_session_ctx.__aenter__.return_value = fake_session
+    mocker.patch(
+        f"{summary_module_path}.async_session_maker",
+        return_value=fake_session_ctx,
+    )
 
-    app.dependency_overrides[get_async_session] = fake_get_async_session
+    mocker.patch(
+        f"{summary_module_path}.HostRegistry.get_all",
+        mocker.AsyncMock(return_value=[fake_host]),
+    )
 
     fake_client = mocker.Mock()
-    fake_container = mocker.Mock()
-    fake_container.name = "container1"
+    fake_container = ContainerInspectResult(name="container1")
     fake_client.container.list = mocker.AsyncMock(
         return_value=[fake_container]
     )
+    fake_client.image.list = mocker.AsyncMock(return_value=[])
     mocker.patch(
-        f"{module_path}.AgentClientManager.get_host_client",
+        f"{util_module_path}.AgentClientManager.get_host_client",
         return_value=fake_client,
     )
 
     response = client.get("/public/update_count")
     assert response.status_code == 200
     assert response.json() == {"total_updates": 1}
+
+    etag = response.headers["etag"]
+    response = client.get(
+        "/public/update_count", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    # Stale summary is served while refreshing in background
+    FleetSummary.invalidate()
+    fake_client.container.list.side_effect = Exception("Agent is down")
+    HostInventory.invalidate()
+    response = client.get("/public/summary")
+    assert response.status_code == 200
+    assert response.json()[0]["by_update_available"] == {
+        "true": 1,
+        "false": 0,
+    }
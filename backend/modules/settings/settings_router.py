@@ -17,7 +17,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.action_result import (
     ContainerActionResult,
+    ContainerSummary,
     HostActionResult,
+    ImageSummary,
 )
 from backend.core.check_actions.check_all_containers import (
     check_all_containers,
@@ -181,9 +183,11 @@ async def test_notification(data: TestNotificationRequestBody):
         test_digests: list[str] = [
             "sha256:f751174c3d8ae54b12575af320a4aa01bb3b6e61ab82aa1e4f8ecac8a079ce61",
         ]
+        test_container_summary = ContainerSummary.from_inspect(test_container)
+        test_image_summary = ImageSummary.from_inspect(test_image)
         items: list[ContainerActionResult] = [
             ContainerActionResult(
-                container=test_container,
+                container=test_container_summary,
                 local_image=None,
                 remote_image=None,
                 local_digests=[],
@@ -191,49 +195,49 @@ async def test_notification(data: TestNotificationRequestBody):
                 result=None,
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
                 remote_image=None,
                 local_digests=test_digests,
                 remote_digests=[],
                 result="not_available",
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
-                remote_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
+                remote_image=test_image_summary,
                 local_digests=test_digests,
                 remote_digests=test_digests,
                 result="updated",
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
-                remote_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
+                remote_image=test_image_summary,
                 local_digests=test_digests,
                 remote_digests=test_digests,
                 result="available",
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
-                remote_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
+                remote_image=test_image_summary,
                 local_digests=test_digests,
                 remote_digests=test_digests,
                 result="available(notified)",
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
-                remote_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
+                remote_image=test_image_summary,
                 local_digests=test_digests,
                 remote_digests=test_digests,
                 result="rolled_back",
             ),
             ContainerActionResult(
-                container=test_container,
-                local_image=test_image,
-                remote_image=test_image,
+                container=test_container_summary,
+                local_image=test_image_summary,
+                remote_image=test_image_summary,
                 local_digests=test_digests,
                 remote_digests=test_digests,
                 result="failed",
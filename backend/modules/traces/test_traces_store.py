@@ -0,0 +1,76 @@
+from collections.abc import Iterator
+
+import pytest
+
+from backend.modules.traces.traces_store import RunTraces, summarize_run
+from shared.util.tracing import Span
+
+SECOND = 1_000_000_000
+
+
+def _span(name: str, span_id: str, parent_id: str | None, start: int, end: int):
+    return Span(
+        name=name,
+        trace_id="t" * 32,
+        span_id=span_id,
+        parent_id=parent_id,
+        start_ns=start * SECOND,
+        end_ns=end * SECOND,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear() -> Iterator[None]:
+    RunTraces.clear()
+    yield
+    RunTraces.clear()
+
+
+def test_phases_are_own_time():
+    root = _span("update_host", "r", None, 0, 100)
+    root.attributes = {"host_id": 1, "host_name": "local"}
+    prepare = _span("prepare", "p", "r", 0, 30)
+    pull = _span("pull", "pl", "p", 5, 25)
+    recreate = _span("recreate", "c", "r", 40, 90)
+    health = _span("health_wait", "h", "c", 50, 85)
+    health.error = "Exception: unhealthy"
+
+    run = summarize_run([pull, prepare, health, recreate, root])
+
+    assert run.host_id == 1 and run.host_name == "local"
+    assert run.seconds == 100
+    assert [(p.name, p.seconds) for p in run.phases] == [
+        ("health_wait", 35),
+        ("pull", 20),
+        ("update_host", 20),
+        ("recreate", 15),
+        ("prepare", 10),
+    ]
+    assert sum(p.seconds for p in run.phases) == run.seconds
+    assert {p.name: p.errors for p in run.phases}["health_wait"] == 1
+    assert [s.name for s in run.spans][:2] == ["update_host", "prepare"]
+    assert run.spans[2].offset == 5
+
+
+def test_runs_are_stored_on_root_end():
+    RunTraces.process(_span("pull", "pl", "r", 1, 2))
+    assert RunTraces.get_all() == []
+
+    RunTraces.process(_span("update_host", "r", None, 0, 3))
+
+    [summary] = RunTraces.get_all()
+    assert summary.trace_id == "t" * 32
+    assert [p.name for p in summary.phases] == ["update_host", "pull"]
+    detail = RunTraces.get(summary.trace_id)
+    assert detail is not None and len(detail.spans) == 2
+    assert RunTraces.get_all(host_id=5) == []
+
+
+def test_runs_are_bounded(mocker):
+    mocker.patch.object(RunTraces, "MAX_RUNS", 2)
+    for i in range(3):
+        span = _span("check_host", "r", None, i, i + 1)
+        span.trace_id = str(i) * 32
+        RunTraces.process(span)
+
+    assert [s.trace_id for s in RunTraces.get_all()] == ["2" * 32, "1" * 32]
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from backend.modules.auth.auth_util import is_authorized
+
+from .traces_schemas import TraceDetail, TraceSummary
+from .traces_store import RunTraces
+
+traces_router = APIRouter(
+    prefix="/traces",
+    tags=["traces"],
+    dependencies=[Depends(is_authorized)],
+)
+
+
+@traces_router.get(
+    "/list",
+    response_model=list[TraceSummary],
+    description="Get phase summaries of the recent check/update runs",
+)
+async def get_list(host_id: int | None = None):
+    return RunTraces.get_all(host_id)
+
+
+@traces_router.get(
+    "/{trace_id}",
+    response_model=TraceDetail,
+    description="Get the run with all its spans",
+)
+async def get_trace(trace_id: str):
+    run = RunTraces.get(trace_id)
+    if run is None:
+        raise HTTPException(404, "Trace not found")
+    return run
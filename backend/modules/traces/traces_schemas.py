@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class TracePhase(BaseModel):
+    name: str
+    count: int
+    seconds: float  # Own time of the phase, without the nested phases
+    errors: int
+
+
+class TraceSummary(BaseModel):
+    trace_id: str
+    name: str  # e.g. update_host or check_host
+    host_id: int | None = None
+    host_name: str | None = None
+    started_at: datetime
+    seconds: float
+    error: str | None = None
+    phases: list[TracePhase]  # Slowest first
+
+
+class TraceSpan(BaseModel):
+    span_id: str
+    parent_id: str | None = None
+    name: str
+    offset: float  # Seconds since the start of the run
+    seconds: float
+    attributes: dict[str, str | int | float | bool]
+    error: str | None = None
+
+
+class TraceDetail(TraceSummary):
+    spans: list[TraceSpan]
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from datetime import UTC, datetime
+from typing import ClassVar
+
+from shared.util.tracing import Span
+
+from .traces_schemas import TraceDetail, TracePhase, TraceSpan, TraceSummary
+
+
+def summarize_run(spans: list[Span]) -> TraceDetail:
+    """
+    Summary of the run by phase, i.e. by span name.
+    Time of the phase is its own time, without the nested phases,
+    so the phases of the run add up to its duration.
+    :param spans: finished spans of the trace, the root is the last one
+    """
+    root = spans[-1]
+    children: dict[str, float] = {}
+    for s in spans:
+        if s.parent_id:
+            children[s.parent_id] = children.get(s.parent_id, 0) + s.duration
+    phases: dict[str, TracePhase] = {}
+    for s in spans:
+        phase = phases.get(s.name)
+        if phase is None:
+            phase = phases[s.name] = TracePhase(
+                name=s.name, count=0, seconds=0, errors=0
+            )
+        phase.count += 1
+        # Children may overlap, e.g. concurrent requests
+        phase.seconds += max(0.0, s.duration - children.get(s.span_id, 0))
+        phase.errors += s.error is not None
+    host_id = root.attributes.get("host_id")
+    host_name = root.attributes.get("host_name")
+    return TraceDetail(
+        trace_id=root.trace_id,
+        name=root.name,
+        host_id=host_id if isinstance(host_id, int) else None,
+        host_name=str(host_name) if host_name is not None else None,
+        started_at=datetime.fromtimestamp(root.start_ns / 1e9, UTC),
+        seconds=root.duration,
+        error=root.error,
+        phases=sorted(phases.values(), key=lambda p: p.seconds, reverse=True),
+        spans=[
+            TraceSpan(
+                span_id=s.span_id,
+                parent_id=s.parent_id,
+                name=s.name,
+                offset=(s.start_ns - root.start_ns) / 1e9,
+                seconds=s.duration,
+                attributes=s.attributes,
+                error=s.error,
+            )
+            # Parent before the children started at the same time
+            for s in sorted(spans, key=lambda s: (s.start_ns, -(s.end_ns or 0)))
+        ],
+    )
+
+
+class RunTraces:
+    """
+    Recent runs of the check/update pipelines, summarized by phase.
+    Spans are collected by trace until the root one is finished.
+    """
+
+    MAX_RUNS: ClassVar[int] = 50
+    MAX_PENDING: ClassVar[int] = 100  # Runs in progress
+    MAX_SPANS: ClassVar[int] = 10_000  # Spans of one run
+    _PENDING: ClassVar[OrderedDict[str, list[Span]]] = OrderedDict()
+    _RUNS: ClassVar[OrderedDict[str, TraceDetail]] = OrderedDict()
+
+    @classmethod
+    def process(cls, span: Span) -> None:
+        """Span processor of the Tracer"""
+        spans = cls._PENDING.get(span.trace_id)
+        if spans is None:
+            spans = cls._PENDING[span.trace_id] = []
+            while len(cls._PENDING) > cls.MAX_PENDING:
+                cls._PENDING.popitem(last=False)
+        if span.parent_id is not None:
+            if len(spans) < cls.MAX_SPANS:
+                spans.append(span)
+            return
+        spans.append(span)
+        del cls._PENDING[span.trace_id]
+        cls._RUNS[span.trace_id] = summarize_run(spans)
+        while len(cls._RUNS) > cls.MAX_RUNS:
+            cls._RUNS.popitem(last=False)
+
+    @classmethod
+    def get_all(cls, host_id: int | None = None) -> list[TraceSummary]:
+        """Summaries of the recent runs, newest first"""
+        return [
+            TraceSummary.model_validate(run.model_dump(exclude={"spans"}))
+            for run in reversed(cls._RUNS.values())
+            if host_id is None or run.host_id == host_id
+        ]
+
+    @classmethod
+    def get(cls, trace_id: str) -> TraceDetail | None:
+        return cls._RUNS.get(trace_id)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._PENDING.clear()
+        cls._RUNS.clear()
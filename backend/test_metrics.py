@@ -0,0 +1,30 @@
+from backend.metrics import (
+    CONTAINER_LAST_CHECK_SECONDS,
+    CONTAINER_LAST_UPDATE_SECONDS,
+    forget_containers,
+)
+
+
+def _series(host: str) -> list[str]:
+    return [
+        line
+        for gauge in (CONTAINER_LAST_CHECK_SECONDS, CONTAINER_LAST_UPDATE_SECONDS)
+        for line in gauge.samples()
+        if f'host="{host}"' in line
+    ]
+
+
+def test_forget_containers():
+    for name in ("kept", "removed"):
+        CONTAINER_LAST_CHECK_SECONDS.set(1, "901", name)
+        CONTAINER_LAST_UPDATE_SECONDS.set(1, "901", name)
+    CONTAINER_LAST_CHECK_SECONDS.set(1, "902", "removed")
+
+    forget_containers("901", {"kept"})
+    assert len(_series("901")) == 2
+    assert all('container="kept"' in line for line in _series("901"))
+    assert len(_series("902")) == 1
+
+    forget_containers("901")
+    forget_containers("902")
+    assert not _series("901") and not _series("902")
@@ -2,8 +2,6 @@ from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_add
 from typing import Final
 from urllib.parse import ParseResult, urlparse
 
-import dns.asyncresolver
-
 from backend.const import RESTRICTED_NETWORKS
 from backend.exception import TugUrlValidationError, TugUrlValidationSSRFError
 
@@ -49,6 +47,9 @@ async def validate_url_against_ssrf(
 
     # Resolve ip address
     if not resolved:
+        # dnspython is slow to import, it's only needed for hostnames
+        import dns.asyncresolver
+
         try:
             answers = await dns.asyncresolver.resolve(hostname, "A")
             resolved.update(ip_address(rdata.address) for rdata in answers)
@@ -0,0 +1,208 @@
+"""
+Load test of the agent API with a simulated docker engine
+(see benchmarks.simulated_docker) under concurrent signed requests.
+Run with `python -m benchmarks.bench_agent --concurrency 32 --requests 200`
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import aiohttp
+
+from benchmarks.bench_container_list import make_inspect
+from benchmarks.simulated_docker import DEFAULT_LATENCIES, EngineOptions, serve
+from shared.util.custom_json_dumps import custom_json_dumps
+from shared.util.signature import get_signature_headers
+
+# Share of the endpoints in the mixed scenario, close to an update run
+MIX: dict[str, int] = {
+    "list": 20,
+    "inspect": 50,
+    "pull": 5,
+    "create": 5,
+    "exec": 20,
+}
+
+
+@dataclass
+class _Request:
+    endpoint: str
+    method: Literal["GET", "POST"]
+    path: str
+    body: dict[str, Any] | None = None
+
+
+def _make_request(endpoint: str, name: str) -> _Request:
+    match endpoint:
+        case "list":
+            return _Request(endpoint, "POST", "/api/container/list", {"all": True})
+        case "inspect":
+            return _Request(endpoint, "GET", f"/api/container/inspect/{name}")
+        case "pull":
+            return _Request(
+                endpoint, "POST", "/api/image/pull", {"image": "nginx:latest"}
+            )
+        case "create":
+            return _Request(
+                endpoint,
+                "POST",
+                "/api/container/create",
+                {"image": "nginx:latest", "name": name},
+            )
+        case "exec":
+            return _Request(
+                endpoint, "POST", f"/api/container/exec/{name}", {"command": "true"}
+            )
+    raise ValueError(endpoint)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0
+
+
+async def _load(
+    session: aiohttp.ClientSession,
+    requests: list[_Request],
+    concurrency: int,
+    secret: str,
+) -> tuple[dict[str, list[float]], Counter[int], float]:
+    """Send requests with the given concurrency, return latencies and statuses"""
+    latencies: dict[str, list[float]] = {}
+    statuses: Counter[int] = Counter()
+    pending = iter(requests)
+
+    async def _worker() -> None:
+        for req in pending:
+            started = time.perf_counter()
+            headers = get_signature_headers(secret, req.method, req.path, req.body)
+            async with session.request(
+                req.method, req.path, json=req.body, headers=headers
+            ) as resp:
+                await resp.read()
+            latencies.setdefault(req.endpoint, []).append(time.perf_counter() - started)
+            statuses[resp.status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def bench(port: int, args: argparse.Namespace, workers: int) -> None:
+    names = [make_inspect(i)["Name"].lstrip("/") for i in range(args.containers)]
+    rnd = random.Random(0)
+    scenarios: dict[str, list[str]] = {
+        endpoint: [endpoint] * args.requests for endpoint in MIX
+    }
+    scenarios["mixed"] = rnd.choices(
+        list(MIX), weights=list(MIX.values()), k=args.requests
+    )
+
+    print(
+        f"{args.concurrency} concurrent requests, {workers} executor workers, "
+        f"{args.containers} containers"
+    )
+    print(
+        f"{'scenario':<16} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>7} "
+        f"| {'errors':>6} | {'busy':>5} | {'saturated':>9} | {'queue p99':>9} "
+        f"| {'sig us':>6}"
+    )
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(
+        f"http://127.0.0.1:{port}",
+        connector=connector,
+        json_serialize=custom_json_dumps,
+    ) as session:
+        # Warm up connections and lazy initialization of the app
+        await _load(
+            session,
+            [_make_request("inspect", names[0])] * args.concurrency,
+            args.concurrency,
+            args.secret,
+        )
+        for scenario, endpoints in scenarios.items():
+            requests = [
+                _make_request(endpoint, names[i % len(names)])
+                for i, endpoint in enumerate(endpoints)
+            ]
+            await session.post("/_reset")
+            latencies, statuses, wall = await _load(
+                session, requests, args.concurrency, args.secret
+            )
+            async with session.get("/_stats") as resp:
+                stats: dict[str, Any] = await resp.json()
+            rows = {scenario: [v for values in latencies.values() for v in values]}
+            if scenario == "mixed":
+                rows.update({f"  {k}": v for k, v in sorted(latencies.items())})
+            for i, (row, values) in enumerate(rows.items()):
+                line = (
+                    f"{row:<16} | {len(values) / wall:7.1f} "
+                    f"| {_percentile(values, 0.5) * 1000:7.1f} "
+                    f"| {_percentile(values, 0.99) * 1000:7.1f}"
+                )
+                if not i:
+                    errors = sum(v for k, v in statuses.items() if k >= 400)
+                    signatures = stats["signatures"] or 1
+                    line += (
+                        f" | {errors:6} | {stats['max_busy']:2}/{workers:<2} "
+                        f"| {stats['saturated'] / wall:8.0%} "
+                        f"| {stats['queue_wait_p99'] * 1000:6.1f} ms "
+                        f"| {stats['signature_time'] / signatures * 1e6:6.0f}"
+                    )
+                print(line)
+
+
+def _latency(value: str) -> tuple[str, float]:
+    op, ms = value.split("=", 1)
+    if op not in DEFAULT_LATENCIES:
+        raise argparse.ArgumentTypeError(f"Unknown operation {op}")
+    return op, float(ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--requests", type=int, default=200, help="requests per scenario"
+    )
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="executor workers of the agent"
+    )
+    parser.add_argument(
+        "--latency",
+        type=_latency,
+        action="append",
+        default=[],
+        help=f"docker call latency e.g. pull=500, ms, one of {', '.join(DEFAULT_LATENCIES)}",
+    )
+    parser.add_argument("--secret", default="bench")
+    args = parser.parse_args()
+
+    options = EngineOptions(
+        containers=args.containers,
+        latencies={**DEFAULT_LATENCIES, **dict(args.latency)},
+        secret=args.secret,
+        workers=args.workers,
+    )
+    # Spawned, so the load generator doesn't share the event loop with the agent
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    agent = context.Process(target=serve, args=(options, sender), daemon=True)
+    agent.start()
+    try:
+        port, workers = receiver.recv()
+        asyncio.run(bench(port, args, workers))
+    finally:
+        agent.terminate()
+        agent.join()
+
+
+if __name__ == "__main__":
+    main()
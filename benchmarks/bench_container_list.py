@@ -0,0 +1,136 @@
+"""
+Benchmark of the container list hot path (agent response -> list view).
+Run with `python -m benchmarks.bench_container_list`
+"""
+
+import json
+import timeit
+from typing import Any
+
+from pydantic import TypeAdapter
+from python_on_whales.components.container.models import (
+    ContainerInspectResult,
+)
+
+from backend.core.agent_client import _CONTAINER_LIST_ADAPTER
+from backend.modules.containers.containers_router import _CONTAINERS_LIST_ADAPTER
+from backend.modules.containers.containers_schemas import ContainersListItem
+
+SIZE = 500
+REPEAT = 5
+
+
+def make_inspect(i: int) -> dict[str, Any]:
+    """Docker inspect output of a typical compose service"""
+    return {
+        "Id": f"{i:064x}",
+        "Created": "2026-01-01T00:00:00.000000000Z",
+        "Path": "/docker-entrypoint.sh",
+        "Args": ["nginx", "-g", "daemon off;"],
+        "State": {
+            "Status": "running",
+            "Running": True,
+            "Paused": False,
+            "Restarting": False,
+            "OOMKilled": False,
+            "Dead": False,
+            "Pid": 1000 + i,
+            "ExitCode": 0,
+            "Error": "",
+            "StartedAt": "2026-01-01T00:00:01.000000000Z",
+            "FinishedAt": "0001-01-01T00:00:00Z",
+            "Health": {"Status": "healthy", "FailingStreak": 0, "Log": []},
+        },
+        "Image": f"sha256:{i:064x}",
+        "Name": f"/stack{i // 10}-svc{i % 10}-1",
+        "RestartCount": 0,
+        "Driver": "overlay2",
+        "Platform": "linux",
+        "HostConfig": {
+            "NetworkMode": f"stack{i // 10}_default",
+            "PortBindings": {"80/tcp": [{"HostIp": "", "HostPort": str(8000 + i)}]},
+            "RestartPolicy": {"Name": "unless-stopped", "MaximumRetryCount": 0},
+            "Binds": [f"/srv/stack{i // 10}/data:/data:rw"],
+            "LogConfig": {"Type": "json-file", "Config": {}},
+        },
+        "Mounts": [
+            {
+                "Type": "bind",
+                "Source": f"/srv/stack{i // 10}/data",
+                "Destination": "/data",
+                "Mode": "rw",
+                "RW": True,
+                "Propagation": "rprivate",
+            }
+        ],
+        "Config": {
+            "Hostname": f"{i:012x}",
+            "User": "",
+            "Env": ["PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin"],
+            "Cmd": ["nginx", "-g", "daemon off;"],
+            "Image": "nginx:latest",
+            "WorkingDir": "",
+            "Entrypoint": ["/docker-entrypoint.sh"],
+            "Labels": {
+                "com.docker.compose.project": f"stack{i // 10}",
+                "com.docker.compose.service": f"svc{i % 10}",
+                "com.docker.compose.container-number": "1",
+                "com.docker.compose.version": "2.30.0",
+            },
+        },
+        "NetworkSettings": {
+            "Networks": {
+                f"stack{i // 10}_default": {
+                    "NetworkID": f"{i:064x}",
+                    "EndpointID": f"{i:064x}",
+                    "Gateway": "172.18.0.1",
+                    "IPAddress": "172.18.0.2",
+                    "IPPrefixLen": 16,
+                    "MacAddress": "02:42:ac:12:00:02",
+                    "Aliases": [f"svc{i % 10}"],
+                }
+            }
+        },
+    }
+
+
+def _best(func) -> float:
+    """Best time of REPEAT runs in milliseconds"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+
+def legacy(raw: bytes) -> bytes:
+    """Previous path: fresh adapter, validation of items and of the response"""
+    containers = TypeAdapter(list[ContainerInspectResult]).validate_python(
+        json.loads(raw)
+    )
+    items = [
+        ContainersListItem.model_validate(
+            dict(ContainersListItem.from_sources(1, c, None))
+        )
+        for c in containers
+    ]
+    # FastAPI dumps the returned models, validates and serializes them again
+    adapter = TypeAdapter(list[ContainersListItem])
+    dumped = [item.model_dump() for item in items]
+    return adapter.dump_json(adapter.validate_python(dumped))
+
+
+def fast(raw: bytes) -> bytes:
+    """Current path: cached adapters, validation of the agent data only"""
+    containers = _CONTAINER_LIST_ADAPTER.validate_json(raw)
+    items = [ContainersListItem.from_sources(1, c, None) for c in containers]
+    return _CONTAINERS_LIST_ADAPTER.dump_json(items)
+
+
+def main() -> None:
+    raw = json.dumps([make_inspect(i) for i in range(SIZE)]).encode()
+    legacy_ms = _best(lambda: legacy(raw))
+    fast_ms = _best(lambda: fast(raw))
+    print(f"{SIZE} containers | legacy | {legacy_ms:9.2f} ms")
+    print(f"{SIZE} containers | fast   | {fast_ms:9.2f} ms")
+    print(f"speedup x{legacy_ms / fast_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+End-to-end benchmark of check and update of all containers.
+The backend works with a temporary sqlite database, a fake agent
+and a fake registry (see benchmarks.fakes) running in a child process,
+so neither docker nor network access is needed.
+Run with `python -m benchmarks.bench_e2e --hosts 10 --containers 100`
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import resource
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.config import Config
+from backend.core.agent_client import AgentClientManager
+from backend.core.check_actions.check_all_containers import check_all_containers
+from backend.core.notification_dispatcher import NotificationDispatcher
+from backend.core.update_actions.update_all_containers import update_all_containers
+from backend.db.base_model import BaseModel
+from backend.db.db_writer import DbWriter
+from backend.db.session import async_session_maker, create_engine
+from backend.modules.containers.containers_model import ContainersModel
+from backend.modules.hosts.hosts_model import HostsModel
+from backend.modules.settings.settings_enum import ESettingKey, ESettingType
+from backend.modules.settings.settings_model import SettingModel
+from backend.modules.settings.settings_storage import SettingsStorage
+from benchmarks.fakes import FakeOptions, serve
+
+PHASES: dict[str, Callable[[], Awaitable[None]]] = {
+    "check": check_all_containers,
+    "update": update_all_containers,
+    "check (up to date)": check_all_containers,
+}
+
+
+class _WriteCounter:
+    """Count statements changing the database"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement: str, *args: Any) -> None:
+        if statement.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+            self.count += 1
+
+
+async def _seed(options: FakeOptions, agent: str, registry: str) -> None:
+    settings: dict[ESettingKey, tuple[str, ESettingType]] = {
+        # The delay between registry requests is measured separately
+        ESettingKey.REGISTRY_REQ_DELAY: ("0", ESettingType.INT),
+        ESettingKey.PULL_BEFORE_CHECK: ("false", ESettingType.BOOL),
+        ESettingKey.UPDATE_ONLY_RUNNING: ("true", ESettingType.BOOL),
+        ESettingKey.DELAY_UPDATE_FOR: ("0", ESettingType.INT),
+        ESettingKey.INSECURE_REGISTRIES: (registry, ESettingType.STR),
+        ESettingKey.NOTIFICATION_URLS: ("", ESettingType.STR),
+    }
+    async with async_session_maker() as session:
+        session.add_all(
+            SettingModel(key=key.value, value=value, value_type=value_type.value)
+            for key, (value, value_type) in settings.items()
+        )
+        for host_id in range(1, options.hosts + 1):
+            session.add(
+                HostsModel(
+                    id=host_id,
+                    name=f"host{host_id}",
+                    url=f"http://{agent}/{host_id}",
+                    ssl=False,
+                    timeout=30,
+                )
+            )
+        await session.flush()
+        async with aiohttp.ClientSession() as client:
+            async with client.post(f"http://{agent}/1/api/container/list") as resp:
+                names = [c["Name"] for c in await resp.json()]
+        session.add_all(
+            ContainersModel(
+                host_id=host_id,
+                name=name,
+                check_enabled=True,
+                update_enabled=True,
+            )
+            for host_id in range(1, options.hosts + 1)
+            for name in names
+        )
+        await session.commit()
+
+
+async def _update_available() -> int:
+    async with async_session_maker() as session:
+        return (
+            await session.scalar(
+                select(func.count()).where(ContainersModel.update_available)
+            )
+            or 0
+        )
+
+
+async def bench(options: FakeOptions, agent: str, registry: str, db: Path) -> None:
+    engine = create_engine(f"sqlite+aiosqlite:///{db}")
+    async_session_maker.configure(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    await _seed(options, agent, registry)
+    await SettingsStorage.load_all()
+    Config.AGENT_ALLOW_ENDPOINTS = {agent}
+    writes = _WriteCounter(engine)
+
+    outdated = sum(
+        1
+        for i in range(options.containers)
+        if i < options.outdated * options.containers
+    )
+    # Sanity of the harness, the numbers are wrong otherwise
+    expected = {
+        "check": outdated * options.hosts,
+        "update": 0,
+        "check (up to date)": 0,
+    }
+    print(
+        f"{options.hosts} hosts x {options.containers} containers, "
+        f"{outdated * options.hosts} outdated"
+    )
+    print(
+        f"{'phase':<20} | {'wall s':>8} | {'agent req':>9} | {'registry req':>12} "
+        f"| {'db writes':>9} | {'peak rss MiB':>12}"
+    )
+    failed: list[str] = []
+    async with aiohttp.ClientSession(f"http://{agent}") as client:
+        for name, phase in PHASES.items():
+            await client.post("/_reset")
+            writes.count = 0
+            started = time.perf_counter()
+            await phase()
+            wall = time.perf_counter() - started
+            async with client.get("/_stats") as resp:
+                stats: dict[str, dict[str, int]] = await resp.json()
+            # KiB on linux
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(
+                f"{name:<20} | {wall:8.2f} | {sum(stats['agent'].values()):9} "
+                f"| {sum(stats['registry'].values()):12} | {writes.count:9} "
+                f"| {rss:12.1f}"
+            )
+            for source in ("agent", "registry"):
+                details = ", ".join(
+                    f"{k}={v}" for k, v in sorted(stats[source].items())
+                )
+                print(f"{'':<20} | {source}: {details}")
+            available = await _update_available()
+            # Rate limited lookups fail, the result is not predictable
+            if not options.registry_rate and available != expected[name]:
+                failed.append(
+                    f"{name}: {available} updates available, expected {expected[name]}"
+                )
+
+    await NotificationDispatcher.stop()
+    await DbWriter.stop()
+    await AgentClientManager.remove_all()
+    await engine.dispose()
+    if failed:
+        raise SystemExit("\n".join(failed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hosts", type=int, default=5)
+    parser.add_argument("--containers", type=int, default=50, help="per host")
+    parser.add_argument(
+        "--outdated", type=float, default=0.2, help="share of outdated containers"
+    )
+    parser.add_argument("--agent-latency", type=float, default=0, help="ms")
+    parser.add_argument("--registry-latency", type=float, default=0, help="ms")
+    parser.add_argument(
+        "--registry-auth", action="store_true", help="require Bearer token"
+    )
+    parser.add_argument(
+        "--registry-rate", type=float, default=0, help="requests per second limit"
+    )
+    parser.add_argument(
+        "--no-304", action="store_true", help="ignore If-None-Match in the registry"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    options = FakeOptions(
+        hosts=args.hosts,
+        containers=args.containers,
+        outdated=args.outdated,
+        agent_latency=args.agent_latency / 1000,
+        registry_latency=args.registry_latency / 1000,
+        registry_auth=args.registry_auth,
+        registry_rate=args.registry_rate,
+        registry_304=not args.no_304,
+    )
+    # Spawned, so the fakes share neither memory nor the event loop with the backend
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    fakes = context.Process(target=serve, args=(options, sender), daemon=True)
+    fakes.start()
+    try:
+        agent, registry = receiver.recv()
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(bench(options, agent, registry, Path(tmp) / "bench.db"))
+    finally:
+        fakes.terminate()
+        fakes.join()
+
+
+if __name__ == "__main__":
+    main()
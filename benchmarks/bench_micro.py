@@ -0,0 +1,360 @@
+"""
+Microbenchmarks of the pure functions running per container or per request.
+Times are divided by the time of a calibration loop, so scores of different
+machines are comparable, and compared with bench_micro_baseline.json.
+Run with `python -m benchmarks.bench_micro`, `--check` exits with an error
+on regressions over the threshold, `--update` rewrites the baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import timeit
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from math import inf
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Final
+
+from python_on_whales.components.container.models import ContainerInspectResult
+from python_on_whales.components.image.models import ImageInspectResult
+
+from backend.core.check_actions.check_actions_util import parse_image_spec
+from backend.core.container_util.container_config import (
+    diff_container_config_with_image,
+    get_container_config,
+)
+from backend.core.container_util.map_device_requests_to_gpus import (
+    map_device_requests_to_gpus,
+)
+from backend.core.container_util.map_devices_to_list import map_devices_to_list
+from backend.core.container_util.map_env_to_dict import map_env_to_dict
+from backend.core.container_util.map_healthcheck_to_kwargs import (
+    map_healthcheck_to_kwargs,
+)
+from backend.core.container_util.map_log_config_to_kwargs import (
+    map_log_config_to_kwargs,
+)
+from backend.core.container_util.map_mounts_to_arg import map_mounts_to_arg
+from backend.core.container_util.map_port_bindings_to_list import (
+    map_port_bindings_to_list,
+)
+from backend.core.container_util.map_tmpfs_dict_to_list import map_tmpfs_dict_to_list
+from backend.core.container_util.map_ulimits_to_arg import map_ulimits_to_arg
+from backend.core.update_actions.update_actions_plan import build_update_plan
+from backend.db.base_model import BaseModel
+from backend.db.session import async_session_maker, create_engine
+from backend.modules.containers.containers_model import ContainersModel
+from backend.modules.containers.containers_schemas import ContainersListItem
+from backend.modules.hosts.hosts_model import HostsModel
+from backend.modules.settings.settings_enum import ESettingKey, ESettingType
+from backend.modules.settings.settings_model import SettingModel
+from backend.modules.settings.settings_storage import SettingsStorage
+from benchmarks.bench_container_list import make_inspect
+from benchmarks.bench_update_actions_graph import make_containers
+from shared.schemas.docker_version_scheme import DockerVersionScheme
+from shared.util.custom_json_dumps import custom_json_dumps
+from shared.util.signature import (
+    X_SIGNATURE,
+    X_TIMESTAMP,
+    _get_req_signature,
+    verify_signature_headers,
+)
+
+BASELINE: Final = Path(__file__).with_name("bench_micro_baseline.json")
+SIZE: Final = 500
+GRAPH_SIZE: Final = 1_000
+REPEAT: Final = 7
+RETRIES: Final = 2  # measurements again of a regressed case, against noise
+DEFAULT_THRESHOLD: Final = 1.5
+SECRET: Final = "bench-secret"
+IMAGE_SPECS: Final = (
+    "nginx",
+    "nginx:1.27",
+    "library/nginx:latest",
+    "docker.io/library/nginx:latest",
+    "ghcr.io/quenary/tugtainer:1",
+    "registry.example.com:5000/team/app:2.1.0",
+    "localhost/app",
+    "quay.io/prometheus/node-exporter:v1.8.2",
+)
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], Any]
+    ops: int = 1  # operations done by one call of func
+
+
+def make_rich_inspect(i: int) -> dict[str, Any]:
+    """Inspect output with everything the config mapping handles"""
+    data = make_inspect(i)
+    data["HostConfig"].update(
+        {
+            "Devices": [
+                {
+                    "PathOnHost": "/dev/dri",
+                    "PathInContainer": "/dev/dri",
+                    "CgroupPermissions": "rwm",
+                }
+            ],
+            "DeviceRequests": [
+                {"Driver": "nvidia", "Count": -1, "Capabilities": [["gpu"]]}
+            ],
+            "Tmpfs": {"/run": "rw,noexec,nosuid,size=65536k"},
+            "Ulimits": [{"Name": "nofile", "Soft": 1024, "Hard": 4096}],
+            "LogConfig": {
+                "Type": "json-file",
+                "Config": {"max-size": "10m", "max-file": "3"},
+            },
+        }
+    )
+    data["Config"]["Env"] += [f"VAR_{k}=value_{i}_{k}" for k in range(20)]
+    data["Config"]["Healthcheck"] = {
+        "Test": ["CMD-SHELL", "curl -f http://localhost/ || exit 1"],
+        "Interval": 30_000_000_000,
+        "Timeout": 5_000_000_000,
+        "Retries": 3,
+    }
+    return data
+
+
+def make_image() -> ImageInspectResult:
+    return ImageInspectResult.model_validate(
+        {
+            "Id": "sha256:" + "0" * 64,
+            "RepoTags": ["nginx:latest"],
+            "RepoDigests": ["nginx@sha256:" + "1" * 64],
+            "Config": {
+                "Env": ["PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin"],
+                "Cmd": ["nginx", "-g", "daemon off;"],
+                "Entrypoint": ["/docker-entrypoint.sh"],
+                "Labels": {"maintainer": "NGINX Docker Maintainers"},
+            },
+        }
+    )
+
+
+def _map_all(containers: list[ContainerInspectResult]) -> None:
+    for c in containers:
+        config, host_config = c.config, c.host_config
+        assert config and host_config
+        map_env_to_dict(config.env)
+        map_healthcheck_to_kwargs(config.healthcheck)
+        map_devices_to_list(host_config.devices)
+        map_device_requests_to_gpus(host_config.device_requests)
+        map_log_config_to_kwargs(host_config.log_config)
+        map_mounts_to_arg(c.mounts)
+        map_port_bindings_to_list(host_config.port_bindings)
+        map_tmpfs_dict_to_list(host_config.tmpfs)
+        map_ulimits_to_arg(host_config.ulimits)
+
+
+@contextmanager
+def _update_plan_case() -> Iterator[Case]:
+    """build_update_plan of deep compose chains, with the db of the host"""
+    containers = make_containers(GRAPH_SIZE)
+    # Roots of the chains are updatable, so every container is affected
+    roots = {str(c.name) for c in containers if str(c.name).endswith("-svc0-1")}
+    loop = asyncio.new_event_loop()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async_session_maker.configure(bind=engine)
+
+        async def _seed() -> None:
+            async with engine.begin() as conn:
+                await conn.run_sync(BaseModel.metadata.create_all)
+            async with async_session_maker() as session:
+                session.add(HostsModel(id=1, name="bench", url="http://bench"))
+                session.add_all(
+                    [
+                        SettingModel(
+                            key=ESettingKey.UPDATE_ONLY_RUNNING.value,
+                            value="false",
+                            value_type=ESettingType.BOOL.value,
+                        ),
+                        SettingModel(
+                            key=ESettingKey.DELAY_UPDATE_FOR.value,
+                            value="0",
+                            value_type=ESettingType.INT.value,
+                        ),
+                    ]
+                )
+                await session.flush()
+                session.add_all(
+                    ContainersModel(
+                        host_id=1,
+                        name=str(c.name),
+                        update_enabled=True,
+                        update_available=str(c.name) in roots,
+                    )
+                    for c in containers
+                )
+                await session.commit()
+            await SettingsStorage.load_all()
+
+        loop.run_until_complete(_seed())
+        host = HostsModel(id=1, name="bench")
+        try:
+            yield Case(
+                f"build_update_plan ({GRAPH_SIZE} chained)",
+                lambda: loop.run_until_complete(build_update_plan(host, containers)),
+            )
+        finally:
+            loop.run_until_complete(engine.dispose())
+            loop.close()
+
+
+def make_cases() -> list[Case]:
+    raw: Final = [make_rich_inspect(i) for i in range(SIZE)]
+    containers: Final = [ContainerInspectResult.model_validate(c) for c in raw]
+    image: Final = make_image()
+    version: Final = DockerVersionScheme.model_validate(
+        {
+            "Client": {"Version": "28.0.0", "ApiVersion": "1.48"},
+            "Server": {"Version": "28.0.0", "ApiVersion": "1.48"},
+        }
+    )
+    configs: Final = [get_container_config(c, image, version)[0] for c in containers]
+    body: Final = configs[0].model_dump(exclude_unset=True)
+    timestamp: Final = int(time.time())
+    headers: Final = {
+        X_TIMESTAMP: str(timestamp),
+        X_SIGNATURE: _get_req_signature(
+            SECRET, timestamp, "POST", "/api/container/create", body
+        ),
+    }
+    db_rows: Final = [
+        ContainersModel(
+            id=i,
+            host_id=1,
+            name=str(c.name),
+            check_enabled=True,
+            update_enabled=True,
+            update_available=False,
+            hooks={"pre_update": ["echo pre"]},
+        )
+        for i, c in enumerate(containers)
+    ]
+
+    return [
+        Case(
+            "_get_req_signature (create body)",
+            lambda: _get_req_signature(
+                SECRET, timestamp, "POST", "/api/container/create", body
+            ),
+        ),
+        Case(
+            "verify_signature_headers",
+            lambda: verify_signature_headers(
+                SECRET, 3600, headers, "POST", "/api/container/create", body
+            ),
+        ),
+        Case(
+            "parse_image_spec",
+            lambda: [parse_image_spec(s) for s in IMAGE_SPECS],
+            len(IMAGE_SPECS),
+        ),
+        Case(
+            f"get_container_config (x{SIZE})",
+            lambda: [get_container_config(c, image, version) for c in containers],
+            SIZE,
+        ),
+        Case(f"map_* helpers (x{SIZE})", lambda: _map_all(containers), SIZE),
+        Case(
+            f"diff_container_config_with_image (x{SIZE})",
+            lambda: [diff_container_config_with_image(c, image) for c in configs],
+            SIZE,
+        ),
+        Case(
+            f"ContainersListItem.from_sources (x{SIZE})",
+            lambda: [
+                ContainersListItem.from_sources(1, c, db)
+                for c, db in zip(containers, db_rows, strict=True)
+            ],
+            SIZE,
+        ),
+        Case(f"custom_json_dumps ({SIZE} inspects)", lambda: custom_json_dumps(raw)),
+    ]
+
+
+def _calibration() -> str:
+    """Fixed pure python workload, the unit of the scores"""
+    data = [{"name": f"c{i}", "labels": {"k": str(i)}} for i in range(2_000)]
+    return json.dumps(sorted(data, key=lambda d: d["name"], reverse=True))
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Best time of one call in seconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def score(case: Case) -> tuple[float, float]:
+    """Time of one call in seconds and the time in calibration units"""
+    # Calibrated next to each case, to follow the load of the machine
+    unit = measure(_calibration)
+    took = measure(case.func)
+    return took, took / unit
+
+
+def _load_baseline() -> dict[str, Any]:
+    if not BASELINE.exists():
+        return {"threshold": DEFAULT_THRESHOLD, "benchmarks": {}}
+    return json.loads(BASELINE.read_text())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--check", action="store_true", help="fail on regressions over the threshold"
+    )
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline")
+    parser.add_argument("--filter", default="", help="run matching benchmarks only")
+    args = parser.parse_args()
+
+    baseline = _load_baseline()
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    print(f"threshold x{threshold}")
+    print(f"{'benchmark':<45} | {'us/op':>9} | {'score':>8} | {'baseline':>8} | change")
+    scores: dict[str, float] = {}
+    failed: list[str] = []
+    with _update_plan_case() as plan_case:
+        for case in [*make_cases(), plan_case]:
+            if args.filter not in case.name:
+                continue
+            known = baseline["benchmarks"].get(case.name, {})
+            limit = known.get("score", inf) * known.get("threshold", threshold)
+            took, result = score(case)
+            for _ in range(RETRIES):
+                if result <= limit:
+                    break
+                took, result = min((took, result), score(case), key=itemgetter(1))
+            scores[case.name] = result
+            line = f"{case.name:<45} | {took / case.ops * 1e6:9.2f} | {result:8.4f}"
+            if "score" in known:
+                line += f" | {known['score']:8.4f} | x{result / known['score']:.2f}"
+                if result > limit:
+                    failed.append(case.name)
+                    line += " REGRESSION"
+            print(line)
+
+    if args.update:
+        for name, result in scores.items():
+            baseline["benchmarks"].setdefault(name, {})["score"] = float(
+                f"{result:.4g}"
+            )
+        BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE.name}")
+    if args.check and failed:
+        raise SystemExit(f"Regressions: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
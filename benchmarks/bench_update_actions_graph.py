@@ -0,0 +1,86 @@
+"""
+Benchmark of the update plan dependency graph.
+Run with `python -m benchmarks.bench_update_actions_graph`
+"""
+
+import timeit
+
+from python_on_whales.components.container.models import (
+    ContainerConfig,
+    ContainerInspectResult,
+)
+
+from backend.const import DOCKER_COMPOSE_DEPENDS_ON_LABEL
+from backend.core.update_actions.update_actions_graph import (
+    build_dependency_graph,
+    get_affected,
+    get_dependency_graph,
+    get_topological_order,
+    invalidate_dependency_graph,
+)
+
+SIZES = (1_000, 10_000)
+SERVICES_PER_STACK = 100
+REPEAT = 5
+
+
+def make_containers(count: int) -> list[ContainerInspectResult]:
+    """
+    Generate compose stacks where every service depends on the previous one,
+    i.e. each stack is a chain of SERVICES_PER_STACK containers.
+    """
+    containers: list[ContainerInspectResult] = []
+    for i in range(count):
+        stack, service = divmod(i, SERVICES_PER_STACK)
+        labels = {
+            "com.docker.compose.project": f"stack{stack}",
+            "com.docker.compose.project.config_files": f"/stacks/{stack}/compose.yml",
+            "com.docker.compose.service": f"svc{service}",
+        }
+        if service:
+            labels[DOCKER_COMPOSE_DEPENDS_ON_LABEL] = (
+                f"svc{service - 1}:service_started:false"
+            )
+        containers.append(
+            ContainerInspectResult(
+                name=f"stack{stack}-svc{service}-1",
+                config=ContainerConfig(labels=labels),
+            )
+        )
+    return containers
+
+
+def _best(func) -> float:
+    """Best time of REPEAT runs in milliseconds"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT)) * 1000
+
+
+def bench(size: int) -> dict[str, float]:
+    """Run all benchmarks for the fleet of the given size"""
+    containers = make_containers(size)
+    # Update the root of every stack, so the whole fleet is affected
+    to_update = {str(c.name) for c in containers if str(c.name).endswith("-svc0-1")}
+    graph = build_dependency_graph(containers)
+    affected = get_affected(graph, to_update)
+
+    def cold():
+        invalidate_dependency_graph(0)
+        get_dependency_graph(0, containers)
+
+    get_dependency_graph(0, containers)
+    return {
+        "build (cold)": _best(cold),
+        "build (cached)": _best(lambda: get_dependency_graph(0, containers)),
+        "affected": _best(lambda: get_affected(graph, to_update)),
+        "order": _best(lambda: get_topological_order(graph, affected | to_update)),
+    }
+
+
+def main() -> None:
+    for size in SIZES:
+        for name, ms in bench(size).items():
+            print(f"{size:>6} containers | {name:<15} | {ms:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
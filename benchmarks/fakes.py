@@ -0,0 +1,356 @@
+"""
+In-memory stand-ins of the agent and of an OCI registry for the end-to-end
+benchmarks. Both count served requests, counters are available at
+GET /_stats and reset with POST /_reset of the agent server.
+"""
+
+import asyncio
+import copy
+import hashlib
+import time
+from collections import Counter
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any
+
+from aiohttp import web
+
+from benchmarks.bench_container_list import make_inspect
+
+
+@dataclass
+class FakeOptions:
+    hosts: int = 5
+    containers: int = 50  # per host
+    outdated: float = 0.2  # share of the containers with a newer image
+    agent_latency: float = 0  # seconds
+    registry_latency: float = 0  # seconds
+    registry_auth: bool = False  # Bearer token flow
+    registry_rate: float = 0  # requests per second, 0 is unlimited
+    registry_304: bool = True  # If-None-Match support
+
+
+def _sha(value: str) -> str:
+    return "sha256:" + hashlib.sha256(value.encode()).hexdigest()
+
+
+class FakeRegistry:
+    """
+    Registry serving HEAD of manifests of the bench/app<i> repos.
+    Repos with i below outdated * containers have a newer version.
+    """
+
+    TOKEN = "bench"
+
+    def __init__(self, options: FakeOptions):
+        self._options = options
+        self._allowance = options.registry_rate
+        self._checked_at = time.monotonic()
+        self.address = ""  # host:port, known after start
+        self.requests: Counter[str] = Counter()
+
+    def digest(self, repo: str, version: int | None = None) -> str:
+        """Digest of the given or of the latest version of the repo"""
+        if version is None:
+            index = int(repo.rsplit("app", 1)[-1])
+            outdated = index < self._options.outdated * self._options.containers
+            version = 2 if outdated else 1
+        return _sha(f"{repo}:{version}")
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("HEAD", "/v2/{repo:.+}/manifests/{tag}", self._manifest)
+        app.router.add_get("/token", self._token)
+        return app
+
+    def _limited(self) -> bool:
+        """Token bucket of registry_rate requests per second"""
+        rate = self._options.registry_rate
+        if not rate:
+            return False
+        t = time.monotonic()
+        self._allowance = min(rate, self._allowance + (t - self._checked_at) * rate)
+        self._checked_at = t
+        if self._allowance < 1:
+            return True
+        self._allowance -= 1
+        return False
+
+    async def _manifest(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self._options.registry_latency)
+        repo = request.match_info["repo"]
+        if self._limited():
+            self.requests["manifest 429"] += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if (
+            self._options.registry_auth
+            and request.headers.get("Authorization") != f"Bearer {self.TOKEN}"
+        ):
+            self.requests["manifest 401"] += 1
+            return web.Response(
+                status=401,
+                headers={
+                    "WWW-Authenticate": (
+                        f'Bearer realm="http://{self.address}/token",'
+                        f'service="bench",scope="repository:{repo}:pull"'
+                    )
+                },
+            )
+        digest = self.digest(repo)
+        if (
+            self._options.registry_304
+            and request.headers.get("If-None-Match") == digest
+        ):
+            self.requests["manifest 304"] += 1
+            return web.Response(status=304)
+        self.requests["manifest 200"] += 1
+        return web.Response(headers={"Docker-Content-Digest": digest})
+
+    async def _token(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self._options.registry_latency)
+        self.requests["token"] += 1
+        return web.json_response({"token": self.TOKEN})
+
+
+class _FakeHost:
+    """Docker engine state of one host"""
+
+    def __init__(self, host_id: int, options: FakeOptions, registry: FakeRegistry):
+        self._registry = registry
+        self.images: dict[str, dict[str, Any]] = {}
+        self.containers: dict[str, dict[str, Any]] = {}
+        # Inspect data of removed containers, used to recreate them
+        self.removed: dict[str, dict[str, Any]] = {}
+        for i in range(options.containers):
+            spec = f"{registry.address}/bench/app{i}:latest"
+            image = self.add_image(spec, registry.digest(f"bench/app{i}", 1))
+            container = make_inspect(i)
+            container["Id"] = _sha(f"{host_id}:{i}")[7:]
+            container["Image"] = image["Id"]
+            container["Config"]["Image"] = spec
+            # The agent returns names without the leading slash of docker
+            container["Name"] = container["Name"].removeprefix("/")
+            self.containers[container["Name"]] = container
+
+    def add_image(self, spec: str, digest: str) -> dict[str, Any]:
+        for image in self.images.values():
+            if spec in image["RepoTags"]:
+                image["RepoTags"].remove(spec)
+        image = {
+            "Id": _sha(f"image:{digest}"),
+            "RepoTags": [spec],
+            "RepoDigests": [f"{spec.rsplit(':', 1)[0]}@{digest}"],
+            "Created": "2026-01-01T00:00:00Z",
+            "Architecture": "amd64",
+            "Os": "linux",
+            "Config": {
+                "Env": ["PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin"],
+                "Cmd": ["nginx", "-g", "daemon off;"],
+                "Entrypoint": ["/docker-entrypoint.sh"],
+                "Labels": {},
+            },
+        }
+        self.images[image["Id"]] = image
+        return image
+
+    def find_image(self, spec_or_id: str) -> dict[str, Any] | None:
+        image = self.images.get(spec_or_id)
+        if image:
+            return image
+        return next(
+            (i for i in self.images.values() if spec_or_id in i["RepoTags"]),
+            None,
+        )
+
+    def find_container(self, name_or_id: str) -> dict[str, Any] | None:
+        container = self.containers.get(name_or_id)
+        if container:
+            return container
+        return next(
+            (c for c in self.containers.values() if c["Id"] == name_or_id),
+            None,
+        )
+
+    def set_running(self, name_or_id: str, running: bool) -> dict[str, Any]:
+        container = self.find_container(name_or_id)
+        if not container:
+            raise web.HTTPNotFound(text="Container not found")
+        container["State"]["Running"] = running
+        container["State"]["Status"] = "running" if running else "exited"
+        return container
+
+
+class FakeAgent:
+    """
+    Agent API of several hosts. Every host is served under its own
+    prefix e.g. /3/api/container/list, since the agent client
+    appends API paths to the url of the host.
+    """
+
+    def __init__(self, options: FakeOptions, registry: FakeRegistry):
+        self._options = options
+        self._registry = registry
+        self._hosts = {
+            host_id: _FakeHost(host_id, options, registry)
+            for host_id in range(1, options.hosts + 1)
+        }
+        self.requests: Counter[str] = Counter()
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        routes = [
+            web.post("/{host}/api/container/list", self._container_list),
+            web.get("/{host}/api/container/exists/{name:.+}", self._container_exists),
+            web.get("/{host}/api/container/inspect/{name:.+}", self._container_inspect),
+            web.post("/{host}/api/container/create", self._container_create),
+            web.post("/{host}/api/container/start/{name:.+}", self._container_start),
+            web.post("/{host}/api/container/stop/{name:.+}", self._container_stop),
+            web.delete(
+                "/{host}/api/container/remove/{name:.+}", self._container_remove
+            ),
+            web.get("/{host}/api/image/inspect", self._image_inspect),
+            web.post("/{host}/api/image/list", self._image_list),
+            web.post("/{host}/api/image/pull", self._image_pull),
+            web.post("/{host}/api/image/tag", self._image_tag),
+            web.post("/{host}/api/image/prune", self._empty),
+            web.post("/{host}/api/network/disconnect", self._empty),
+            web.post("/{host}/api/command/run", self._command_run),
+            web.get("/{host}/api/common/version", self._version),
+            web.get("/_stats", self._stats),
+            web.post("/_reset", self._reset),
+        ]
+        app.add_routes(routes)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.path.startswith("/_"):
+            return await handler(request)
+        # e.g. POST /api/container/start
+        path = "/".join(request.path.split("/")[2:5])
+        self.requests[f"{request.method} /{path}"] += 1
+        await asyncio.sleep(self._options.agent_latency)
+        return await handler(request)
+
+    def _host(self, request: web.Request) -> _FakeHost:
+        host = self._hosts.get(int(request.match_info["host"]))
+        if not host:
+            raise web.HTTPNotFound(text="Host not found")
+        return host
+
+    async def _container_list(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self._host(request).containers.values()))
+
+    async def _container_exists(self, request: web.Request) -> web.Response:
+        container = self._host(request).find_container(request.match_info["name"])
+        return web.json_response(container is not None)
+
+    async def _container_inspect(self, request: web.Request) -> web.Response:
+        container = self._host(request).find_container(request.match_info["name"])
+        if not container:
+            raise web.HTTPNotFound(text="Container not found")
+        return web.json_response(container)
+
+    async def _container_create(self, request: web.Request) -> web.Response:
+        host = self._host(request)
+        body = await request.json()
+        name = body["name"]
+        template = host.removed.pop(name, None) or host.find_container(name)
+        image = host.find_image(body["image"])
+        if not template or not image:
+            raise web.HTTPNotFound(text="Image not found")
+        container = copy.deepcopy(template)
+        container["Id"] = _sha(f"{container['Id']}:{image['Id']}")[7:]
+        container["Image"] = image["Id"]
+        container["State"]["Running"] = False
+        container["State"]["Status"] = "created"
+        host.containers[name] = container
+        return web.json_response(container)
+
+    async def _container_start(self, request: web.Request) -> web.Response:
+        self._host(request).set_running(request.match_info["name"], True)
+        return web.json_response(request.match_info["name"])
+
+    async def _container_stop(self, request: web.Request) -> web.Response:
+        self._host(request).set_running(request.match_info["name"], False)
+        return web.json_response(request.match_info["name"])
+
+    async def _container_remove(self, request: web.Request) -> web.Response:
+        host = self._host(request)
+        container = host.find_container(request.match_info["name"])
+        if not container:
+            raise web.HTTPNotFound(text="Container not found")
+        name = container["Name"]
+        host.removed[name] = host.containers.pop(name)
+        return web.json_response(request.match_info["name"])
+
+    async def _image_inspect(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        image = self._host(request).find_image(body["spec_or_id"])
+        if not image:
+            raise web.HTTPNotFound(text="Image not found")
+        return web.json_response(image)
+
+    async def _image_list(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self._host(request).images.values()))
+
+    async def _image_pull(self, request: web.Request) -> web.Response:
+        spec = (await request.json())["image"]
+        repo = spec.split("/", 1)[1].rsplit(":", 1)[0]
+        image = self._host(request).add_image(spec, self._registry.digest(repo))
+        return web.json_response(image)
+
+    async def _image_tag(self, request: web.Request) -> web.Response:
+        host = self._host(request)
+        body = await request.json()
+        image = host.find_image(body["spec_or_id"])
+        if not image:
+            raise web.HTTPNotFound(text="Image not found")
+        for other in host.images.values():
+            if body["tag"] in other["RepoTags"]:
+                other["RepoTags"].remove(body["tag"])
+        image["RepoTags"].append(body["tag"])
+        return web.json_response(None)
+
+    async def _command_run(self, request: web.Request) -> web.Response:
+        return web.json_response(["", ""])
+
+    async def _version(self, request: web.Request) -> web.Response:
+        version = {"Version": "28.0.0", "ApiVersion": "1.48"}
+        return web.json_response({"Client": version, "Server": version})
+
+    async def _empty(self, request: web.Request) -> web.Response:
+        return web.json_response("")
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"agent": self.requests, "registry": self._registry.requests}
+        )
+
+    async def _reset(self, request: web.Request) -> web.Response:
+        self.requests.clear()
+        self._registry.requests.clear()
+        return web.json_response(None)
+
+
+async def _start(app: web.Application) -> str:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return f"127.0.0.1:{runner.addresses[0][1]}"
+
+
+async def _serve(options: FakeOptions, conn: Connection) -> None:
+    registry = FakeRegistry(options)
+    registry.address = await _start(registry.app())
+    agent = FakeAgent(options, registry)
+    conn.send((await _start(agent.app()), registry.address))
+    await asyncio.Event().wait()
+
+
+def serve(options: FakeOptions, conn: Connection) -> None:
+    """
+    Run the fake agent and registry until the process is terminated.
+    Addresses of both are sent to the connection as (agent, registry).
+    """
+    asyncio.run(_serve(options, conn))
@@ -0,0 +1,300 @@
+"""
+Simulated docker engine for the agent load test.
+Calls block the calling thread for the configured latency,
+like python_on_whales blocks on the docker cli.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from types import SimpleNamespace
+from typing import Any
+
+import uvicorn
+from python_on_whales.components.container.models import ContainerInspectResult
+from python_on_whales.components.image.models import ImageInspectResult
+
+import agent.auth
+import agent.unil.asyncall
+from agent.api import (
+    command_api,
+    common_api,
+    container_api,
+    image_api,
+    manifest_api,
+    network_api,
+    public_api,
+)
+from agent.app import app
+from agent.config import Config as AgentConfig
+from benchmarks.bench_container_list import make_inspect
+
+# Latencies of the docker cli calls in milliseconds
+DEFAULT_LATENCIES: dict[str, float] = {
+    "list": 40,
+    "inspect": 30,
+    "exists": 25,
+    "pull": 200,
+    "create": 80,
+    "start": 150,
+    "exec": 120,
+    "other": 30,
+}
+
+
+@dataclass
+class EngineOptions:
+    containers: int = 50
+    latencies: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LATENCIES))
+    secret: str = "bench"
+    workers: int | None = None  # executor size, the agent's one if not set
+
+
+class _Stats:
+    """Thread safe counters of the engine calls, executor and signature checks"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls: dict[str, int] = {}
+            self.busy = 0
+            self.max_busy = 0
+            self.queue_wait: list[float] = []
+            self.saturated = 0.0  # seconds when all workers were busy
+            self._saturated_since: float | None = None
+            self.signature_time = 0.0
+            self.signatures = 0
+
+    def call(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+
+    def task_started(self, queued_at: float, workers: int) -> None:
+        with self._lock:
+            t = time.perf_counter()
+            self.queue_wait.append(t - queued_at)
+            self.busy += 1
+            self.max_busy = max(self.max_busy, self.busy)
+            if self.busy >= workers and self._saturated_since is None:
+                self._saturated_since = t
+
+    def task_done(self) -> None:
+        with self._lock:
+            self.busy -= 1
+            if self._saturated_since is not None:
+                self.saturated += time.perf_counter() - self._saturated_since
+                self._saturated_since = None
+
+    def signature(self, duration: float) -> None:
+        with self._lock:
+            self.signature_time += duration
+            self.signatures += 1
+
+    def dump(self) -> dict[str, Any]:
+        with self._lock:
+            waits = sorted(self.queue_wait)
+            return {
+                "calls": dict(self.calls),
+                "max_busy": self.max_busy,
+                "tasks": len(waits),
+                "queue_wait_p50": waits[len(waits) // 2] if waits else 0,
+                "queue_wait_p99": waits[int(len(waits) * 0.99)] if waits else 0,
+                "saturated": self.saturated,
+                "signature_time": self.signature_time,
+                "signatures": self.signatures,
+            }
+
+
+STATS = _Stats()
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """Executor recording queue wait and the number of busy workers"""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        queued_at = time.perf_counter()
+
+        def _run() -> Any:
+            STATS.task_started(queued_at, self._max_workers)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STATS.task_done()
+
+        return super().submit(_run)
+
+
+class _Api:
+    def __init__(self, engine: "SimulatedDocker"):
+        self._engine = engine
+        self.docker_cmd = ["docker"]
+
+
+class _ContainerApi(_Api):
+    def exists(self, name_or_id: str) -> bool:
+        self._engine.block("exists")
+        return self._engine.find(name_or_id) is not None
+
+    def create(self, **kwargs: Any) -> ContainerInspectResult:
+        self._engine.block("create")
+        template = self._engine.find(kwargs.get("name") or "") or next(
+            iter(self._engine.containers.values())
+        )
+        return ContainerInspectResult.model_validate(template)
+
+    def start(self, name_or_id: str) -> None:
+        self._engine.block("start")
+
+    def stop(self, name_or_id: str) -> None:
+        self._engine.block("other")
+
+    def remove(self, name_or_id: str) -> None:
+        self._engine.block("other")
+
+    def execute(self, name_or_id: str, command: list[str]) -> str:
+        self._engine.block("exec")
+        return "ok\n"
+
+    def list(self, **kwargs: Any) -> list[SimpleNamespace]:
+        self._engine.block("list")
+        return [SimpleNamespace(id=c["Id"]) for c in self._engine.containers.values()]
+
+
+class _ImageApi(_Api):
+    def exists(self, spec_or_id: str) -> bool:
+        self._engine.block("exists")
+        return True
+
+    def inspect(self, spec_or_id: str) -> ImageInspectResult:
+        self._engine.block("inspect")
+        return self._engine.image_result
+
+    def pull(self, spec: str) -> ImageInspectResult:
+        self._engine.block("pull")
+        return self._engine.image_result
+
+    def list(self, **kwargs: Any) -> list[ImageInspectResult]:
+        self._engine.block("list")
+        return [self._engine.image_result]
+
+
+class _NetworkApi(_Api):
+    def disconnect(self, **kwargs: Any) -> None:
+        self._engine.block("other")
+
+
+class SimulatedDocker:
+    """Subset of python_on_whales.DockerClient used by the agent"""
+
+    def __init__(self, options: EngineOptions):
+        self._latencies = options.latencies
+        self.containers = {
+            c["Name"].lstrip("/"): c
+            for c in map(make_inspect, range(options.containers))
+        }
+        self.image_result = ImageInspectResult.model_validate(
+            {
+                "Id": "sha256:" + "0" * 64,
+                "RepoTags": ["nginx:latest"],
+                "RepoDigests": ["nginx@sha256:" + "1" * 64],
+            }
+        )
+        self.container = _ContainerApi(self)
+        self.image = _ImageApi(self)
+        self.network = _NetworkApi(self)
+        self.config = _Api(self)
+
+    def block(self, op: str) -> None:
+        STATS.call(op)
+        latency = self._latencies.get(op, self._latencies["other"]) / 1000
+        time.sleep(latency * random.uniform(0.8, 1.2))
+
+    def find(self, name_or_id: str) -> dict[str, Any] | None:
+        container = self.containers.get(name_or_id.lstrip("/"))
+        if container:
+            return container
+        return next(
+            (c for c in self.containers.values() if c["Id"] == name_or_id), None
+        )
+
+    def run(self, command: list[str]) -> str:
+        """Replacement of python_on_whales.utils.run"""
+        if command[1:3] == ["container", "inspect"]:
+            self.block("inspect")
+            return json.dumps([self.find(i) for i in command[3:]])
+        self.block("other")
+        return ""
+
+    def version(self) -> dict[str, Any]:
+        self.block("other")
+        version = {"Version": "28.0.0", "ApiVersion": "1.48"}
+        return {"Client": version, "Server": version}
+
+    def info(self) -> dict[str, Any]:
+        self.block("other")
+        return {}
+
+
+def install(options: EngineOptions) -> SimulatedDocker:
+    """Replace docker, the executor and the signature check of the agent"""
+    engine = SimulatedDocker(options)
+    for module in (
+        command_api,
+        common_api,
+        container_api,
+        image_api,
+        manifest_api,
+        network_api,
+        public_api,
+    ):
+        module.DOCKER = engine  # type: ignore[attr-defined]
+    container_api.docker_run_cmd = engine.run  # type: ignore[assignment]
+    command_api.docker_run_cmd = engine.run  # type: ignore[assignment]
+
+    workers = options.workers or agent.unil.asyncall.EXECUTOR._max_workers
+    agent.unil.asyncall.EXECUTOR = InstrumentedExecutor(workers)
+
+    verify = agent.auth.verify_signature_headers
+
+    def _timed_verify(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return verify(*args, **kwargs)
+        finally:
+            STATS.signature(time.perf_counter() - started)
+
+    agent.auth.verify_signature_headers = _timed_verify  # type: ignore[assignment]
+    AgentConfig.AGENT_SECRET = options.secret
+    AgentConfig.ALLOW_UNAUTHENTICATED_AGENT = False
+    AgentConfig.ALLOW_EXEC = True
+    return engine
+
+
+async def _serve(options: EngineOptions, conn: Connection) -> None:
+    install(options)
+    app.add_api_route("/_stats", STATS.dump)
+    app.add_api_route("/_reset", STATS.reset, methods=["POST"])
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+    conn.send((sock.getsockname()[1], agent.unil.asyncall.EXECUTOR._max_workers))
+    await server.serve(sockets=[sock])
+
+
+def serve(options: EngineOptions, conn: Connection) -> None:
+    """
+    Run the agent with the simulated engine until the process is terminated.
+    The port and the number of executor workers are sent to the connection.
+    """
+    asyncio.run(_serve(options, conn))
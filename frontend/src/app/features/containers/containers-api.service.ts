@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { BaseApiService } from '../../shared/types/base-api.service';
-import { Observable, repeat, takeWhile } from 'rxjs';
+import { catchError, Observable, repeat, takeWhile } from 'rxjs';
 import {
   IContainerListItem,
   IContainerPatchBody,
@@ -94,13 +94,19 @@ export class ContainersApiService extends BaseApiService<'/containers'> {
   }
 
   /**
-   * Watch progress, emits until status not DONE or ERROR
+   * Watch progress, emits until status not DONE or ERROR.
+   * Uses server-sent events and falls back to polling if they are unavailable.
    * @param cache_id id of progress cache
    * @returns
    */
   watchProgress<T extends IActionProgress>(cache_id: string): Observable<T> {
-    return this.progress<T>(cache_id).pipe(
-      repeat({ delay: 500 }),
+    const source$ =
+      typeof EventSource === 'undefined'
+        ? this.pollProgress<T>(cache_id)
+        : this.streamProgress<T>(cache_id).pipe(
+            catchError(() => this.pollProgress<T>(cache_id)),
+          );
+    return source$.pipe(
       takeWhile(
         (res) =>
           res &&
@@ -110,6 +116,46 @@ export class ContainersApiService extends BaseApiService<'/containers'> {
     );
   }
 
+  /**
+   * Poll progress
+   * @param cache_id id of progress cache
+   * @returns
+   */
+  private pollProgress<T extends IActionProgress>(
+    cache_id: string,
+  ): Observable<T> {
+    return this.progress<T>(cache_id).pipe(repeat({ delay: 500 }));
+  }
+
+  /**
+   * Stream progress with server-sent events.
+   * Emits whole progress state after each change.
+   * @param cache_id id of progress cache
+   * @returns
+   */
+  private streamProgress<T extends IActionProgress>(
+    cache_id: string,
+  ): Observable<T> {
+    return new Observable<T>((subscriber) => {
+      const source = new EventSource(
+        `${this.basePath}/progress/stream?cache_id=${encodeURIComponent(cache_id)}`,
+      );
+      let state: T = null;
+      source.addEventListener('set', (event: MessageEvent<string>) => {
+        state = JSON.parse(event.data);
+        subscriber.next(state);
+      });
+      source.addEventListener('update', (event: MessageEvent<string>) => {
+        state = { ...state, ...JSON.parse(event.data) };
+        subscriber.next(state);
+      });
+      source.onerror = () => {
+        subscriber.error(new Error('Progress stream error'));
+      };
+      return () => source.close();
+    });
+  }
+
   /**
    * Control container state with basic commands
    * @param hostId
@@ -37,4 +37,8 @@ export class HostsApiService extends BaseApiService<'/hosts'> {
   status(id: number): Observable<IHostStatus> {
     return this.httpClient.get<IHostStatus>(`${this.basePath}/${id}/status`);
   }
+
+  statusAll(): Observable<IHostStatus[]> {
+    return this.httpClient.get<IHostStatus[]>(`${this.basePath}/status`);
+  }
 }
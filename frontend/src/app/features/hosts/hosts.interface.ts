@@ -28,4 +28,7 @@ export interface IHostStatus {
   id: number;
   ok: boolean;
   err: string;
+  latency?: number | null;
+  checked_at?: string | null;
+  last_ok_at?: string | null;
 }
@@ -1,6 +1,4 @@
 import { TagSeverity } from '@shared/types/tag-severity.type';
-import { IContainerInspectResult } from '../../features/containers/containers.interface';
-import { IImageInspectResult } from '../../features/images/images.interface';
 
 /**
  * Result of container check
@@ -14,12 +12,33 @@ export type TContainerCheckResult =
   | 'failed'
   | null;
 
+/**
+ * Compact part of the container inspect result
+ */
+export interface IContainerSummary {
+  id: string | null;
+  name: string | null;
+  image: string | null;
+  config: {
+    image: string | null;
+  };
+}
+
+/**
+ * Compact part of the image inspect result
+ */
+export interface IImageSummary {
+  id: string | null;
+  repo_tags: string[];
+  repo_digests: string[];
+}
+
 export interface IContainerActionResult {
-  container: IContainerInspectResult;
+  container: IContainerSummary;
   result: TContainerCheckResult;
   image_spec: string | null;
-  local_image: IImageInspectResult | null;
-  remote_image: IImageInspectResult | null;
+  local_image: IImageSummary | null;
+  remote_image: IImageSummary | null;
   local_digests: string[];
   remote_digests: string[];
 }
@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+CpuProfileFormat = Literal["speedscope", "pstats"]
+MemoryGroupBy = Literal["lineno", "filename", "traceback"]
+
+
+class MemoryStatSchema(BaseModel):
+    traceback: list[str]  # file:line, the most recent frame first
+    size: int  # bytes
+    count: int  # blocks
+    size_diff: int = 0  # since the baseline snapshot
+    count_diff: int = 0
+
+
+class MemorySnapshotSchema(BaseModel):
+    traced: int  # bytes allocated now
+    peak: int  # max bytes allocated since the start of tracing
+    stats: list[MemoryStatSchema]  # the biggest first
@@ -0,0 +1,247 @@
+import bisect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import ClassVar, Final
+
+LabelValues = tuple[str, ...]
+
+# Seconds, from a fast db query to a long image pull
+DEFAULT_BUCKETS: Final = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    300,
+)
+CONTENT_TYPE: Final = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base of the metrics in the Prometheus text format.
+    Values are kept per tuple of label values, updates are thread safe,
+    so the metrics can be used from the event loop and the executor.
+    """
+
+    TYPE: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        registry: "MetricsRegistry | None" = None,
+    ):
+        self.name: Final = name
+        self.description: Final = description
+        self.labels: Final = tuple(labels)
+        self._lock: Final = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _label_str(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labels, values, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _check(self, values: LabelValues) -> None:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {values}")
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.description)}",
+            f"# TYPE {self.name} {self.TYPE}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Final[dict[LabelValues, float]] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        """
+        Increase the counter.
+        :param labels: values of the labels in the order of declaration
+        :param value: increment, can't be negative
+        """
+        with self._lock:
+            if labels not in self._values:
+                self._check(labels)
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{self._label_str(labels)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down.
+    If collect is set, values are taken from it at the moment of rendering,
+    e.g. sizes of caches, instead of being updated on every change.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(
+        self,
+        *args,
+        collect: Callable[[], Iterable[tuple[LabelValues, float]]] | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._values: Final[dict[LabelValues, float]] = {}
+        self._collect: Final = collect
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            if labels not in self._values:
+                self._check(labels)
+            self._values[labels] = value
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        with self._lock:
+            if labels not in self._values:
+                self._check(labels)
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def dec(self, *labels: str, value: float = 1) -> None:
+        self.inc(*labels, value=-value)
+
+    def remove(self, *labels: str) -> None:
+        """Drop the value e.g. of a deleted host"""
+        with self._lock:
+            self._values.pop(labels, None)
+
+    def remove_where(self, match: Callable[[LabelValues], bool]) -> None:
+        """Drop the values of the matching labels e.g. of removed containers"""
+        with self._lock:
+            for labels in [labels for labels in self._values if match(labels)]:
+                del self._values[labels]
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        if self._collect:
+            items += list(self._collect())
+        for labels, value in items:
+            yield f"{self.name}{self._label_str(labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets: Final = tuple(sorted(buckets))
+        # Per labels: counts of the buckets (the last one is +Inf) and the sum
+        self._values: Final[dict[LabelValues, tuple[list[int], list[float]]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record the value.
+        :param value: value e.g. duration in seconds
+        :param labels: values of the labels in the order of declaration
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                self._check(labels)
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe duration of the block, also if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def sum(self, *labels: str) -> float:
+        entry = self._values.get(labels)
+        return entry[1][0] if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            ]
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{self._label_str(labels, le)} {cumulative}"
+            yield f"{self.name}_sum{self._label_str(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{self._label_str(labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Set of the metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Final[dict[str, Metric]] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY: Final = MetricsRegistry()
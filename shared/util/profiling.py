@@ -0,0 +1,287 @@
+"""
+On-demand profiling of a running process, without restarting it.
+CPU is sampled from a separate thread, i.e. stacks of all threads
+are recorded every interval, so the profiled code runs at full speed.
+Memory is traced with tracemalloc, which has to be started before the snapshots.
+"""
+
+import asyncio
+import json
+import marshal
+import pickle
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Final
+
+from fastapi import Response
+
+from shared.schemas.profiling_schemas import (
+    CpuProfileFormat,
+    MemoryGroupBy,
+    MemorySnapshotSchema,
+    MemoryStatSchema,
+)
+
+# File, first line and qualified name of the function, like the keys of pstats
+FrameKey = tuple[str, int, str]
+SampleKey = tuple[str, tuple[FrameKey, ...]]  # thread name, stack from the root
+
+# Allocations of the profiling itself are not interesting
+_MEMORY_FILTERS: Final = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class ProfilingError(Exception):
+    """Profiling is not possible in the current state, e.g. already running"""
+
+
+@dataclass(slots=True)
+class CpuProfile:
+    """
+    Samples of the stacks.
+    :param samples: number of samples and seconds by thread and stack
+    """
+
+    interval: float
+    duration: float
+    samples: dict[SampleKey, tuple[int, float]] = field(default_factory=dict)
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """Sampled profile of every thread in the format of https://speedscope.app"""
+        frames: list[dict[str, Any]] = []
+        indexes: dict[FrameKey, int] = {}
+        profiles: dict[str, dict[str, Any]] = {}
+        for (thread, stack), (_, seconds) in self.samples.items():
+            profile = profiles.get(thread)
+            if profile is None:
+                profile = profiles[thread] = {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                }
+            sample: list[int] = []
+            for key in stack:
+                index = indexes.get(key)
+                if index is None:
+                    index = indexes[key] = len(frames)
+                    frames.append({"name": key[2], "file": key[0], "line": key[1]})
+                sample.append(index)
+            profile["samples"].append(sample)
+            profile["weights"].append(seconds)
+            profile["endValue"] += seconds
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "tugtainer",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+    def to_pstats(self) -> bytes:
+        """
+        Stats of all threads in the marshal format of pstats,
+        e.g. for `python -m pstats` or snakeviz.
+        Calls are the numbers of samples with the function on the stack.
+        """
+        stats: dict[FrameKey, list[Any]] = {}
+        for (_, stack), (count, seconds) in self.samples.items():
+            seen: set[FrameKey] = set()
+            last = len(stack) - 1
+            for i, key in enumerate(stack):
+                entry = stats.get(key)
+                if entry is None:
+                    # calls, primitive calls, own time, cumulative time, callers
+                    entry = stats[key] = [0, 0, 0.0, 0.0, {}]
+                own = seconds if i == last else 0.0
+                entry[2] += own
+                # Recursive calls are counted once
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+                if i:
+                    callers = entry[4]
+                    nc, cc, tt, ct = callers.get(stack[i - 1], (0, 0, 0.0, 0.0))
+                    callers[stack[i - 1]] = (
+                        nc + count,
+                        cc + count,
+                        tt + own,
+                        ct + seconds,
+                    )
+        return marshal.dumps({k: tuple(v) for k, v in stats.items()})
+
+
+def sample_cpu(seconds: float, interval: float) -> CpuProfile:
+    """
+    Sample stacks of all threads but the current one, blocks for the seconds.
+    Every sample weighs the time since the previous one,
+    so a late sample e.g. due to the GIL doesn't skew the profile.
+    """
+    own: Final = threading.get_ident()
+    profile: Final = CpuProfile(interval=interval, duration=0)
+    samples: Final = profile.samples
+    started: Final = time.perf_counter()
+    deadline: Final = started + seconds
+    last = started - interval
+    while (now := time.perf_counter()) < deadline:
+        weight = now - last
+        last = now
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack: list[FrameKey] = []
+            current = frame
+            while current is not None:
+                code = current.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_qualname))
+                current = current.f_back
+            stack.reverse()
+            key = (names.get(ident, str(ident)), tuple(stack))
+            count, total = samples.get(key, (0, 0.0))
+            samples[key] = (count + 1, total + weight)
+        time.sleep(interval)
+    profile.duration = time.perf_counter() - started
+    return profile
+
+
+class CpuProfiler:
+    """One CPU profile of the process at a time"""
+
+    MAX_SECONDS: ClassVar[float] = 300
+    _RUNNING: ClassVar[bool] = False
+
+    @classmethod
+    async def profile(cls, seconds: float, interval: float) -> CpuProfile:
+        """
+        Sample the process for the seconds.
+        :param interval: seconds between the samples
+        """
+        if cls._RUNNING:
+            raise ProfilingError("CPU profile is already running")
+        cls._RUNNING = True
+        try:
+            return await asyncio.to_thread(
+                sample_cpu, min(seconds, cls.MAX_SECONDS), interval
+            )
+        finally:
+            cls._RUNNING = False
+
+
+def cpu_profile_response(
+    profile: CpuProfile, format: CpuProfileFormat, name: str
+) -> Response:
+    """Downloadable file of the profile"""
+    if format == "pstats":
+        return attachment_response(
+            profile.to_pstats(), f"{name}.pstats", "application/octet-stream"
+        )
+    return attachment_response(
+        json.dumps(profile.to_speedscope(name), separators=(",", ":")).encode(),
+        f"{name}.speedscope.json",
+        "application/json",
+    )
+
+
+def attachment_response(content: bytes, filename: str, media_type: str) -> Response:
+    return Response(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+class MemoryTracker:
+    """
+    Allocations traced by tracemalloc.
+    A snapshot is kept as the baseline of the following diffs.
+    Tracing slows the allocations down, so it has to be stopped after profiling.
+    """
+
+    _BASELINE: ClassVar[tracemalloc.Snapshot | None] = None
+
+    @classmethod
+    def start(cls, frames: int) -> None:
+        """:param frames: depth of the tracebacks of the allocations"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        cls._BASELINE = None
+        tracemalloc.start(frames)
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._BASELINE = None
+        tracemalloc.stop()
+
+    @classmethod
+    def _take(cls) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ProfilingError("Memory tracing is not started")
+        return tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+
+    @classmethod
+    async def snapshot(
+        cls, limit: int, group_by: MemoryGroupBy
+    ) -> MemorySnapshotSchema:
+        """Take the baseline snapshot and get the biggest allocations"""
+        snapshot = await asyncio.to_thread(cls._take)
+        cls._BASELINE = snapshot
+        stats = await asyncio.to_thread(snapshot.statistics, group_by)
+        return _snapshot_schema(
+            [
+                MemoryStatSchema(
+                    traceback=_format_traceback(s.traceback),
+                    size=s.size,
+                    count=s.count,
+                )
+                for s in stats[:limit]
+            ]
+        )
+
+    @classmethod
+    async def diff(cls, limit: int, group_by: MemoryGroupBy) -> MemorySnapshotSchema:
+        """Get the biggest changes since the baseline snapshot, the baseline is kept"""
+        baseline = cls._BASELINE
+        if baseline is None:
+            raise ProfilingError("No baseline snapshot, take a snapshot first")
+        snapshot = await asyncio.to_thread(cls._take)
+        stats = await asyncio.to_thread(snapshot.compare_to, baseline, group_by)
+        return _snapshot_schema(
+            [
+                MemoryStatSchema(
+                    traceback=_format_traceback(s.traceback),
+                    size=s.size,
+                    count=s.count,
+                    size_diff=s.size_diff,
+                    count_diff=s.count_diff,
+                )
+                for s in stats[:limit]
+            ]
+        )
+
+    @classmethod
+    async def dump(cls) -> bytes:
+        """Snapshot in the format of tracemalloc.Snapshot.load"""
+        snapshot = await asyncio.to_thread(cls._take)
+        return await asyncio.to_thread(pickle.dumps, snapshot, pickle.HIGHEST_PROTOCOL)
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> list[str]:
+    return [f"{frame.filename}:{frame.lineno}" for frame in reversed(traceback)]
+
+
+def _snapshot_schema(stats: list[MemoryStatSchema]) -> MemorySnapshotSchema:
+    traced, peak = tracemalloc.get_traced_memory()
+    return MemorySnapshotSchema(traced=traced, peak=peak, stats=stats)
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from shared.util.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_counter_renders_labels():
+    registry = MetricsRegistry()
+    counter = Counter("requests_total", "Requests", ["host", "path"], registry)
+    counter.inc("1", '/a"b')
+    counter.inc("1", '/a"b', value=2)
+
+    assert counter.get("1", '/a"b') == 3
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{host="1",path="/a\\"b"} 3.0\n'
+    )
+
+
+def test_wrong_number_of_labels():
+    counter = Counter("c", "C", ["host"], MetricsRegistry())
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_duplicate_name():
+    registry = MetricsRegistry()
+    Counter("c", "C", registry=registry)
+    with pytest.raises(ValueError):
+        Gauge("c", "C", registry=registry)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = Histogram("latency", "Latency", ["op"], registry, buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, "pull")
+
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_bucket{op="pull",le="0.1"} 2',
+        'latency_bucket{op="pull",le="1.0"} 3',
+        'latency_bucket{op="pull",le="+Inf"} 4',
+        'latency_sum{op="pull"} 3.65',
+        'latency_count{op="pull"} 4',
+    ]
+
+
+def test_histogram_time_observes_on_error():
+    histogram = Histogram("h", "H", registry=MetricsRegistry())
+    with pytest.raises(RuntimeError), histogram.time():
+        raise RuntimeError
+    assert histogram.count() == 1
+
+
+def test_gauge_collect():
+    registry = MetricsRegistry()
+    gauge = Gauge(
+        "entries", "Entries", ["kind"], registry, collect=lambda: [(("host",), 2)]
+    )
+    gauge.set(1, "all")
+    gauge.remove("missing")
+
+    assert registry.render().splitlines()[2:] == [
+        'entries{kind="all"} 1.0',
+        'entries{kind="host"} 2.0',
+    ]
+
+
+def test_gauge_remove_where():
+    registry = MetricsRegistry()
+    gauge = Gauge("last", "Last", ["host", "container"], registry)
+    gauge.set(1, "1", "a")
+    gauge.set(2, "1", "b")
+    gauge.set(3, "2", "a")
+
+    gauge.remove_where(lambda labels: labels[0] == "1" and labels[1] != "b")
+
+    assert registry.render().splitlines()[2:] == [
+        'last{host="1",container="b"} 2.0',
+        'last{host="2",container="a"} 3.0',
+    ]
+
+
+def test_thread_safe_updates():
+    counter = Counter("c", "C", registry=MetricsRegistry())
+
+    def _inc():
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=_inc) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.get() == 40_000
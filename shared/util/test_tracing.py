@@ -0,0 +1,126 @@
+import json
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.util.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    Span,
+    SpanContext,
+    Tracer,
+    TracingMiddleware,
+)
+
+
+@pytest.fixture
+def spans() -> Iterator[list[Span]]:
+    finished: list[Span] = []
+    Tracer.add_processor(finished.append)
+    yield finished
+    Tracer.remove_processor(finished.append)
+
+
+def test_nested_spans(spans: list[Span]):
+    with Tracer.span("update_host", host_id=1) as root:
+        with Tracer.span("pull", image="nginx:latest") as child:
+            assert Tracer.current() is child
+        assert Tracer.current() is root
+    assert Tracer.current() is None
+
+    assert spans == [child, root]
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert root.parent_id is None
+    assert root.end_ns is not None and root.end_ns >= child.end_ns  # type: ignore
+
+
+def test_error_is_recorded(spans: list[Span]):
+    with pytest.raises(ValueError):
+        with Tracer.span("stop"):
+            raise ValueError("boom")
+
+    assert spans[0].error == "ValueError: boom"
+    assert spans[0].to_otlp()["status"] == {"code": 2, "message": "ValueError: boom"}
+
+
+def test_propagation():
+    headers: dict[str, str] = {}
+    Tracer.inject(headers)
+    assert headers == {}
+
+    with Tracer.span("check_host") as span:
+        Tracer.inject(headers)
+
+    assert Tracer.extract(headers) == SpanContext(span.trace_id, span.span_id)
+    assert Tracer.extract({"traceparent": "00-bad-id-01"}) is None
+
+
+def test_remote_parent(spans: list[Span]):
+    parent = SpanContext("a" * 32, "b" * 16)
+    with Tracer.span("GET /api/container/list", parent):
+        pass
+
+    assert spans[0].trace_id == parent.trace_id
+    assert spans[0].parent_id == parent.span_id
+
+
+def test_otlp_attributes():
+    span = Span("pull", "a" * 32, "b" * 16, None, 1, 2)
+    span.attributes = {"image": "nginx", "size": 3, "ratio": 0.5, "cached": True}
+
+    assert span.to_otlp()["attributes"] == [
+        {"key": "image", "value": {"stringValue": "nginx"}},
+        {"key": "size", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": True}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_file_export(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    processor = BatchSpanProcessor([FileSpanExporter(str(path), "tugtainer-test")])
+    Tracer.add_processor(processor)
+    try:
+        with Tracer.span("update_host"):
+            with Tracer.span("prune"):
+                pass
+        await processor.stop()
+    finally:
+        Tracer.remove_processor(processor)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    resource_spans = json.loads(lines[0])["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "tugtainer-test"}}
+    ]
+    names = [s["name"] for s in resource_spans["scopeSpans"][0]["spans"]]
+    assert names == ["prune", "update_host"]
+
+
+def test_middleware(spans: list[Span]):
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        current = Tracer.current()
+        return current.trace_id if current else None
+
+    client = TestClient(app)
+    assert client.get("/ping").json() is None
+    assert spans == []
+
+    headers: dict[str, str] = {}
+    with Tracer.span("check_host") as parent:
+        Tracer.inject(headers)
+    response = client.get("/ping", headers=headers)
+
+    assert response.json() == parent.trace_id
+    assert spans[-1].name == "GET /ping"
+    assert spans[-1].parent_id == parent.span_id
+    assert spans[-1].attributes["http.status_code"] == 200
@@ -0,0 +1,371 @@
+"""
+Minimal tracing of the check/update pipelines.
+Spans are exported in the OTLP/JSON format, to a file (one request per line)
+and/or to an OTLP/HTTP collector, and passed to the in-process processors.
+Context is propagated between backend and agent with the W3C traceparent header.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Final
+
+import aiohttp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TRACEPARENT: Final = "traceparent"
+_TRACEPARENT_RE: Final = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP span kinds and status codes
+KIND_INTERNAL: Final = 1
+KIND_SERVER: Final = 2
+_STATUS_OK: Final = 1
+_STATUS_ERROR: Final = 2
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    Timed operation of the trace.
+    :param parent_id: id of the parent span, None for the root of the trace
+    :param start_ns: start in nanoseconds since epoch
+    :param end_ns: end in nanoseconds since epoch, None while running
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    kind: int = KIND_INTERNAL
+    attributes: dict[str, str | int | float | bool] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set_error(self, e: BaseException) -> None:
+        """Mark the span as failed, e.g. for a handled exception"""
+        self.error = f"{type(e).__name__}: {e}"
+
+    def to_otlp(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": (
+                {"code": _STATUS_ERROR, "message": self.error}
+                if self.error is not None
+                else {"code": _STATUS_OK}
+            ),
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        return data
+
+
+def _otlp_value(value: str | int | float | bool) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(
+    attributes: Mapping[str, str | int | float | bool],
+) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+def otlp_request(service: str, spans: list[Span]) -> dict[str, Any]:
+    """ExportTraceServiceRequest of the spans in the OTLP/JSON encoding"""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "tugtainer"},
+                        "spans": [s.to_otlp() for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+_CURRENT: Final[ContextVar[Span | SpanContext | None]] = ContextVar(
+    "tracing_current_span", default=None
+)
+
+
+class Tracer:
+    """
+    Spans of the process.
+    Finished spans are passed to the processors, e.g. exporter or summaries.
+    """
+
+    _PROCESSORS: ClassVar[list[Callable[[Span], None]]] = []
+    _LOGGER: Final = logging.getLogger("Tracer")
+
+    @classmethod
+    def add_processor(cls, processor: Callable[[Span], None]) -> None:
+        cls._PROCESSORS.append(processor)
+
+    @classmethod
+    def remove_processor(cls, processor: Callable[[Span], None]) -> None:
+        if processor in cls._PROCESSORS:
+            cls._PROCESSORS.remove(processor)
+
+    @classmethod
+    def current(cls) -> Span | None:
+        """Current span of this process"""
+        current = _CURRENT.get()
+        return current if isinstance(current, Span) else None
+
+    @classmethod
+    @contextmanager
+    def span(
+        cls,
+        name: str,
+        parent: SpanContext | None = None,
+        kind: int = KIND_INTERNAL,
+        **attributes: str | int | float | bool,
+    ) -> Iterator[Span]:
+        """
+        Run the block in a new span, child of the current one if any.
+        The exception of the block marks the span as failed.
+        :param parent: remote parent e.g. from the traceparent header
+        """
+        context = parent or _CURRENT.get()
+        span = Span(
+            name=name,
+            trace_id=context.trace_id if context else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=context.span_id if context else None,
+            start_ns=time.time_ns(),
+            kind=kind,
+            attributes=dict(attributes),
+        )
+        token = _CURRENT.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            span.end_ns = time.time_ns()
+            for processor in cls._PROCESSORS:
+                try:
+                    processor(span)
+                except Exception:
+                    cls._LOGGER.exception("Failed to process span")
+
+    @classmethod
+    def inject(cls, headers: MutableMapping[str, str]) -> None:
+        """Add traceparent of the current span to the headers"""
+        current = _CURRENT.get()
+        if current is not None:
+            headers[TRACEPARENT] = f"00-{current.trace_id}-{current.span_id}-01"
+
+    @staticmethod
+    def extract(headers: Mapping[str, str]) -> SpanContext | None:
+        """Get remote parent from the traceparent header"""
+        match = _TRACEPARENT_RE.match(headers.get(TRACEPARENT, ""))
+        return SpanContext(match[1], match[2]) if match else None
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    async def export(self, spans: list[Span]) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class FileSpanExporter(SpanExporter):
+    """Append every batch as a line of OTLP/JSON, like the collector's file exporter"""
+
+    def __init__(self, path: str, service: str):
+        self._path: Final = path
+        self._service: Final = service
+
+    def _write(self, line: str) -> None:
+        with open(self._path, "a") as file:
+            file.write(line + "\n")
+
+    async def export(self, spans: list[Span]) -> None:
+        line = json.dumps(otlp_request(self._service, spans), separators=(",", ":"))
+        # Not on the event loop, the file might be on a slow volume
+        await asyncio.to_thread(self._write, line)
+
+    async def close(self) -> None:
+        pass
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """Send batches to an OTLP/HTTP collector, e.g. http://collector:4318"""
+
+    TIMEOUT: ClassVar[float] = 10  # seconds
+
+    def __init__(self, endpoint: str, service: str):
+        self._url: Final = f"{endpoint.rstrip('/')}/v1/traces"
+        self._service: Final = service
+        self._session: aiohttp.ClientSession | None = None
+
+    async def export(self, spans: list[Span]) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT)
+            )
+        async with self._session.post(
+            self._url, json=otlp_request(self._service, spans)
+        ) as resp:
+            resp.raise_for_status()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class BatchSpanProcessor:
+    """
+    Buffer of the finished spans, exported in the background.
+    The buffer is bounded, the oldest spans are dropped if exporters fall behind.
+    """
+
+    INTERVAL: ClassVar[float] = 5  # seconds
+    MAX_SPANS: ClassVar[int] = 10_000
+    _LOGGER: Final = logging.getLogger("BatchSpanProcessor")
+
+    def __init__(self, exporters: list[SpanExporter]):
+        self._exporters: Final = exporters
+        self._spans: Final[deque[Span]] = deque(maxlen=self.MAX_SPANS)
+        self._task: asyncio.Task | None = None
+
+    def __call__(self, span: Span) -> None:
+        self._spans.append(span)
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                # No loop, exported on the next flush
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.INTERVAL)
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._spans:
+            return
+        spans = list(self._spans)
+        self._spans.clear()
+        for exporter in self._exporters:
+            try:
+                await exporter.export(spans)
+            except Exception as e:
+                self._LOGGER.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    async def stop(self) -> None:
+        """Stop the background task and export the rest of the spans"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        for exporter in self._exporters:
+            await exporter.close()
+
+
+def setup_export(
+    service: str,
+    file: str | None,
+    otlp_endpoint: str | None,
+) -> BatchSpanProcessor | None:
+    """
+    Export spans of the process if any destination is configured.
+    :param service: service.name of the spans
+    :param file: path of the OTLP/JSON lines file
+    :param otlp_endpoint: base url of the OTLP/HTTP collector
+    :return: processor to stop on shutdown
+    """
+    exporters: list[SpanExporter] = []
+    if file:
+        exporters.append(FileSpanExporter(file, service))
+    if otlp_endpoint:
+        exporters.append(OtlpHttpSpanExporter(otlp_endpoint, service))
+    if not exporters:
+        return None
+    processor = BatchSpanProcessor(exporters)
+    Tracer.add_processor(processor)
+    return processor
+
+
+class TracingMiddleware:
+    """
+    Server span of every request with the traceparent header,
+    requests without it are not traced.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        parent = Tracer.extract(
+            {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        )
+        if parent is None:
+            await self.app(scope, receive, send)
+            return
+
+        with Tracer.span(
+            f"{scope['method']} {scope['path']}", parent, KIND_SERVER
+        ) as span:
+
+            async def _send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                await send(message)
+
+            await self.app(scope, receive, _send)